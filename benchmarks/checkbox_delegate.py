@@ -0,0 +1,55 @@
+"""Benchmarks for :class:`iblqt.widgets.CheckBoxDelegate`.
+
+Run with ``python benchmarks/checkbox_delegate.py``.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from qtpy.QtWidgets import QApplication, QTableView
+
+from iblqt.core import DataFrameTableModel
+from iblqt.widgets import CheckBoxDelegate
+
+
+def benchmark_paint(n_rows: int, n_frames: int = 200) -> dict[str, float]:
+    """Return paint timings for scrolling through a boolean column."""
+    rng = np.random.default_rng(0)
+    model = DataFrameTableModel(
+        dataFrame=pd.DataFrame({'flag': rng.random(n_rows) > 0.5})
+    )
+    view = QTableView()
+    view.setModel(model)
+    view.setItemDelegateForColumn(0, CheckBoxDelegate(view))
+    view.resize(400, 1000)
+    view.show()
+    QApplication.processEvents()
+
+    scroll_bar = view.verticalScrollBar()
+    step = max(scroll_bar.maximum() // n_frames, 1)
+    viewport = view.viewport()
+    n_cells = view.rowAt(viewport.height() - 1) - view.rowAt(0) + 1
+    viewport.grab()  # warm-up
+    t0 = time.perf_counter()
+    for frame in range(n_frames):
+        scroll_bar.setValue(frame * step)
+        viewport.grab()
+    elapsed = time.perf_counter() - t0
+    view.close()
+    return {
+        'fps': n_frames / elapsed,
+        'us per cell': elapsed / (n_frames * n_cells) * 1e6,
+    }
+
+
+def main():
+    """Run all benchmarks."""
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    n_rows = 100_000
+    for key, value in benchmark_paint(n_rows).items():
+        print(f'{key}, {n_rows:,} rows: {value:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmarks for :class:`iblqt.widgets.ColoredCellDelegate`.
+
+Run with ``python benchmarks/colored_cell_delegate.py``.
+"""
+
+import time
+
+from qtpy.QtWidgets import QApplication, QStyledItemDelegate, QTableView
+from table_model import make_data_frame
+
+from iblqt.core import ColoredDataFrameTableModel
+from iblqt.widgets import ColoredCellDelegate
+
+
+def benchmark_scrolling(
+    view: QTableView, delegate: QStyledItemDelegate, n_frames: int = 200
+) -> float:
+    """Return the frames per second painted while scrolling through a view."""
+    view.setItemDelegate(delegate)
+    scroll_bar = view.verticalScrollBar()
+    step = max(scroll_bar.maximum() // n_frames, 1)
+    viewport = view.viewport()
+    viewport.grab()  # warm-up
+    t0 = time.perf_counter()
+    for frame in range(n_frames):
+        scroll_bar.setValue(frame * step)
+        viewport.grab()
+    return n_frames / (time.perf_counter() - t0)
+
+
+def main():
+    """Run all benchmarks."""
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    n_rows = 125_000  # 1M cells
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    for width, height in ((800, 600), (1920, 1080)):
+        view = QTableView()
+        view.setModel(model)
+        view.resize(width, height)
+        view.show()
+        QApplication.processEvents()
+        while model.getColorIndices(0, 1) is None:  # wait for the colors
+            QApplication.processEvents()
+        for name, delegate in (
+            ('QStyledItemDelegate', QStyledItemDelegate(view)),
+            ('ColoredCellDelegate', ColoredCellDelegate(view)),
+        ):
+            fps = benchmark_scrolling(view, delegate)
+            print(f'{name}, {width}x{height}, {n_rows:,} rows: {fps:.1f} fps')
+        view.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""Benchmarks for :class:`iblqt.core.ColoredDataFrameTableModel`.
+
+Run with ``python benchmarks/colored_table_model.py``.
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QApplication, QTableView
+from table_model import make_data_frame
+
+from iblqt.core import ColoredDataFrameTableModel, DataFrameTableModel
+
+
+def normalize_per_column(inputs: list[np.ndarray]) -> np.ndarray:
+    """Normalize columns one by one in float64, as done before ``_normalizeArray``."""
+    normData = np.empty((len(inputs[0]), len(inputs)))
+    for column, values in enumerate(inputs):
+        if values.dtype.kind == 'b':
+            normData[:, column] = values
+            continue
+        data = np.asarray(values, dtype=float)
+        data = np.where(np.isinf(data), np.nan, data)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            lower = float(np.nanmin(data, initial=np.inf))
+            upper = float(np.nanmax(data, initial=-np.inf))
+        if lower == upper:
+            normData[:, column] = np.where(np.isnan(data), np.nan, 0.0)
+        else:
+            normData[:, column] = (data - lower) / (upper - lower)
+    return normData
+
+
+def benchmark_normalize() -> dict[str, float]:
+    """Return timings in ms for normalizing tall and wide tables."""
+    rng = np.random.default_rng(0)
+    timings = {}
+    for name, shape in (('tall', (2_000_000, 8)), ('wide', (1_000, 5_000))):
+        data = rng.normal(size=shape)
+        data[rng.random(shape) < 0.01] = np.inf
+        model = ColoredDataFrameTableModel()
+        inputs = list(data.T)
+
+        t0 = time.perf_counter()
+        model._mapValues(normalize_per_column(inputs), 0.0, 1.0)
+        timings[f'{name} {shape}, per column (float64)'] = time.perf_counter() - t0
+
+        for normalization in ('linear', 'log', 'robust'):
+            model.setNormalization(normalization)
+            t0 = time.perf_counter()
+            model._normalize(inputs, model._normGeneration)
+            key = f'{name} {shape}, _normalize() (float32, {normalization})'
+            timings[key] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_scaling(shape: tuple[int, int] = (384, 2_000)) -> dict[str, float]:
+    """Return timings in ms for switching the scaling of a heatmap-like table."""
+    data = np.random.default_rng(0).normal(size=shape)
+    model = ColoredDataFrameTableModel(dataFrame=pd.DataFrame(data))
+    inputs = [model._normalizationInput(c) for c in range(model.columnCount())]
+    timings = {}
+
+    t0 = time.perf_counter()
+    model._normalize(inputs, model._normGeneration)
+    timings['full normalization'] = time.perf_counter() - t0
+
+    scalings = ('row', 'global', 'fixed', 'column')
+    t0 = time.perf_counter()
+    for scaling in scalings * 5:
+        model.setScaling(scaling)
+    timings['setScaling(), cached statistics'] = (time.perf_counter() - t0) / 20
+
+    model.setNormalization('robust')
+    t0 = time.perf_counter()
+    model.setScaling('row')
+    timings['setScaling(), robust, first time'] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_set_data(n_rows: int, n_edits: int = 200) -> dict[str, float]:
+    """Return mean latency in ms of ``setData()`` with a single cell per edit."""
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    rng = np.random.default_rng(1)
+    rows = rng.integers(0, n_rows, n_edits)
+    timings = {}
+
+    # warm-up: first edit copies the column
+    model.setData(model.index(0, 0), 0.5)
+
+    t0 = time.perf_counter()
+    for row in rows:
+        model.setData(model.index(int(row), 0), 0.5)
+    timings['setData(), within range'] = (time.perf_counter() - t0) / n_edits
+
+    n_slow = max(n_edits // 20, 1)
+    t0 = time.perf_counter()
+    for i, row in enumerate(rows[:n_slow]):
+        model.setData(model.index(int(row), 0), 2.0 + i)
+    timings['setData(), extending range'] = (time.perf_counter() - t0) / n_slow
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_paste(
+    n_rows: int, shape: tuple[int, int] = (2500, 4)
+) -> dict[str, float]:
+    """Return timings in ms for writing a block of cells, e.g., pasted from the clipboard."""
+    block = np.random.default_rng(1).random(shape) * 2
+    timings = {}
+
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    t0 = time.perf_counter()
+    for row, column in np.ndindex(*shape):
+        model.setData(model.index(row, column), float(block[row, column]))
+    timings['setData() per cell'] = time.perf_counter() - t0
+
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    t0 = time.perf_counter()
+    model.beginEdit()
+    for row, column in np.ndindex(*shape):
+        model.setData(model.index(row, column), float(block[row, column]))
+    model.commitEdit()
+    timings['setData() in transaction'] = time.perf_counter() - t0
+
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    t0 = time.perf_counter()
+    model.setBlock(model.index(0, 0), block)
+    timings['setBlock()'] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_color_roles(n_rows: int, n_cells: int = 200_000) -> dict[str, float]:
+    """Return the number of cells per second served by ``data()`` for color roles."""
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    rng = np.random.default_rng(1)
+    rows = rng.integers(0, n_rows, n_cells)
+    columns = rng.integers(0, model.columnCount(), n_cells)
+    indexes = [model.index(r, c) for r, c in zip(rows, columns, strict=True)]
+    timings = {}
+    for role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole):
+        t0 = time.perf_counter()
+        for index in indexes:
+            model.data(index, role)
+        timings[f'data(), {role.name}'] = n_cells / (time.perf_counter() - t0)
+    return timings
+
+
+def benchmark_viewport_hint(
+    n_rows: int, n_frames: int = 200, n_visible: int = 40
+) -> dict[str, float]:
+    """Return the number of cells per second served by ``data()`` while scrolling."""
+    roles = (
+        Qt.ItemDataRole.DisplayRole,
+        Qt.ItemDataRole.BackgroundRole,
+        Qt.ItemDataRole.ForegroundRole,
+    )
+    timings = {}
+    for key in ('without hint', 'with hint'):
+        model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+        n_columns = model.columnCount()
+        t0 = time.perf_counter()
+        for frame in range(n_frames):
+            first = frame * 10
+            if key == 'with hint':
+                model.setViewportHint(first, first + n_visible - 1)
+            for row in range(first, first + n_visible):
+                for column in range(n_columns):
+                    index = model.index(row, column)
+                    for role in roles:
+                        model.data(index, role)
+        n_cells = n_frames * n_visible * n_columns
+        timings[f'data(), 3 roles, {key}'] = n_cells / (time.perf_counter() - t0)
+    return timings
+
+
+def benchmark_paint(n_rows: int, n_frames: int = 50) -> dict[str, float]:
+    """Return the number of cells per second painted by an offscreen QTableView."""
+    timings = {}
+    for model in (
+        DataFrameTableModel(dataFrame=make_data_frame(n_rows)),
+        ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows)),
+    ):
+        view = QTableView()
+        view.setModel(model)
+        view.resize(1600, 1200)
+        view.show()
+        QApplication.processEvents()
+        n_cells = (
+            view.rowAt(view.viewport().height() - 1) - view.rowAt(0) + 1
+        ) * model.columnCount()
+        view.viewport().grab()  # warm-up
+        t0 = time.perf_counter()
+        for frame in range(n_frames):
+            view.scrollTo(model.index(frame * 1000 % n_rows, 0))
+            view.viewport().grab()
+        timings[type(model).__name__] = n_cells * n_frames / (time.perf_counter() - t0)
+        view.close()
+    return timings
+
+
+def benchmark_colormap(n_rows: int) -> dict[str, float]:
+    """Return timings in ms for switching the colormap of a model."""
+    from pyqtgraph import colormap
+
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    n_cells = model.rowCount() * model.columnCount()
+    timings = {}
+
+    t0 = time.perf_counter()
+    colormap.get('viridis').mapToByte(np.random.default_rng(0).random(n_cells))
+    timings['ColorMap.mapToByte(), all cells'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.setColormap('CET-L1')
+    timings['setColormap(), first time'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for name in ('viridis', 'CET-L1') * 10:
+        model.setColormap(name)
+    timings['setColormap(), cached'] = (time.perf_counter() - t0) / 20
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_calls_per_cell(n_rows: int) -> dict[str, float]:
+    """Return the number of Python calls per cell painted by a QTableView."""
+    from qtpy.QtCore import QAbstractTableModel
+
+    class CountingModel(ColoredDataFrameTableModel):
+        calls = 0
+
+        def data(self, *args):
+            self.calls += 1
+            return super().data(*args)
+
+        def multiData(self, *args):
+            self.calls += 1
+            return super().multiData(*args)
+
+    class CountingDataOnlyModel(QAbstractTableModel):
+        """Wrapper answering one role per call, as models without multiData do."""
+
+        calls = 0
+
+        def __init__(self, source):
+            super().__init__()
+            self.source = source
+
+        def rowCount(self, parent=None):
+            return self.source.rowCount()
+
+        def columnCount(self, parent=None):
+            return self.source.columnCount()
+
+        def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+            self.calls += 1
+            return self.source.data(
+                self.source.index(index.row(), index.column()), role
+            )
+
+    timings = {}
+    data_frame = make_data_frame(n_rows)
+    for key, model in (
+        (
+            'data() only',
+            CountingDataOnlyModel(ColoredDataFrameTableModel(dataFrame=data_frame)),
+        ),
+        ('multiData()', CountingModel(dataFrame=data_frame)),
+    ):
+        view = QTableView()
+        view.setModel(model)
+        view.resize(1600, 1200)
+        view.show()
+        QApplication.processEvents()
+        n_cells = (
+            view.rowAt(view.viewport().height() - 1) - view.rowAt(0) + 1
+        ) * model.columnCount()
+        model.calls = 0
+        view.viewport().grab()
+        timings[key] = model.calls / n_cells
+        view.close()
+    return timings
+
+
+def main():
+    """Run all benchmarks."""
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    for n_rows in (10**4, 10**5, 10**6):
+        for key, value in benchmark_set_data(n_rows).items():
+            print(f'{key}, {n_rows:>9,} rows: {value:.3f} ms')
+    for key, value in benchmark_paste(10**6).items():
+        print(f'{key}, 10,000 cells, 1,000,000 rows: {value:.3f} ms')
+    for key, value in benchmark_color_roles(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:,.0f} cells/s')
+    for key, value in benchmark_viewport_hint(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:,.0f} cells/s')
+    for key, value in benchmark_normalize().items():
+        print(f'{key}: {value:.3f} ms')
+    for key, value in benchmark_scaling().items():
+        print(f'{key}, 384 x 2,000 cells: {value:.3f} ms')
+    for key, value in benchmark_colormap(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:.3f} ms')
+    for key, value in benchmark_calls_per_cell(10**4).items():
+        print(f'Python calls per painted cell, {key}: {value:.1f}')
+    for key, value in benchmark_paint(10**6).items():
+        print(f'paint, {key}, 1,000,000 rows: {value:,.0f} cells/s')
+
+
+if __name__ == '__main__':
+    main()
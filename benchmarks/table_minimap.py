@@ -0,0 +1,61 @@
+"""Benchmarks for :class:`iblqt.widgets.TableMinimap`.
+
+Run with ``python benchmarks/table_minimap.py``.
+"""
+
+import time
+
+from qtpy.QtWidgets import QApplication
+from table_model import make_data_frame
+
+from iblqt.core import ColoredDataFrameTableModel
+from iblqt.widgets import TableMinimap
+
+
+def benchmark_minimap(n_rows: int, height: int = 1000) -> dict[str, float]:
+    """Return timings in ms for rendering and updating the minimap of a table."""
+    model = ColoredDataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    minimap = TableMinimap(model=model)
+    minimap.resize(60, height)
+    minimap.image()  # warm-up
+    timings = {}
+
+    for pooling in ('max', 'mean'):
+        minimap.setPooling(pooling)
+        t0 = time.perf_counter()
+        minimap.image()
+        timings[f'render, {pooling} pooling'] = time.perf_counter() - t0
+
+    minimap.setPooling('max')
+    model.sort(0)
+    t0 = time.perf_counter()
+    minimap.image()
+    timings['render, sorted'] = time.perf_counter() - t0
+
+    n_edits = 100
+    t0 = time.perf_counter()
+    for row in range(n_edits):
+        model.setData(model.index(row * 1000, 0), 0.5)
+        minimap.image()
+    timings['update after setData()'] = (time.perf_counter() - t0) / n_edits
+
+    minimap.show()
+    QApplication.processEvents()
+    t0 = time.perf_counter()
+    for _ in range(10):
+        minimap.grab()
+    timings['paint'] = (time.perf_counter() - t0) / 10
+    minimap.close()
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def main():
+    """Run all benchmarks."""
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    for n_rows in (10**5, 10**6):
+        for key, value in benchmark_minimap(n_rows).items():
+            print(f'{key}, {n_rows:>9,} rows: {value:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Benchmarks for :class:`iblqt.core.DataFrameTableModel`.
+
+Run with ``python benchmarks/table_model.py``.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from iblqt.core import ColoredDataFrameTableModel, DataFrameTableModel
+
+
+def make_data_frame(n_rows: int, n_columns: int = 8) -> pd.DataFrame:
+    """Create a DataFrame with mixed numerical and string columns."""
+    rng = np.random.default_rng(0)
+    data = {f'float{i}': rng.random(n_rows) for i in range(n_columns - 2)}
+    data['int'] = rng.integers(0, 1000, n_rows)
+    data['str'] = rng.choice(['alpha', 'beta', 'gamma'], n_rows)
+    return pd.DataFrame(data)
+
+
+def benchmark_data(n_rows: int, n_cells: int = 200_000) -> float:
+    """Return the number of cells per second served by ``data()``."""
+    model = DataFrameTableModel(dataFrame=make_data_frame(n_rows))
+    rng = np.random.default_rng(1)
+    rows = rng.integers(0, n_rows, n_cells)
+    columns = rng.integers(0, model.columnCount(), n_cells)
+    indexes = [model.index(r, c) for r, c in zip(rows, columns, strict=True)]
+    t0 = time.perf_counter()
+    for index in indexes:
+        model.data(index)
+    return n_cells / (time.perf_counter() - t0)
+
+
+def benchmark_append(
+    n_rows: int,
+    n_batches: int = 500,
+    model_class: type[DataFrameTableModel] = DataFrameTableModel,
+) -> tuple[float, float]:
+    """Return mean and max latency in ms of ``appendRows()`` with 1-row batches.
+
+    At 100 Hz, each append has a budget of 10 ms.
+    """
+    model = model_class(dataFrame=make_data_frame(n_rows), copy=False)
+    batches = [make_data_frame(1) for _ in range(n_batches)]
+    latencies = np.empty(n_batches)
+    for i, batch in enumerate(batches):
+        t0 = time.perf_counter()
+        model.appendRows(batch)
+        latencies[i] = time.perf_counter() - t0
+    return latencies.mean() * 1e3, latencies.max() * 1e3
+
+
+def benchmark_concat(n_rows: int, n_batches: int = 20) -> float:
+    """Return mean latency in ms of appending 1-row batches via ``setDataFrame()``."""
+    model = DataFrameTableModel(dataFrame=make_data_frame(n_rows), copy=False)
+    batches = [make_data_frame(1) for _ in range(n_batches)]
+    t0 = time.perf_counter()
+    for batch in batches:
+        model.setDataFrame(
+            pd.concat([model.getDataFrame(), batch], ignore_index=True), copy=False
+        )
+    return (time.perf_counter() - t0) / n_batches * 1e3
+
+
+def benchmark_sort(n_rows: int) -> dict[str, float]:
+    """Return timings in ms for sorting a model in various ways."""
+    from qtpy.QtCore import Qt
+
+    ascending, descending = Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder
+    data_frame = make_data_frame(n_rows)
+    model = DataFrameTableModel(dataFrame=data_frame, copy=False)
+    timings = {}
+
+    t0 = time.perf_counter()
+    data_frame.copy().sort_values(by='float0', inplace=True)
+    timings['DataFrame.sort_values()'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.sort(0, ascending)
+    timings['sort(), first time'] = time.perf_counter() - t0
+
+    model.sort(1, descending)
+    t0 = time.perf_counter()
+    model.sort(0, ascending)
+    timings['sort(), cached'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.sort(0, descending)
+    timings['sort(), other order'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.sortByColumns([7, 0], [ascending, descending])
+    timings['sortByColumns(), 2 columns'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.sort(-1)
+    timings['sort(-1), restore order'] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_edit_dtypes(n_rows: int, n_edits: int = 100) -> dict[str, float]:
+    """Return timings in ms for sorting and normalizing a column edited with text."""
+    from qtpy.QtCore import Qt
+
+    from iblqt.core import _arrayBounds, _normalizeArray
+
+    def normalize(values: np.ndarray) -> None:
+        """Normalize a column as ``ColoredDataFrameTableModel`` does."""
+        data = pd.to_numeric(pd.Series(values), errors='coerce')
+        _arrayBounds(
+            _normalizeArray(data.to_numpy(dtype=np.float32, na_value=np.nan)[:, None])
+        )
+
+    rows = np.random.default_rng(1).integers(0, n_rows, n_edits)
+    timings = {}
+    for key in ('raw assignment', 'EditRole'):
+        model = DataFrameTableModel(dataFrame=make_data_frame(n_rows))
+        for row in rows:
+            if key == 'EditRole':
+                model.setData(model.index(int(row), 6), '42', Qt.ItemDataRole.EditRole)
+            else:  # previous behavior: text upcasts the column to Python objects
+                model._setValues(int(row), 6, '42')
+        dtype = model._columns[6].dtype
+
+        t0 = time.perf_counter()
+        model.sort(6)
+        timings[f'sort() after edits, {key} ({dtype})'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        normalize(model._columns[6])
+        timings[f'normalize after edits, {key} ({dtype})'] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_filter(n_rows: int) -> dict[str, float]:
+    """Return timings in ms for filtering a model."""
+    from qtpy.QtCore import QSortFilterProxyModel
+
+    model = DataFrameTableModel(dataFrame=make_data_frame(n_rows), copy=False)
+    timings = {}
+
+    t0 = time.perf_counter()
+    model.setFilter('float0 > 0.5 and str == "beta"')
+    timings['setFilter(), expression'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model.setFilter({'float0': lambda x: x > 0.5, 'str': lambda x: x == 'beta'})
+    timings['setFilter(), predicates'] = time.perf_counter() - t0
+
+    model.setFilter(None)
+    proxy = QSortFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.setFilterKeyColumn(model.columnCount() - 1)
+    t0 = time.perf_counter()
+    proxy.setFilterFixedString('beta')
+    proxy.rowCount()
+    timings['QSortFilterProxyModel'] = time.perf_counter() - t0
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def benchmark_format(n_rows: int, n_steps: int = 2000) -> dict[str, float]:
+    """Return the number of display texts per second served while scrolling."""
+    model = DataFrameTableModel(dataFrame=make_data_frame(n_rows), copy=False)
+    n_columns = model.columnCount() - 2  # float columns
+    window = [(row, column) for row in range(40) for column in range(n_columns)]
+    timings = {}
+
+    def scroll(get):
+        t0 = time.perf_counter()
+        for step in range(n_steps):
+            for row, column in window:
+                get(model.index(row + step, column))
+        return n_steps * len(window) / (time.perf_counter() - t0)
+
+    timings['data(), raw values'] = scroll(model.data)
+    timings['data(), formatted per call'] = scroll(lambda i: f'{model.data(i):.3f}')
+    for column in range(n_columns):
+        model.setColumnFormatter(column, '%.3f')
+    timings['data(), setColumnFormatter()'] = scroll(model.data)
+    return timings
+
+
+def benchmark_from_arrays(n_rows: int, n_columns: int = 8) -> dict[str, float]:
+    """Return timings in ms for opening memory-mapped ``.npy`` files."""
+    import tempfile
+    from pathlib import Path
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [Path(directory) / f'column{i}.npy' for i in range(n_columns)]
+        for path in paths:
+            np.save(path, np.random.default_rng(0).random(n_rows))
+
+        t0 = time.perf_counter()
+        arrays = {path.stem: np.load(path, mmap_mode='r') for path in paths}
+        model = DataFrameTableModel.fromArrays(arrays)
+        model.data(model.index(n_rows - 1, 0))
+        timings['fromArrays(), memory-mapped'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        model = DataFrameTableModel(
+            dataFrame=pd.DataFrame({path.stem: np.load(path) for path in paths}),
+            copy=False,
+        )
+        timings['DataFrameTableModel(np.load())'] = time.perf_counter() - t0
+        del arrays, model
+    return {key: value * 1e3 for key, value in timings.items()}
+
+
+def main():
+    """Run all benchmarks."""
+    for n_rows in (10**4, 10**5, 10**6):
+        print(f'data(), {n_rows:>9,} rows: {benchmark_data(n_rows):>12,.0f} cells/s')
+    for model_class in (DataFrameTableModel, ColoredDataFrameTableModel):
+        mean, worst = benchmark_append(10**6, model_class=model_class)
+        print(
+            f'{model_class.__name__}.appendRows(), 1,000,000 rows: '
+            f'{mean:.3f} ms mean, {worst:.3f} ms max'
+        )
+    print(
+        f'setDataFrame(concat), 1,000,000 rows: {benchmark_concat(10**6):.3f} ms mean'
+    )
+    for key, value in benchmark_sort(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:.3f} ms')
+    for key, value in benchmark_edit_dtypes(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:.3f} ms')
+    for key, value in benchmark_filter(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:.3f} ms')
+    for key, value in benchmark_format(10**6).items():
+        print(f'{key}, 1,000,000 rows: {value:,.0f} cells/s')
+    for key, value in benchmark_from_arrays(10**7).items():
+        print(f'{key}, 10,000,000 rows: {value:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,17 @@
 
 import logging
 import sys
+import time
+import tokenize
 import traceback
 import warnings
 import webbrowser
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
 from inspect import signature
 from pathlib import Path
-from typing import Any, Callable, cast
+from typing import Any, Callable, Mapping, Sequence, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -22,20 +27,131 @@ from qtpy.QtCore import (
     QObject,
     QRunnable,
     Qt,
+    QThreadPool,
+    QTimer,
     QUrl,
     Signal,
     Slot,
 )
-from qtpy.QtGui import QColor
+from qtpy.QtGui import QColor, QUndoCommand
 from qtpy.QtWebEngineWidgets import QWebEnginePage
 from qtpy.QtWidgets import QMessageBox, QWidget
 from requests import HTTPError
-from typing_extensions import override
+from typing_extensions import Self, override
+
+try:
+    from qtpy.QtWidgets import QUndoStack
+except ImportError:  # Qt 6
+    from qtpy.QtGui import QUndoStack  # type: ignore[assignment,no-redef]
 
 from one.webclient import AlyxClient  # type: ignore
 
 log = logging.getLogger(__name__)
 
+_Edit = tuple[int | np.ndarray, int, Any, Any]
+"""A recorded edit: storage rows, column, old values and new values."""
+
+_filterErrors = (
+    AttributeError,
+    KeyError,
+    NameError,
+    NotImplementedError,
+    SyntaxError,
+    tokenize.TokenError,
+    TypeError,
+    ValueError,
+)
+"""Errors raised when evaluating an invalid filter, e.g., an incomplete expression."""
+
+
+class DataFrameSnapshot:
+    """
+    An immutable snapshot of the data of a :class:`DataFrameTableModel`.
+
+    Snapshots are created with :meth:`DataFrameTableModel.snapshot`. They share the
+    read-only column arrays of the model and can be read from any thread.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        columns: tuple[np.ndarray, ...],
+        dtypes: tuple[Any, ...],
+        index: pd.Index,
+        columnIndex: pd.Index,
+        rows: np.ndarray | None,
+    ):
+        """
+        Initialize the DataFrameSnapshot.
+
+        Parameters
+        ----------
+        generation : int
+            The generation of the model's data.
+        columns : tuple of np.ndarray
+            The read-only column arrays.
+        dtypes : tuple
+            The pandas dtypes of the columns.
+        index : pd.Index
+            The row labels.
+        columnIndex : pd.Index
+            The column labels.
+        rows : np.ndarray or None
+            The positions of the presented rows in the column arrays, or None if all
+            rows are presented in their original order.
+        """
+        self._generation = generation
+        self._columns = columns
+        self._dtypes = dtypes
+        self._index = index
+        self._columnIndex = columnIndex
+        self._rows = rows
+
+    def generation(self) -> int:
+        """
+        Return the generation of the model's data at the time of the snapshot.
+
+        Returns
+        -------
+        int
+            The generation.
+        """
+        return self._generation
+
+    def rowCount(self) -> int:
+        """
+        Return the number of rows presented by the model.
+
+        Returns
+        -------
+        int
+            The number of rows.
+        """
+        return len(self._index) if self._rows is None else len(self._rows)
+
+    def getDataFrame(self, unsorted: bool = False) -> DataFrame:
+        """
+        Return the data of the snapshot as a DataFrame.
+
+        Parameters
+        ----------
+        unsorted : bool, optional
+            Whether to ignore the sort order and filter of the model. The resulting
+            DataFrame shares the memory of numerical and boolean columns. Otherwise,
+            the rows are taken in the order presented by the model. Default: False.
+
+        Returns
+        -------
+        DataFrame
+            The data.
+        """
+        dataFrame = _columnsToDataFrame(
+            self._columns, self._dtypes, self._index, self._columnIndex
+        )
+        if not unsorted and self._rows is not None:
+            dataFrame = dataFrame.take(self._rows)
+        return dataFrame
+
 
 class DataFrameTableModel(QAbstractTableModel):
     """
@@ -47,11 +163,28 @@ class DataFrameTableModel(QAbstractTableModel):
         The DataFrame containing the models data.
     """
 
+    filterApplied = Signal(float)  # type: Signal
+    """Emitted when a filter has been applied. Carries the evaluation time in seconds."""
+
+    filterFailed = Signal(str)  # type: Signal
+    """Emitted when a filter expression could not be applied. Carries the error."""
+
+    _roles: tuple[int, ...] = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole)
+    _generation: int = 0
+    _storageGeneration: int = 0  # incremented whenever storage positions change
+    _formatBlockSize = 128  # rows per block of cached display strings
+    _formatCacheBlocks = 64  # blocks of cached display strings per column
+    _prefetchMargin = 64  # rows prefetched above and below the viewport hint
+    _prefetchGeneration = -1
+    _prefetchStart = 0
+    _prefetchStop = 0
+
     def __init__(
         self,
         parent: QObject | None = None,
         dataFrame: DataFrame | None = None,
         *args,
+        copy: bool = True,
         **kwargs,
     ):
         """
@@ -65,39 +198,388 @@ class DataFrameTableModel(QAbstractTableModel):
             The Pandas DataFrame to be represented by the model.
         *args : tuple
             Positional arguments passed to the parent class.
+        copy : bool, optional
+            Whether to copy the DataFrame. See :meth:`setDataFrame`. Default: True.
         **kwargs : dict
             Keyword arguments passed to the parent class.
         """
         super().__init__(parent, *args, **kwargs)
-        self._dataFrame = DataFrame() if dataFrame is None else dataFrame.copy()
+        self._filter: Any = None
+        self._filterExpression = ''
+        self._filterTimer = QTimer(self)
+        self._filterTimer.setSingleShot(True)
+        self._filterTimer.timeout.connect(self._applyFilterExpression)
+        self._formatters: dict[int, str | Callable[[Any], str]] = {}
+        self._viewportHint: tuple[int, int] | None = None
+        self._prefetched: dict[int, list[list[Any]]] = {}
+        self._snapshot: DataFrameSnapshot | None = None
+        self._undoStack: QUndoStack | None = None
+        self._editDepth = 0
+        self._editText = ''
+        self._editRange: list[int] | None = None
+        self._editLog: list[_Edit] = []
+        self._formatCache: dict[int, OrderedDict[int, list[str]]] = {}
+        self._loadDataFrame(DataFrame() if dataFrame is None else dataFrame, copy)
+
+    def _loadDataFrame(self, dataFrame: DataFrame, copy: bool = True) -> None:
+        """
+        Extract the per-column arrays backing the model from a DataFrame.
+
+        Numerical and boolean columns are kept as (zero-copy) NumPy arrays. All other
+        columns are converted to arrays of Python objects, holding the same values that
+        would be returned by ``DataFrame.iloc``.
+
+        Parameters
+        ----------
+        dataFrame : DataFrame
+            The DataFrame to be represented by the model.
+        copy : bool, optional
+            Whether to copy the DataFrame first. Default: True.
+        """
+        if copy:
+            dataFrame = dataFrame.copy()
+        self._loadColumns(
+            [_columnToArray(dataFrame.iloc[:, i]) for i in range(dataFrame.shape[1])],
+            list(dataFrame.dtypes),
+            dataFrame.index,
+            dataFrame.columns,
+        )
+        self._dataFrame: DataFrame | None = dataFrame
+        self._unsortedDataFrameCache: DataFrame | None = dataFrame
+
+    def _loadColumns(
+        self,
+        columns: list[np.ndarray],
+        dtypes: list[Any],
+        index: pd.Index,
+        columnIndex: pd.Index,
+    ) -> None:
+        """
+        Set the per-column arrays backing the model and reset all derived state.
+
+        Parameters
+        ----------
+        columns : list of np.ndarray
+            The column arrays, see :func:`_columnToArray`.
+        dtypes : list
+            The pandas dtypes of the columns.
+        index : pd.Index
+            The row labels.
+        columnIndex : pd.Index
+            The column labels.
+        """
+        self._columns: list[np.ndarray] = columns
+        self._dtypes: list[Any] = dtypes
+        self._index: pd.Index = index
+        self._columnIndex: pd.Index = columnIndex
+        self._buffers: list[np.ndarray | None] = [None] * len(self._columns)
+        self._indexBuffer: np.ndarray | None = None
+        self._rows: np.ndarray | None = None
+        self._rowsBuffer: np.ndarray | None = None
+        self._order: np.ndarray | None = None
+        self._orderBuffer: np.ndarray | None = None
+        self._mask: np.ndarray | None = None
+        self._maskBuffer: np.ndarray | None = None
+        self._sortOrders: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._formatCache = {}
+        self._headerCache: OrderedDict[int, list[str]] = OrderedDict()
+        self._columnLabels = _labelsToText(columnIndex, '\n')
+        self._permutations: dict[tuple[tuple[int, bool], ...], np.ndarray] = {}
+        self._dataFrame = None
+        self._generation += 1
+        self._storageGeneration += 1
+        self._unsortedDataFrameCache = None
 
     def getDataFrame(self) -> DataFrame:
         """
         Get the underlying DataFrame.
 
+        The DataFrame is reconstructed from the model's column arrays when needed and
+        cached until the model's data, sort order or filter changes. It contains the
+        rows presented by the model, in the order in which they are presented.
+
+        If the model is neither sorted nor filtered, the DataFrame shares the memory of
+        the numerical and boolean columns, which are marked as read-only as for
+        :meth:`snapshot`. The next edit of such a column through the model then copies
+        the column once. Otherwise, the rows are copied into the DataFrame and the
+        column arrays are left untouched.
+
         Returns
         -------
         DataFrame
             The DataFrame represented by the model.
         """
+        if self._dataFrame is None:
+            if self._rows is None:
+                self._dataFrame = self.snapshot().getDataFrame()
+            else:
+                self._dataFrame = self._unsortedDataFrame().take(self._rows)
         return self._dataFrame
 
-    def setDataFrame(self, dataFrame: DataFrame):
+    def _unsortedDataFrame(self) -> DataFrame:
+        """
+        Get a DataFrame of the model's column arrays, ignoring sort order and filter.
+
+        The DataFrame is for internal use only: it shares the memory of the model's
+        numerical and boolean columns without marking them as read-only, and is
+        discarded whenever the model's data changes.
+
+        Returns
+        -------
+        DataFrame
+            A DataFrame sharing the memory of the model's numerical and boolean columns.
+        """
+        if self._unsortedDataFrameCache is None:
+            self._unsortedDataFrameCache = _columnsToDataFrame(
+                self._columns, self._dtypes, self._index, self._columnIndex
+            )
+        return self._unsortedDataFrameCache
+
+    def _freezeColumns(self) -> None:
+        """
+        Mark the column arrays as read-only, so they can be shared safely.
+
+        Subsequent writes through the model copy a column before modifying it
+        (copy-on-write). Append buffers are kept, as appending only writes past the
+        shared rows, see :func:`_appendToBuffer`.
+        """
+        for values in self._columns:
+            values.flags.writeable = False
+
+    def generation(self) -> int:
+        """
+        Return the generation of the model's data.
+
+        The generation is incremented whenever the data, the order of the rows or the
+        filter of the model changes.
+
+        Returns
+        -------
+        int
+            The generation.
+        """
+        return self._generation
+
+    def snapshot(self) -> DataFrameSnapshot:
+        """
+        Return an immutable snapshot of the model's data.
+
+        Taking a snapshot does not copy any data: the snapshot shares the model's
+        column arrays, which are marked as read-only. A column is copied once it is
+        subsequently written to through the model. Snapshots may be read from other
+        threads, e.g., in a :class:`Worker`, while the model is being edited.
+
+        Returns
+        -------
+        DataFrameSnapshot
+            The snapshot. Repeated calls return the same object until the model's
+            generation changes.
+        """
+        if self._snapshot is None or self._snapshot.generation() != self._generation:
+            self._freezeColumns()
+            self._snapshot = DataFrameSnapshot(
+                self._generation,
+                tuple(self._columns),
+                tuple(self._dtypes),
+                self._index,
+                self._columnIndex,
+                self._rows,
+            )
+        return self._snapshot
+
+    def isCurrent(self, snapshot: DataFrameSnapshot) -> bool:
+        """
+        Return whether a snapshot reflects the current data of the model.
+
+        Parameters
+        ----------
+        snapshot : DataFrameSnapshot
+            The snapshot.
+
+        Returns
+        -------
+        bool
+            False if the model has changed since the snapshot was taken.
+        """
+        return snapshot.generation() == self._generation
+
+    def _storageRow(self, row: int) -> int:
+        """
+        Map a row of the model to a position in the column arrays.
+
+        Parameters
+        ----------
+        row : int
+            The row of the model.
+
+        Returns
+        -------
+        int
+            The position in the column arrays.
+        """
+        return row if self._rows is None else int(self._rows[row])
+
+    def setDataFrame(self, dataFrame: DataFrame, copy: bool = True):
         """
         Set a new DataFrame.
 
+        By default, the model operates on a copy of the DataFrame. With `copy` set to
+        False, the model shares the memory of the DataFrame's numerical and boolean
+        columns instead, so that large DataFrames can be represented without
+        duplication. The shared memory is treated as read-only: a column is only copied
+        once it is written to through the model (copy-on-write). The DataFrame must not
+        be modified in place while it is represented by the model.
+
         Parameters
         ----------
         dataFrame : DataFrame
             The new DataFrame to be set.
+        copy : bool, optional
+            Whether to copy the DataFrame. Default: True.
         """
         self.beginResetModel()
-        self._dataFrame = dataFrame.copy()
+        self._loadDataFrame(dataFrame, copy)
+        self._reapplyFilter()
         self.endResetModel()
 
     dataFrame = Property(DataFrame, fget=getDataFrame, fset=setDataFrame)  # type: Property
     """The DataFrame containing the models data."""
 
+    def setArrays(self, arrays: Mapping[Any, np.ndarray | pd.Series]) -> None:
+        """
+        Set new data from a mapping of column labels to arrays.
+
+        Numerical and boolean NumPy arrays are used as columns directly, without
+        copying and without constructing a DataFrame. This includes memory-mapped
+        arrays (e.g., loaded with ``np.load(path, mmap_mode='r')``), so that only the
+        rows accessed by the model are paged into memory. As with
+        :meth:`setDataFrame` and `copy` set to False, the arrays are treated as
+        read-only and a column is only copied once it is written to through the model.
+        Arrays of other dtypes are converted.
+
+        Parameters
+        ----------
+        arrays : Mapping
+            One-dimensional arrays or Series of equal length, keyed by column label.
+
+        Raises
+        ------
+        ValueError
+            If the arrays are not one-dimensional or differ in length.
+        """
+        columns, dtypes = [], []
+        for values in arrays.values():
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'biufc':
+                column = np.asarray(values)
+                if column.flags.writeable:
+                    column = column.view()
+                    column.flags.writeable = False
+                dtype: Any = column.dtype
+            else:
+                series = pd.Series(values, copy=False)
+                column, dtype = _columnToArray(series), series.dtype
+            if column.ndim != 1:
+                raise ValueError('Arrays must be one-dimensional')
+            columns.append(column)
+            dtypes.append(dtype)
+        nRows = {len(column) for column in columns}
+        if len(nRows) > 1:
+            raise ValueError('Arrays must have the same length')
+        self.beginResetModel()
+        self._loadColumns(
+            columns,
+            dtypes,
+            pd.RangeIndex(nRows.pop() if nRows else 0),
+            pd.Index(list(arrays.keys())),
+        )
+        self._reapplyFilter()
+        self.endResetModel()
+
+    @classmethod
+    def fromArrays(
+        cls,
+        arrays: Mapping[Any, np.ndarray | pd.Series],
+        parent: QObject | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """
+        Create a model from a mapping of column labels to arrays.
+
+        See :meth:`setArrays` for details.
+
+        Parameters
+        ----------
+        arrays : Mapping
+            One-dimensional arrays or Series of equal length, keyed by column label.
+        parent : QObject, optional
+            The parent object.
+        **kwargs : dict
+            Keyword arguments passed to the constructor.
+
+        Returns
+        -------
+        DataFrameTableModel
+            The new model.
+        """
+        model = cls(parent, **kwargs)
+        model.setArrays(arrays)
+        return model
+
+    @classmethod
+    def fromArrow(cls, data: Any, parent: QObject | None = None, **kwargs: Any) -> Self:
+        """
+        Create a model from Arrow data.
+
+        Columns of integers or floats without missing values that consist of a single
+        chunk are wrapped without copying, so record batches read from a memory-mapped
+        Arrow IPC (Feather) file stay on disk until accessed. All other columns are
+        converted. Requires `pyarrow`.
+
+        Parameters
+        ----------
+        data : pyarrow.Table, pyarrow.RecordBatch or list of pyarrow.RecordBatch
+            The Arrow data.
+        parent : QObject, optional
+            The parent object.
+        **kwargs : dict
+            Keyword arguments passed to the constructor.
+
+        Returns
+        -------
+        DataFrameTableModel
+            The new model.
+        """
+        import pyarrow as pa
+
+        if isinstance(data, pa.RecordBatch):
+            data = [data]
+        if not isinstance(data, pa.Table):
+            data = pa.Table.from_batches(data)
+        arrays: dict[Any, np.ndarray | pd.Series] = {}
+        for name, column in zip(data.column_names, data.columns, strict=True):
+            if (
+                column.num_chunks == 1
+                and column.null_count == 0
+                and (
+                    pa.types.is_integer(column.type)
+                    or pa.types.is_floating(column.type)
+                )
+            ):
+                arrays[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+            else:
+                arrays[name] = column.to_pandas()
+        return cls.fromArrays(arrays, parent, **kwargs)
+
+    def _reapplyFilter(self) -> None:
+        """Apply the current filter to new data, discarding it if that fails."""
+        if self._filter is not None:
+            try:
+                self._mask = self._filterMask(self._filter)
+                self._rows = np.flatnonzero(self._mask)
+            except _filterErrors as e:
+                log.warning(f'Discarding filter: {e}')
+                self._filter = None
+
     def headerData(
         self,
         section: int,
@@ -118,22 +600,51 @@ class DataFrameTableModel(QAbstractTableModel):
 
         Returns
         -------
-        Any or None
-            The header data.
+        str or None
+            The label of the column or row as text. The levels of MultiIndex columns
+            are stacked on separate lines, the levels of a MultiIndex of rows are
+            separated by commas. Labels are converted once and cached.
         """
         if role == Qt.ItemDataRole.DisplayRole:
-            if (
-                orientation == Qt.Orientation.Horizontal
-                and 0 <= section < self.columnCount()
+            if orientation == Qt.Orientation.Horizontal and 0 <= section < len(
+                self._columnLabels
             ):
-                return self._dataFrame.columns[section]
-            elif (
+                return self._columnLabels[section]
+            if (
                 orientation == Qt.Orientation.Vertical
                 and 0 <= section < self.rowCount()
             ):
-                return self._dataFrame.index[section]
+                return self._rowLabel(section)
         return None
 
+    def _rowLabel(self, row: int) -> str:
+        """
+        Return the label of a row as text, converting its block of labels if needed.
+
+        Parameters
+        ----------
+        row : int
+            The row of the model.
+
+        Returns
+        -------
+        str
+            The label of the row.
+        """
+        block, offset = divmod(row, self._formatBlockSize)
+        labels = self._headerCache.get(block)
+        if labels is None:
+            start = block * self._formatBlockSize
+            stop = min(start + self._formatBlockSize, self.rowCount())
+            rows = slice(start, stop) if self._rows is None else self._rows[start:stop]
+            labels = _labelsToText(self._index[rows], ', ')
+            self._headerCache[block] = labels
+            if len(self._headerCache) > self._formatCacheBlocks:
+                self._headerCache.popitem(last=False)
+        else:
+            self._headerCache.move_to_end(block)
+        return labels[offset]
+
     def rowCount(self, parent: QModelIndex | None = None) -> int:
         """
         Get the number of rows in the model.
@@ -150,7 +661,7 @@ class DataFrameTableModel(QAbstractTableModel):
         """
         if isinstance(parent, QModelIndex) and parent.isValid():
             return 0
-        return len(self._dataFrame.index)
+        return len(self._index) if self._rows is None else len(self._rows)
 
     def columnCount(self, parent: QModelIndex | None = None) -> int:
         """
@@ -168,7 +679,7 @@ class DataFrameTableModel(QAbstractTableModel):
         """
         if isinstance(parent, QModelIndex) and parent.isValid():
             return 0
-        return self._dataFrame.columns.size
+        return len(self._columns)
 
     def data(
         self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
@@ -188,216 +699,3470 @@ class DataFrameTableModel(QAbstractTableModel):
         Any or None
             The data for the specified index.
         """
-        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
-            data = self._dataFrame.iloc[index.row(), index.column()]
-            if isinstance(data, np.generic):
-                return data.item()
-            return data
+        if index.isValid():
+            row, column = index.row(), index.column()
+            if self._prefetchGeneration != self._generation:
+                self._prefetch()
+            if self._prefetchStart <= row < self._prefetchStop:
+                block = self._prefetched.get(role)
+                if block is not None:
+                    return block[column][row - self._prefetchStart]
+            if column in self._formatters and role == Qt.ItemDataRole.DisplayRole:
+                return self._formattedData(row, column)
+            return self._cellData(self._storageRow(row), column, role)
         return None
 
-    def setData(
-        self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.DisplayRole
-    ) -> bool:
+    def multiData(self, index: QModelIndex, roleDataSpan: Any) -> None:
         """
-        Set data at the specified index with the given value.
+        Fill the data of several roles for the specified index at once.
+
+        Qt 6 views request all roles needed for painting a cell through this method.
+        The position of the cell is resolved once for all roles, and the whole request
+        is answered with a single call into Python instead of one call per role.
 
         Parameters
         ----------
         index : QModelIndex
-            The index where the data will be set.
-        value : Any
-            The new value to be set at the specified index.
+            The index of the data.
+        roleDataSpan : QModelRoleDataSpan
+            The roles to be filled.
+        """
+        if not index.isValid():
+            return
+        row, column = self._storageRow(index.row()), index.column()
+        formatted = column in self._formatters
+        if self._prefetchGeneration != self._generation:
+            self._prefetch()
+        offset = index.row() - self._prefetchStart
+        prefetched = 0 <= offset < self._prefetchStop - self._prefetchStart
+        for roleData in roleDataSpan:
+            role = roleData.role()
+            data: Any
+            block = self._prefetched.get(role) if prefetched else None
+            if block is not None:
+                data = block[column][offset]
+            elif formatted and role == Qt.ItemDataRole.DisplayRole:
+                data = self._formattedData(index.row(), column)
+            else:
+                data = self._cellData(row, column, role)
+            if data is not None:
+                roleData.setData(data)
+
+    def itemData(self, index: QModelIndex) -> dict[int, Any]:
+        """
+        Get the data of all supported roles for the specified index.
+
+        Parameters
+        ----------
+        index : QModelIndex
+            The index of the data.
+
+        Returns
+        -------
+        dict
+            The data for the specified index, keyed by role.
+        """
+        if not index.isValid():
+            return {}
+        row, column = self._storageRow(index.row()), index.column()
+        itemData = {}
+        for role in self._roles:
+            data: Any
+            if role == Qt.ItemDataRole.DisplayRole and column in self._formatters:
+                data = self._formattedData(index.row(), column)
+            else:
+                data = self._cellData(row, column, role)
+            if data is not None:
+                itemData[role] = data
+        return itemData
+
+    def blockData(
+        self, start: int, stop: int, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> list[list[Any]]:
+        """
+        Get the data of a role for a range of rows at once.
+
+        The data is computed in a single vectorized pass, as for the prefetching of
+        :meth:`setViewportHint`, e.g., for delegates painting many cells per call.
+
+        Parameters
+        ----------
+        start : int
+            The first row.
+        stop : int
+            The row after the last row.
         role : int, optional
-            The role of the data. Only DisplayRole is supported at this time.
+            The role of the data. Default: DisplayRole.
 
         Returns
         -------
-        bool
-            Returns true if successful; otherwise returns false.
+        list of list
+            One list of values per column.
         """
-        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
-            self._dataFrame.iloc[index.row(), index.column()] = value
-            self.dataChanged.emit(index, index, [role])
-            return True
-        return False
+        start, stop = max(start, 0), min(stop, self.rowCount())
+        stop = max(start, stop)
+        if self._prefetchGeneration != self._generation:
+            self._prefetch()
+        if (
+            self._prefetchStart <= start
+            and stop <= self._prefetchStop
+            and role in self._prefetched
+        ):
+            offset = start - self._prefetchStart
+            return [
+                column[offset : offset + stop - start]
+                for column in self._prefetched[role]
+            ]
+        rows = np.arange(start, stop) if self._rows is None else self._rows[start:stop]
+        block = self._prefetchData(rows).get(role)
+        if block is None:
+            block = [
+                [self._cellData(row, column, role) for row in rows.tolist()]
+                for column in range(self.columnCount())
+            ]
+        return block
+
+    def setColumnFormatter(
+        self, column: int, formatter: str | Callable[[Any], str] | None
+    ) -> None:
+        """
+        Set the formatter for the display text of a column.
 
-    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        Display texts are formatted in blocks of rows and cached until the column's
+        data, the sort order or the filter changes, so repainting a cell does not
+        format its value again.
+
+        Parameters
+        ----------
+        column : int
+            The column index.
+        formatter : str, Callable or None
+            A printf-style format string (e.g., ``'%.3f'``), which is applied to
+            numerical and boolean columns in a vectorized manner, or a callable
+            returning the display text for a single value. None removes the formatter,
+            so that the column's raw values are returned for the display role.
         """
-        Sort the data based on the specified column and order.
+        if formatter is None:
+            self._formatters.pop(column, None)
+        else:
+            self._formatters[column] = formatter
+        self._formatCache.pop(column, None)
+        self._discardPrefetch()
+        if 0 <= column < self.columnCount() and self.rowCount() > 0:
+            self.dataChanged.emit(
+                self.index(0, column),
+                self.index(self.rowCount() - 1, column),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    def columnFormatter(self, column: int) -> str | Callable[[Any], str] | None:
+        """
+        Return the formatter for the display text of a column.
 
         Parameters
         ----------
         column : int
-            The column index to sort by.
-        order : Qt.SortOrder, optional
-            The sort order. Defaults to Ascending order.
+            The column index.
+
+        Returns
+        -------
+        str, Callable or None
+            The formatter, or None if the column's raw values are displayed.
         """
-        if self.columnCount() == 0:
-            return
-        columnName = self._dataFrame.columns[column]
-        self.layoutAboutToBeChanged.emit()
-        self._dataFrame.sort_values(
-            by=columnName, ascending=order == Qt.SortOrder.AscendingOrder, inplace=True
-        )
-        self.layoutChanged.emit()
+        return self._formatters.get(column)
 
+    @Slot(int, int)
+    def setViewportHint(self, first: int, last: int) -> None:
+        """
+        Set the range of rows currently visible in an attached view.
 
-class ColoredDataFrameTableModel(DataFrameTableModel):
-    """Extension of DataFrameTableModel providing color-mapped numerical data."""
+        The data of all roles for the visible rows, plus a margin of rows above and
+        below, is computed in a single vectorized pass and subsequent calls to
+        :meth:`data` for these rows are answered from the prefetched block. The
+        block is recomputed once the visible rows leave it or the data changes.
 
-    colormapChanged = Signal(str)  # type: Signal
-    """Emitted when the colormap has been changed."""
+        The hint can be wired from a view's scroll bar, for example:
 
-    alphaChanged = Signal(int)  # type: Signal
-    """Emitted when the alpha value has been changed."""
+        .. code-block:: python
 
-    _normData = DataFrame()
-    _background: npt.NDArray[np.int_]
-    _foreground: npt.NDArray[np.int_]
-    _cmap: ColorMap = colormap.get('plasma')
-    _alpha: int
+            def updateHint():
+                height = view.viewport().height()
+                model.setViewportHint(view.rowAt(0), view.rowAt(height - 1))
 
-    def __init__(
-        self,
-        parent: QObject | None = None,
-        dataFrame: DataFrame | None = None,
-        colormap: str = 'plasma',
-        alpha: int = 255,
-    ):
-        """
-        Initialize the ColoredDataFrameTableModel.
+            view.verticalScrollBar().valueChanged.connect(updateHint)
 
         Parameters
         ----------
-        parent : QObject, optional
-            The parent object.
-        dataFrame : DataFrame, optional
+        first : int
+            The first visible row.
+        last : int
+            The last visible row. A negative value denotes the last row of the model.
+        """
+        if last < 0:
+            last = self.rowCount() - 1
+        self._viewportHint = (max(first, 0), last)
+        if (
+            self._prefetchGeneration != self._generation
+            or first < self._prefetchStart
+            or last >= self._prefetchStop
+        ):
+            self._discardPrefetch()
+
+    def viewportHint(self) -> tuple[int, int] | None:
+        """
+        Return the range of rows currently visible in an attached view.
+
+        Returns
+        -------
+        tuple of int or None
+            The first and last visible row, or None if no hint has been set.
+        """
+        return self._viewportHint
+
+    def _discardPrefetch(self) -> None:
+        """Discard the prefetched block, so it is recomputed on the next access."""
+        self._prefetchGeneration = -1
+
+    def _prefetch(self) -> None:
+        """Prefetch the data of the rows around the viewport hint."""
+        self._prefetchGeneration = self._generation
+        self._prefetched = {}
+        self._prefetchStart = self._prefetchStop = 0
+        if self._viewportHint is None:
+            return
+        first, last = self._viewportHint
+        start = max(first - self._prefetchMargin, 0)
+        stop = min(last + self._prefetchMargin + 1, self.rowCount())
+        if start < stop:
+            rows = (
+                np.arange(start, stop) if self._rows is None else self._rows[start:stop]
+            )
+            self._prefetched = self._prefetchData(rows)
+            self._prefetchStart, self._prefetchStop = start, stop
+
+    def _prefetchData(self, rows: np.ndarray) -> dict[int, list[list[Any]]]:
+        """
+        Compute the data of all roles for a block of rows.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The positions of the rows in the column arrays.
+
+        Returns
+        -------
+        dict
+            Per role, one list of values per column.
+        """
+        values = [column[rows].tolist() for column in self._columns]
+        display = [
+            _formatValues(self._columns[c][rows], self._formatters[c])
+            if c in self._formatters
+            else values[c]
+            for c in range(len(values))
+        ]
+        return {Qt.ItemDataRole.DisplayRole: display, Qt.ItemDataRole.EditRole: values}
+
+    def _formattedData(self, row: int, column: int) -> str:
+        """
+        Return the formatted display text of a cell, formatting its block if needed.
+
+        Parameters
+        ----------
+        row : int
+            The row of the model.
+        column : int
+            The column of the cell.
+
+        Returns
+        -------
+        str
+            The display text.
+        """
+        block, offset = divmod(row, self._formatBlockSize)
+        cache = self._formatCache.setdefault(column, OrderedDict())
+        texts = cache.get(block)
+        if texts is None:
+            start = block * self._formatBlockSize
+            stop = min(start + self._formatBlockSize, self.rowCount())
+            rows = slice(start, stop) if self._rows is None else self._rows[start:stop]
+            texts = _formatValues(self._columns[column][rows], self._formatters[column])
+            cache[block] = texts
+            if len(cache) > self._formatCacheBlocks:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(block)
+        return texts[offset]
+
+    def _cellData(self, row: int, column: int, role: int) -> Any | None:
+        """
+        Get the data of a cell for the specified role.
+
+        Parameters
+        ----------
+        row : int
+            The position of the cell in the column arrays.
+        column : int
+            The column of the cell.
+        role : int
+            The role of the data.
+
+        Returns
+        -------
+        Any or None
+            The data of the cell.
+        """
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            data = self._columns[column][row]
+            if isinstance(data, np.generic):
+                return data.item()
+            return data
+        return None
+
+    def setData(
+        self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> bool:
+        """
+        Set data at the specified index with the given value.
+
+        The value is converted to the dtype of the column where possible, e.g., text
+        entered in an editor is parsed for numerical and boolean columns. Values that
+        cannot be represented by a numerical or boolean column are rejected instead of
+        converting the column to Python objects.
+
+        Parameters
+        ----------
+        index : QModelIndex
+            The index where the data will be set.
+        value : Any
+            The new value to be set at the specified index.
+        role : int, optional
+            The role of the data. Either DisplayRole or EditRole. Default: DisplayRole.
+
+        Returns
+        -------
+        bool
+            Returns true if successful; otherwise returns false.
+        """
+        if not index.isValid() or (
+            role != Qt.ItemDataRole.DisplayRole and role != Qt.ItemDataRole.EditRole
+        ):
+            return False
+        column = index.column()
+        try:
+            value = _coerceValues(value, self._dtypes[column])
+        except (TypeError, ValueError) as e:
+            log.warning(f'Cannot set value {value!r} in column {column}: {e}')
+            return False
+        self._edit(index.row(), column, 1, [value], 'Edit cell')
+        return True
+
+    def setBlock(self, topLeft: QModelIndex, values: npt.ArrayLike | DataFrame) -> bool:
+        """
+        Set a rectangular block of data with a single vectorized write per column.
+
+        In contrast to calling :meth:`setData` for every cell, :attr:`dataChanged` is
+        emitted only once for the whole block (or once per transaction, see
+        :meth:`beginEdit`). Values are converted to the dtypes of the columns as in
+        :meth:`setData`. If any value is rejected, no data is written.
+
+        Parameters
+        ----------
+        topLeft : QModelIndex
+            The index of the block's top-left cell.
+        values : array_like or DataFrame
+            A two-dimensional array of values, or a DataFrame whose columns are written
+            to consecutive columns of the model.
+
+        Returns
+        -------
+        bool
+            Returns true if successful; otherwise returns false.
+
+        Raises
+        ------
+        ValueError
+            If the values are not two-dimensional, exceed the bounds of the model or
+            cannot be represented by the dtypes of the columns.
+        """
+        if not topLeft.isValid():
+            return False
+        if isinstance(values, DataFrame):
+            nRows, nColumns = values.shape
+            columns = [values.iloc[:, i].to_numpy() for i in range(nColumns)]
+        else:
+            block = np.asarray(values)
+            if block.ndim != 2:
+                raise ValueError('Values must be two-dimensional')
+            nRows, nColumns = block.shape
+            columns = list(block.T)
+        top, left = topLeft.row(), topLeft.column()
+        if top + nRows > self.rowCount() or left + nColumns > self.columnCount():
+            raise ValueError('Values exceed the bounds of the model')
+        try:
+            columns = [
+                _coerceValues(values, self._dtypes[column])
+                for column, values in enumerate(columns, start=left)
+            ]
+        except TypeError as e:
+            raise ValueError(e) from e
+        if nRows == 1:
+            columns = [values[0] for values in columns]
+        if nRows > 0 and nColumns > 0:
+            self._edit(top, left, nRows, columns, 'Edit block')
+        return True
+
+    def beginEdit(self, text: str = 'Edit cells') -> None:
+        """
+        Begin a transaction of edits.
+
+        Until the matching call to :meth:`commitEdit`, edits made with :meth:`setData`
+        and :meth:`setBlock` are written to the model immediately, but
+        :attr:`dataChanged` is not emitted. Transactions may be nested; only the
+        outermost transaction is committed.
+
+        Parameters
+        ----------
+        text : str, optional
+            The text of the undo command created on commit, see :meth:`setUndoStack`.
+        """
+        if self._editDepth == 0:
+            self._editText = text
+            self._editRange = None
+            self._editLog = []
+        self._editDepth += 1
+
+    def commitEdit(self) -> None:
+        """
+        Commit a transaction of edits.
+
+        :attr:`dataChanged` is emitted once, for the range spanning all edited cells.
+        If an undo stack has been set, the transaction is pushed as a single command.
+        """
+        if self._editDepth == 0:
+            log.warning('commitEdit() called without matching beginEdit()')
+            return
+        self._editDepth -= 1
+        if self._editDepth > 0 or self._editRange is None:
+            return
+        top, left, bottom, right = self._editRange
+        if self._undoStack is not None:
+            self._undoStack.push(_EditCommand(self, self._editLog, self._editText))
+        self._editLog = []
+        self.dataChanged.emit(
+            self.index(top, left),
+            self.index(min(bottom, self.rowCount() - 1), right),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole],
+        )
+
+    def rollbackEdit(self) -> None:
+        """Revert all edits of the current transaction and end the transaction."""
+        if self._editDepth == 0:
+            log.warning('rollbackEdit() called without matching beginEdit()')
+            return
+        self._editDepth = 0
+        edits, self._editLog = self._editLog, []
+        self._applyEdits(edits, undo=True)
+
+    def undoStack(self) -> QUndoStack | None:
+        """
+        Get the undo stack receiving the model's edits.
+
+        Returns
+        -------
+        QUndoStack or None
+            The undo stack.
+        """
+        return self._undoStack
+
+    def setUndoStack(self, stack: QUndoStack | None) -> None:
+        """
+        Set an undo stack to receive the model's edits.
+
+        Every call to :meth:`setData` or :meth:`setBlock` outside a transaction, and
+        every committed transaction, is pushed to the stack as one command. Commands
+        become obsolete once rows are inserted before the end of the model or removed.
+
+        Parameters
+        ----------
+        stack : QUndoStack or None
+            The undo stack, or None to stop recording edits.
+        """
+        self._undoStack = stack
+
+    def _edit(
+        self, top: int, left: int, count: int, columns: list[Any], text: str
+    ) -> None:
+        """
+        Write values to consecutive columns and notify views and the undo stack.
+
+        Parameters
+        ----------
+        top : int
+            The first row of the model to write to.
+        left : int
+            The first column to write to.
+        count : int
+            The number of rows to write to.
+        columns : list
+            Per column, a single value if `count` is 1, otherwise an array of values.
+        text : str
+            The text of the undo command.
+        """
+        if count == 1:
+            rows: Any = self._storageRow(top)
+        elif self._rows is None:
+            rows = np.arange(top, top + count)
+        else:
+            rows = self._rows[top : top + count]
+        transaction = self._editDepth > 0
+        edits = self._editLog if transaction else []
+        record = transaction or self._undoStack is not None
+        for column, values in enumerate(columns, start=left):
+            old = self._columns[column][rows] if record else None
+            self._setValues(rows, column, values)
+            if record:
+                edits.append((rows, column, old, self._columns[column][rows]))
+        bottom, right = top + count - 1, left + len(columns) - 1
+        if transaction:
+            if self._editRange is None:
+                self._editRange = [top, left, bottom, right]
+            else:
+                r = self._editRange
+                r[:] = (
+                    min(r[0], top),
+                    min(r[1], left),
+                    max(r[2], bottom),
+                    max(r[3], right),
+                )
+            return
+        if self._undoStack is not None:
+            self._undoStack.push(_EditCommand(self, edits, text))
+        self.dataChanged.emit(
+            self.index(top, left),
+            self.index(bottom, right),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole],
+        )
+
+    def _applyEdits(self, edits: list[_Edit], undo: bool) -> None:
+        """
+        Write recorded edits to the column arrays, e.g., when undoing them.
+
+        Parameters
+        ----------
+        edits : list
+            The recorded edits, see :meth:`_edit`.
+        undo : bool
+            Whether to restore the old values (in reverse order) instead of writing the
+            new values.
+        """
+        if len(edits) == 0:
+            return
+        for rows, column, old, new in reversed(edits) if undo else edits:
+            self._setValues(rows, column, old if undo else new)
+        positions = np.concatenate([np.atleast_1d(edit[0]) for edit in edits])
+        if self._rows is not None:
+            positions = np.flatnonzero(np.isin(self._rows, positions))
+        if len(positions) > 0:
+            self.dataChanged.emit(
+                self.index(int(positions.min()), min(edit[1] for edit in edits)),
+                self.index(int(positions.max()), max(edit[1] for edit in edits)),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole],
+            )
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """
+        Sort the data based on the specified column and order.
+
+        The data itself is not reordered. Instead, the model presents its rows through
+        a permutation that is cached per column and order: sorting by a previously used
+        column and order does not require sorting again. Missing values are placed
+        last, and rows with equal values keep their relative order.
+
+        Parameters
+        ----------
+        column : int
+            The column index to sort by. A negative value restores the original order.
+        order : Qt.SortOrder, optional
+            The sort order. Defaults to Ascending order.
+        """
+        if self.columnCount() == 0:
+            return
+        if column < 0:
+            self._order = None
+            self._updateRows()
+        else:
+            self.sortByColumns([column], [order])
+
+    def sortByColumns(self, columns: list[int], orders: list[Qt.SortOrder]) -> None:
+        """
+        Sort the data based on multiple columns.
+
+        Rows are sorted by the first column, ties are broken by the second column, and
+        so forth. This can be used to implement multi-column sorting in a view, e.g.,
+        by adding a column to the sort keys when its header is shift-clicked. The
+        per-column sort keys are cached and shared with :meth:`sort`.
+
+        Parameters
+        ----------
+        columns : list of int
+            The column indices to sort by, in order of priority.
+        orders : list of Qt.SortOrder
+            The sort order for each of the columns.
+        """
+        keys = tuple(
+            (column, order == Qt.SortOrder.AscendingOrder)
+            for column, order in zip(columns, orders, strict=True)
+        )
+        if self.columnCount() == 0 or len(keys) == 0:
+            return
+        permutation = self._permutations.pop(keys, None)
+        if permutation is None:
+            if len(keys) == 1:
+                column, ascending = keys[0]
+                permutation, codes = self._sortOrder(column)
+                if not ascending:
+                    permutation = _reverseSortOrder(permutation, codes)
+            else:
+                sortKeys = [self._sortKey(column, asc) for column, asc in keys]
+                permutation = np.lexsort(sortKeys[::-1])
+            if len(self._permutations) >= 8:
+                del self._permutations[next(iter(self._permutations))]
+        self._permutations[keys] = permutation
+        self._order = permutation
+        self._orderBuffer = None
+        self._updateRows()
+
+    def _sortOrder(self, column: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the ascending sort order of a column.
+
+        The result is cached until the column is modified.
+
+        Parameters
+        ----------
+        column : int
+            The column index.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The stable ascending permutation, with missing values last, and the rank of
+            each value (equal values share a rank, missing values have a rank of -1).
+        """
+        if column not in self._sortOrders:
+            self._sortOrders[column] = _sortOrder(self._columns[column])
+        return self._sortOrders[column]
+
+    def _sortKey(self, column: int, ascending: bool) -> np.ndarray:
+        """
+        Get an integer sort key for a column.
+
+        Parameters
+        ----------
+        column : int
+            The column index.
+        ascending : bool
+            Whether to sort in ascending order.
+
+        Returns
+        -------
+        np.ndarray
+            Integer keys that sort like the column's values, with missing values last.
+        """
+        _, codes = self._sortOrder(column)
+        nCodes = codes.max() + 1 if len(codes) > 0 else 0
+        return np.where(codes < 0, nCodes, codes if ascending else nCodes - 1 - codes)
+
+    def _updateRows(self) -> None:
+        """
+        Update the rows presented by the model according to sort order and filter.
+
+        Persistent indexes (e.g., the selection of attached views) are updated. Indexes
+        of rows that are filtered out become invalid.
+        """
+        if self._mask is None:
+            rows = self._order
+        elif self._order is None:
+            rows = np.flatnonzero(self._mask)
+        else:
+            rows = self._order[self._mask[self._order]]
+        self.layoutAboutToBeChanged.emit()
+        persistentIndexes = self.persistentIndexList()
+        positions = np.array([i.row() for i in persistentIndexes], dtype=np.intp)
+        if self._rows is not None:
+            positions = self._rows[positions]
+        self._rows = rows
+        self._rowsBuffer = None
+        self._dataFrame = None
+        self._generation += 1
+        self._formatCache.clear()
+        self._headerCache.clear()
+        if len(persistentIndexes) > 0:
+            if rows is not None:
+                inverse = np.full(len(self._index), -1)
+                inverse[rows] = np.arange(len(rows))
+                positions = inverse[positions]
+            self.changePersistentIndexList(
+                persistentIndexes,
+                [
+                    self.index(int(row), i.column()) if row >= 0 else QModelIndex()
+                    for row, i in zip(positions, persistentIndexes, strict=True)
+                ],
+            )
+        self.layoutChanged.emit()
+
+    def setFilter(self, rowFilter: str | dict[Any, Callable] | Any | None) -> None:
+        """
+        Filter the rows presented by the model.
+
+        The filter is evaluated for all rows at once (vectorized) and the model
+        only presents the rows for which it evaluates to True. Rows appended with
+        :meth:`appendRows` are filtered as well. The filter is kept when a new DataFrame
+        is set, if possible.
+
+        Parameters
+        ----------
+        rowFilter : str, dict, array-like or None
+            One of the following:
+
+            - A boolean expression as accepted by :meth:`pandas.DataFrame.eval`,
+              e.g., ``'x > 0 and y == "foo"'``.
+            - A dictionary mapping column names to predicates. Each predicate is called
+              with the column's values as a NumPy array and must return a boolean array.
+              Rows must satisfy all predicates.
+            - A boolean mask with one element per row of the unsorted data.
+            - None to remove the filter.
+
+        Raises
+        ------
+        ValueError
+            If the filter does not evaluate to one boolean value per row.
+        """
+        t0 = time.perf_counter()
+        if rowFilter is None:
+            mask = None
+        else:
+            mask = self._filterMask(rowFilter)
+        self._filter = rowFilter
+        self._mask = mask
+        self._maskBuffer = None
+        self._updateRows()
+        self.filterApplied.emit(time.perf_counter() - t0)
+
+    @Slot(str)
+    def setFilterExpression(self, expression: str, delay: int = 250) -> None:
+        """
+        Filter the rows presented by the model with a delay.
+
+        This slot is intended to be connected to a signal that is emitted while the user
+        is typing (e.g., :attr:`QLineEdit.textChanged`). Evaluation of the filter is
+        postponed until `expression` has not changed for `delay` milliseconds. Errors
+        are reported through :attr:`filterFailed`.
+
+        Parameters
+        ----------
+        expression : str
+            A boolean expression as accepted by :meth:`pandas.DataFrame.eval`. An empty
+            string removes the filter.
+        delay : int, optional
+            The delay in milliseconds. Default: 250.
+        """
+        self._filterExpression = expression
+        self._filterTimer.start(delay)
+
+    def _applyFilterExpression(self) -> None:
+        """Apply the pending filter expression."""
+        try:
+            self.setFilter(self._filterExpression.strip() or None)
+        except _filterErrors as e:
+            self.filterFailed.emit(str(e))
+
+    def _filterMask(
+        self, rowFilter: Any, dataFrame: DataFrame | None = None
+    ) -> np.ndarray:
+        """
+        Evaluate a filter for the rows of the model or of a DataFrame.
+
+        Parameters
+        ----------
+        rowFilter : str, dict or array-like
+            The filter. See :meth:`setFilter`.
+        dataFrame : DataFrame, optional
+            The DataFrame to evaluate the filter for. Default: the model's data,
+            ignoring sort order and filter.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask with one element per row.
+
+        Raises
+        ------
+        ValueError
+            If the filter does not evaluate to one boolean value per row.
+        """
+        size = len(self._index) if dataFrame is None else len(dataFrame)
+        if isinstance(rowFilter, str):
+            mask = (self._unsortedDataFrame() if dataFrame is None else dataFrame).eval(
+                rowFilter
+            )
+        elif isinstance(rowFilter, dict):
+            mask = np.ones(size, dtype=bool)
+            for column, predicate in rowFilter.items():
+                if dataFrame is None:
+                    values = self._columns[self._columnIndex.get_loc(column)]
+                else:
+                    values = dataFrame[column].to_numpy()
+                mask &= np.asarray(predicate(values), dtype=bool)
+        else:
+            mask = rowFilter
+        if isinstance(mask, pd.Series):  # may share the memory of a boolean column
+            mask = mask.to_numpy(dtype=bool, na_value=False, copy=True)
+        mask = np.asarray(mask)
+        if mask.dtype != bool or mask.shape != (size,):
+            raise ValueError('The filter must evaluate to one boolean value per row.')
+        return mask
+
+    def _invalidateSortCache(self, column: int | None = None) -> None:
+        """
+        Discard cached sort keys and permutations.
+
+        Parameters
+        ----------
+        column : int, optional
+            Only discard entries depending on this column. Default: all entries.
+        """
+        if column is None:
+            self._sortOrders.clear()
+            self._permutations.clear()
+            return
+        self._sortOrders.pop(column, None)
+        for keys in [k for k in self._permutations if column in (c for c, _ in k)]:
+            del self._permutations[keys]
+
+    def appendRows(self, dataFrame: DataFrame) -> None:
+        """
+        Append the rows of a DataFrame to the model.
+
+        In contrast to :meth:`setDataFrame`, this does not reset the model: attached
+        views keep their selection and scroll position. The column arrays are backed by
+        buffers with spare capacity, so that repeatedly appending small batches of rows
+        does not require copying the model's data every time.
+
+        If both the model and `dataFrame` use a default :class:`~pandas.RangeIndex`,
+        the appended rows continue the model's index. Otherwise, the row labels of
+        `dataFrame` are preserved.
+
+        Parameters
+        ----------
+        dataFrame : DataFrame
+            The rows to be appended. Must have the same columns as the model, unless the
+            model does not have any columns yet.
+
+        Raises
+        ------
+        ValueError
+            If the columns of `dataFrame` do not match the columns of the model.
+        """
+        if self.columnCount() == 0 and self.rowCount() == 0:
+            self.setDataFrame(dataFrame)
+            return
+        if not dataFrame.columns.equals(self._columnIndex):
+            raise ValueError('The columns of the DataFrame do not match the model.')
+        if len(dataFrame) == 0:
+            return
+        newColumns = [
+            _columnToArray(dataFrame.iloc[:, i]) for i in range(dataFrame.shape[1])
+        ]
+        newMask = None
+        if isinstance(self._filter, str | dict):
+            newMask = self._filterMask(self._filter, dataFrame)
+        count = len(dataFrame) if newMask is None else int(np.count_nonzero(newMask))
+        row = self.rowCount()
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._insert(row, newColumns, list(dataFrame.dtypes), dataFrame.index, newMask)
+        if count > 0:
+            self.endInsertRows()
+
+    def insertRows(
+        self, row: int, count: int, parent: QModelIndex | None = None
+    ) -> bool:
+        """
+        Insert rows of missing values before the given row.
+
+        Integer columns are upcast to float, and boolean columns to object.
+
+        Parameters
+        ----------
+        row : int
+            The row before which the new rows are inserted. If `row` equals
+            :meth:`rowCount`, the rows are appended.
+        count : int
+            The number of rows to insert.
+        parent : QModelIndex, optional
+            The parent index. Must be invalid for table models.
+
+        Returns
+        -------
+        bool
+            True if the rows were inserted, otherwise False.
+        """
+        if (
+            (isinstance(parent, QModelIndex) and parent.isValid())
+            or not 0 <= row <= self.rowCount()
+            or count < 1
+        ):
+            return False
+        newColumns = [_missingValues(values.dtype, count) for values in self._columns]
+        newDtypes = [
+            dtype if newValues.dtype == values.dtype else newValues.dtype
+            for dtype, values, newValues in zip(self._dtypes, self._columns, newColumns)
+        ]
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._insert(row, newColumns, newDtypes, None)
+        self.endInsertRows()
+        return True
+
+    def removeRows(
+        self, row: int, count: int, parent: QModelIndex | None = None
+    ) -> bool:
+        """
+        Remove rows from the model.
+
+        Parameters
+        ----------
+        row : int
+            The first row to be removed.
+        count : int
+            The number of rows to remove.
+        parent : QModelIndex, optional
+            The parent index. Must be invalid for table models.
+
+        Returns
+        -------
+        bool
+            True if the rows were removed, otherwise False.
+        """
+        if (
+            (isinstance(parent, QModelIndex) and parent.isValid())
+            or row < 0
+            or count < 1
+            or row + count > self.rowCount()
+        ):
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        if self._rows is None:
+            positions = np.arange(row, row + count)
+        else:
+            positions = np.sort(self._rows[row : row + count])
+            rows = np.delete(self._rows, slice(row, row + count))
+            self._rows = rows - np.searchsorted(positions, rows)
+            self._rowsBuffer = None
+            if self._order is not None:
+                keep = np.ones(len(self._index), dtype=bool)
+                keep[positions] = False
+                order = self._order[keep[self._order]]
+                self._order = order - np.searchsorted(positions, order)
+                self._orderBuffer = None
+            if self._mask is not None:
+                self._mask = np.delete(self._mask, positions)
+                self._maskBuffer = None
+        self._columns = [np.delete(values, positions) for values in self._columns]
+        self._storageGeneration += 1
+        self._index = self._index.delete(positions)
+        self._buffers = [None] * len(self._columns)
+        self._indexBuffer = None
+        self._invalidateSortCache()
+        self._formatCache.clear()
+        self._headerCache.clear()
+        self._dataFrame = None
+        self._generation += 1
+        self._unsortedDataFrameCache = None
+        self.endRemoveRows()
+        return True
+
+    def _insert(
+        self,
+        row: int,
+        newColumns: list[np.ndarray],
+        newDtypes: list[Any],
+        newIndex: pd.Index | None,
+        newMask: np.ndarray | None = None,
+    ) -> None:
+        """
+        Insert column arrays into the model's column arrays.
+
+        Rows appended to the end of the model are written to the spare capacity of the
+        column buffers (amortized O(k) for k rows). Rows inserted elsewhere require
+        the column arrays to be copied. If the model is sorted or filtered, new rows
+        are always appended to the column arrays and only the presented rows are
+        modified.
+
+        Parameters
+        ----------
+        row : int
+            The row before which the new rows are inserted.
+        newColumns : list of np.ndarray
+            One array per column, holding the values of the new rows.
+        newDtypes : list
+            The pandas dtypes of the new columns.
+        newIndex : pd.Index, optional
+            The labels of the new rows. If None, missing labels are used.
+        newMask : np.ndarray, optional
+            Whether the new rows pass the model's filter. If None, all new rows are
+            presented.
+        """
+        count = len(newColumns[0]) if newColumns else 0
+        size = len(self._index)
+        if self._rows is not None:
+            newRows = np.arange(size, size + count)
+            if self._order is not None:
+                self._order, self._orderBuffer = _appendToBuffer(
+                    self._order, self._orderBuffer, newRows
+                )
+            if self._mask is not None:
+                if newMask is None:
+                    newMask = np.ones(count, dtype=bool)
+                self._mask, self._maskBuffer = _appendToBuffer(
+                    self._mask, self._maskBuffer, newMask
+                )
+                newRows = newRows[newMask]
+            if row == len(self._rows):
+                self._rows, self._rowsBuffer = _appendToBuffer(
+                    self._rows, self._rowsBuffer, newRows
+                )
+            else:
+                self._rows = np.insert(self._rows, row, newRows)
+                self._rowsBuffer = None
+            row = size
+        append = row == size
+        for i, (values, newValues) in enumerate(zip(self._columns, newColumns)):
+            if append:
+                self._columns[i], self._buffers[i] = _appendToBuffer(
+                    values, self._buffers[i], newValues
+                )
+            else:
+                dtype = _commonDtype(values.dtype, newValues.dtype)
+                self._columns[i] = np.insert(values.astype(dtype), row, newValues)
+                self._buffers[i] = None
+                self._storageGeneration += 1
+            if (
+                self._dtypes[i] != newDtypes[i]
+                or self._columns[i].dtype != values.dtype
+            ):
+                self._dtypes[i] = self._columns[i].dtype
+
+        defaultIndex = isinstance(self._index, pd.RangeIndex) and self._index.equals(
+            pd.RangeIndex(len(self._index))
+        )
+        if defaultIndex and (newIndex is None or isinstance(newIndex, pd.RangeIndex)):
+            self._index = pd.RangeIndex(len(self._index) + count)
+        else:
+            labels = self._index.to_numpy()
+            newLabels = (
+                np.full(count, np.nan, dtype=object)
+                if newIndex is None
+                else newIndex.to_numpy()
+            )
+            if append:
+                labels, self._indexBuffer = _appendToBuffer(
+                    labels, self._indexBuffer, newLabels
+                )
+            else:
+                dtype = _commonDtype(labels.dtype, newLabels.dtype)
+                labels = np.insert(labels.astype(dtype), row, newLabels)
+                self._indexBuffer = None
+            self._index = pd.Index(labels, dtype=labels.dtype, copy=False)
+        self._invalidateSortCache()
+        self._formatCache.clear()
+        self._headerCache.clear()
+        self._dataFrame = None
+        self._generation += 1
+        self._unsortedDataFrameCache = None
+
+    def _setValues(self, rows: int | np.ndarray, column: int, value: Any) -> None:
+        """
+        Write values to a column array.
+
+        If the values cannot be represented by the column's dtype, the column is
+        upcast to a suitable dtype first (similar to ``DataFrame.iloc``). Read-only
+        columns (e.g., views shared with a DataFrame) are copied before writing.
+
+        Parameters
+        ----------
+        rows : int or np.ndarray
+            The row position(s).
+        column : int
+            The column position.
+        value : Any
+            A single value, or an array of values with one value per row.
+        """
+        values = self._columns[column]
+        if values.dtype != object:
+            dtype = _commonDtype(values.dtype, _valueDtype(value))
+            if dtype != values.dtype:
+                values = values.astype(dtype)
+                self._dtypes[column] = dtype
+        if not values.flags.writeable:
+            values = values.copy()
+        self._columns[column] = values
+        values[rows] = value
+        self._invalidateSortCache(column)
+        self._formatCache.pop(column, None)
+        self._dataFrame = None
+        self._generation += 1
+        self._unsortedDataFrameCache = None
+
+
+class _EditCommand(QUndoCommand):
+    """Undo command for edits of a :class:`DataFrameTableModel`."""
+
+    def __init__(self, model: DataFrameTableModel, edits: list[_Edit], text: str):
+        super().__init__(text)
+        self._model = model
+        self._edits = edits
+        self._storageGeneration = model._storageGeneration
+        self._applied = True  # the edits have been applied before the command is pushed
+
+    def undo(self) -> None:
+        if self._isValid():
+            self._model._applyEdits(self._edits, undo=True)
+            self._applied = False
+
+    def redo(self) -> None:
+        if not self._applied and self._isValid():
+            self._model._applyEdits(self._edits, undo=False)
+            self._applied = True
+
+    def _isValid(self) -> bool:
+        if self._model._storageGeneration == self._storageGeneration:
+            return True
+        log.warning('Cannot undo or redo edits after rows were inserted or removed')
+        self.setObsolete(True)
+        return False
+
+
+def _valueDtype(value: Any) -> np.dtype:
+    """
+    Determine the dtype of a value or an array of values to be written to a model.
+
+    Parameters
+    ----------
+    value : Any
+        A single value or an array of values.
+
+    Returns
+    -------
+    np.dtype
+        The dtype of the value. For arrays of Python objects, the dtype is inferred
+        from the objects.
+    """
+    dtype = np.asarray(value).dtype
+    if dtype != np.dtype(object) or np.ndim(value) == 0:
+        return dtype
+    inferred = pd.Series(value, dtype=object).infer_objects().dtype
+    return inferred if isinstance(inferred, np.dtype) else dtype
+
+
+_missingStrings = ['', 'nan', 'none', '<na>']
+_booleanStrings = {
+    'true': True,
+    'false': False,
+    'yes': True,
+    'no': False,
+    '1': True,
+    '0': False,
+}
+
+
+def _coerceValues(values: Any, dtype: Any) -> Any:
+    """
+    Convert values written to a model to the dtype of the model's column.
+
+    Numerical values are cast to numerical dtypes if that is lossless, so that writing
+    e.g. a Python integer to an int32 column does not widen the column. Values that
+    cannot be cast losslessly (e.g., fractions written to integer columns) are
+    returned as they are, leaving promotion to the caller. Text is parsed for
+    numerical and boolean dtypes, and converted for other pandas dtypes.
+
+    Parameters
+    ----------
+    values : Any
+        A single value or a one-dimensional array of values.
+    dtype : Any
+        The pandas dtype of the column.
+
+    Returns
+    -------
+    Any
+        The converted value or array of values.
+
+    Raises
+    ------
+    ValueError
+        If the values cannot be represented by a numerical, boolean, categorical or
+        datetime-like dtype.
+    """
+    if dtype == np.dtype(object):
+        return values
+    array = np.asarray(values)
+    if pd.api.types.is_bool_dtype(dtype):
+        array = _toBoolean(array)
+    elif pd.api.types.is_numeric_dtype(dtype) and array.dtype.kind not in 'biufc':
+        series = pd.Series(array.ravel(), dtype=object)
+        text = series.astype(str).str.strip().str.lower()
+        series = series.mask(series.isna() | text.isin(_missingStrings), None)
+        try:
+            array = pd.to_numeric(series).to_numpy().reshape(array.shape)
+        except TypeError as e:
+            raise ValueError(e) from e
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufc':
+        if dtype.kind in 'iu' and array.dtype.kind in 'biuf':
+            info = np.iinfo(dtype)
+            if np.all((array >= info.min) & (array <= info.max) & (array % 1 == 0)):
+                array = array.astype(dtype)
+        elif dtype.kind == 'f' and array.dtype.kind in 'biuf':
+            with np.errstate(over='ignore'):
+                floats = array.astype(dtype)
+            if np.array_equal(np.isfinite(floats), np.isfinite(array)):
+                array = floats
+        return array[()] if array.ndim == 0 else array
+    if isinstance(dtype, pd.CategoricalDtype):
+        unknown = ~pd.isna(array) & ~np.isin(array, dtype.categories.to_numpy())
+        if np.any(unknown):
+            raise ValueError(f'{array[unknown].ravel()[0]!r} is not a valid category')
+    values = cast(Sequence[object], array.ravel())  # arrays are accepted at runtime
+    converted = pd.Series(pd.array(values, dtype=dtype), copy=False)
+    result = converted.to_numpy(dtype=object)
+    return result[0] if array.ndim == 0 else result
+
+
+def _toBoolean(array: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of values to booleans.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Booleans, the numbers 0 and 1, or text such as 'true' or 'no'.
+
+    Returns
+    -------
+    np.ndarray
+        The boolean array.
+
+    Raises
+    ------
+    ValueError
+        If a value cannot be interpreted as a boolean.
+    """
+    if array.dtype.kind == 'b':
+        return array
+    if array.dtype.kind in 'iuf':
+        if not np.all((array == 0) | (array == 1)):
+            raise ValueError('Only 0 and 1 can be interpreted as booleans')
+        return array.astype(bool)
+    result = np.empty(array.shape, dtype=bool)
+    for i, value in enumerate(array.flat):
+        if isinstance(value, (bool, np.bool_)):
+            result.flat[i] = value
+        elif isinstance(value, str) and value.strip().lower() in _booleanStrings:
+            result.flat[i] = _booleanStrings[value.strip().lower()]
+        else:
+            raise ValueError(f'{value!r} cannot be interpreted as a boolean')
+    return result
+
+
+def _columnToArray(column: pd.Series) -> np.ndarray:
+    """
+    Convert a DataFrame column to the NumPy array backing a table model.
+
+    Parameters
+    ----------
+    column : Series
+        The column to convert.
+
+    Returns
+    -------
+    np.ndarray
+        A view of the column's data for numerical and boolean dtypes, or an array of
+        Python objects for all other dtypes. Views of the column's memory are marked as
+        read-only.
+    """
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufc':
+        values = column.to_numpy()
+    else:
+        values = column.to_numpy(dtype=object)
+    if values.flags.writeable and not values.flags.owndata:
+        values = values.view()
+        values.flags.writeable = False
+    return values
+
+
+def _labelsToText(labels: pd.Index, separator: str) -> list[str]:
+    """
+    Convert index labels to header texts.
+
+    Parameters
+    ----------
+    labels : pd.Index
+        The labels to convert.
+    separator : str
+        The separator between the levels of a MultiIndex.
+
+    Returns
+    -------
+    list of str
+        The header texts.
+    """
+    if isinstance(labels, pd.MultiIndex):
+        levels = [
+            labels.get_level_values(level).astype(object)
+            for level in range(labels.nlevels)
+        ]
+        return [separator.join(map(str, parts)) for parts in zip(*levels)]
+    return [str(label) for label in labels.astype(object)]
+
+
+def _formatValues(
+    values: np.ndarray, formatter: str | Callable[[Any], str]
+) -> list[str]:
+    """
+    Format values for display.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values to format.
+    formatter : str or Callable
+        A printf-style format string or a callable formatting a single value.
+
+    Returns
+    -------
+    list of str
+        The formatted values. Values that cannot be formatted with a format string are
+        converted with :func:`str`.
+    """
+    if not isinstance(formatter, str):
+        return [formatter(value) for value in values.tolist()]
+    if values.dtype.kind in 'biuf':
+        try:
+            return np.char.mod(formatter, values).tolist()
+        except (TypeError, ValueError):
+            pass
+    texts = []
+    for value in values.tolist():
+        try:
+            texts.append(formatter % (value,))
+        except (TypeError, ValueError):
+            texts.append(str(value))
+    return texts
+
+
+def _commonDtype(dtype1: np.dtype, dtype2: np.dtype) -> np.dtype:
+    """
+    Determine the dtype that can hold values of two dtypes.
+
+    Parameters
+    ----------
+    dtype1 : np.dtype
+        The first dtype.
+    dtype2 : np.dtype
+        The second dtype.
+
+    Returns
+    -------
+    np.dtype
+        The promoted dtype for numerical dtypes and object otherwise. Booleans are only
+        combined with booleans.
+    """
+    if dtype1 == dtype2:
+        return dtype1
+    if dtype1.kind in 'iufc' and dtype2.kind in 'iufc':
+        return np.result_type(dtype1, dtype2)
+    return np.dtype(object)
+
+
+def _sortOrder(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Determine the stable ascending sort order of an array.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The array to be sorted.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The stable ascending permutation, with missing values last, and the rank of
+        each value (equal values share a rank, missing values have a rank of -1).
+    """
+    if values.dtype.kind not in 'biufc':
+        codes, _ = pd.factorize(values, sort=True)
+        key = np.where(codes < 0, len(values), codes)
+        return np.argsort(key, kind='stable'), codes
+    permutation = np.argsort(values, kind='stable')
+    sortedValues = values[permutation]
+    codes = np.empty(len(values), dtype=np.intp)
+    if len(values) > 0:
+        codes[permutation] = np.concatenate(
+            ([0], np.cumsum(sortedValues[1:] != sortedValues[:-1]))
+        )
+    if values.dtype.kind in 'fc':
+        codes[np.isnan(values)] = -1
+    return permutation, codes
+
+
+def _reverseSortOrder(permutation: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Derive the stable descending sort order from the stable ascending sort order.
+
+    Groups of equal values are reversed while the order within each group and the
+    position of missing values (last) are maintained.
+
+    Parameters
+    ----------
+    permutation : np.ndarray
+        The stable ascending permutation, with missing values last.
+    codes : np.ndarray
+        The rank of each value, as returned by :func:`_sortOrder`.
+
+    Returns
+    -------
+    np.ndarray
+        The stable descending permutation, with missing values last.
+    """
+    sortedCodes = codes[permutation]
+    nValid = np.count_nonzero(sortedCodes >= 0)
+    sortedCodes = sortedCodes[:nValid]
+    counts = np.bincount(sortedCodes)
+    ascendingStarts = np.cumsum(counts) - counts
+    descendingStarts = nValid - np.cumsum(counts)
+    positions = np.arange(nValid) + (descendingStarts - ascendingStarts)[sortedCodes]
+    result = permutation.copy()
+    result[positions] = permutation[:nValid]
+    return result
+
+
+def _missingValues(dtype: np.dtype, count: int) -> np.ndarray:
+    """
+    Create an array of missing values, compatible with the given dtype.
+
+    Parameters
+    ----------
+    dtype : np.dtype
+        The dtype of the column.
+    count : int
+        The number of values.
+
+    Returns
+    -------
+    np.ndarray
+        An array of NaN values.
+    """
+    if dtype.kind in 'fc':
+        return np.full(count, np.nan, dtype=dtype)
+    if dtype.kind in 'iu':
+        return np.full(count, np.nan)
+    return np.full(count, np.nan, dtype=object)
+
+
+def _appendToBuffer(
+    values: np.ndarray, buffer: np.ndarray | None, newValues: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Append values to an array, using the spare capacity of a buffer if possible.
+
+    If `values` is a view of the start of `buffer` and the buffer is large enough, the
+    new values are written to the buffer in place. The result is then read-only if
+    `values` is, so that memory shared by read-only views is copied before it is
+    modified. Otherwise, a new buffer is allocated with 50 % spare capacity. Values are
+    appended along the first axis; buffers of multi-dimensional arrays are allocated in
+    column-major (Fortran) order.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The array to append to.
+    buffer : np.ndarray, optional
+        The buffer backing `values`.
+    newValues : np.ndarray
+        The values to be appended.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The concatenated values (a view of the buffer) and the buffer.
+    """
+    n, k = len(values), len(newValues)
+    dtype = _commonDtype(values.dtype, newValues.dtype)
+    readOnly = False
+    if (
+        buffer is None
+        or values.base is not buffer
+        or values.ctypes.data != buffer.ctypes.data
+        or buffer.dtype != dtype
+        or buffer.shape[1:] != values.shape[1:]
+        or len(buffer) < n + k
+    ):
+        shape = ((n + k) * 3 // 2 + 16, *values.shape[1:])
+        buffer = np.empty(shape, dtype=dtype, order='F')
+        buffer[:n] = values
+    else:
+        readOnly = not values.flags.writeable
+    buffer[n : n + k] = newValues
+    values = buffer[: n + k]
+    if readOnly:
+        values.flags.writeable = False
+    return values, buffer
+
+
+def _columnsToDataFrame(
+    columns: Sequence[np.ndarray],
+    dtypes: Sequence[Any],
+    index: pd.Index,
+    columnIndex: pd.Index,
+) -> DataFrame:
+    """
+    Construct a DataFrame from the column arrays backing a table model.
+
+    Parameters
+    ----------
+    columns : sequence of np.ndarray
+        The column arrays.
+    dtypes : sequence
+        The pandas dtypes of the columns.
+    index : pd.Index
+        The row labels.
+    columnIndex : pd.Index
+        The column labels.
+
+    Returns
+    -------
+    DataFrame
+        A DataFrame sharing the memory of numerical and boolean columns.
+    """
+    dataFrame = DataFrame(
+        {
+            i: _arrayToColumn(values, dtype)
+            for i, (values, dtype) in enumerate(zip(columns, dtypes, strict=True))
+        },
+        index=index,
+        copy=False,
+    )
+    dataFrame.columns = columnIndex
+    return dataFrame
+
+
+def _arrayToColumn(values: np.ndarray, dtype: Any) -> Any:
+    """
+    Convert an array backing a table model back to the given pandas dtype.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The array to convert.
+    dtype : Any
+        The pandas dtype of the original column.
+
+    Returns
+    -------
+    Any
+        The array itself if it already has the requested dtype, otherwise a pandas
+        array of the requested dtype.
+    """
+    if values.dtype == dtype:
+        return values
+    # pandas-stubs only declare sequences, but arrays are accepted at runtime
+    return pd.array(cast(Sequence[object], values), dtype=dtype)
+
+
+@lru_cache
+def _getColormap(name: str) -> ColorMap | None:
+    """
+    Return a colormap by name.
+
+    Results are cached for the lifetime of the process, as listing the available
+    colormaps is expensive.
+
+    Parameters
+    ----------
+    name : str
+        The name of a colormap from pyqtgraph, matplotlib or colorcet.
+
+    Returns
+    -------
+    ColorMap or None
+        The colormap, or None if there is no colormap with the given name.
+    """
+    for source in [None, 'matplotlib', 'colorcet']:
+        if name in colormap.listMaps(source):
+            return colormap.get(name, source)
+    return None
+
+
+@lru_cache
+def _getColormapTable(name: str, nColors: int) -> npt.NDArray[np.uint8]:
+    """
+    Return a lookup table of RGB values sampled from a colormap.
+
+    Results are cached for the lifetime of the process.
+
+    Parameters
+    ----------
+    name : str
+        The name of the colormap, see :func:`_getColormap`.
+    nColors : int
+        The number of entries of the lookup table.
+
+    Returns
+    -------
+    np.ndarray
+        A read-only array of shape (nColors, 3).
+    """
+    cmap = _getColormap(name)
+    if cmap is None:
+        raise ValueError(f'No such colormap: "{name}"')
+    table = np.ascontiguousarray(cmap.mapToByte(np.linspace(0, 1, nColors))[:, :3])
+    table.flags.writeable = False
+    return table
+
+
+_Bounds = tuple[np.ndarray, np.ndarray]
+_Normalization = tuple[
+    int,
+    npt.NDArray[np.float32],
+    npt.NDArray[np.bool_],
+    dict[str, _Bounds],
+    tuple[str, tuple[float, float]],
+    npt.NDArray[np.uint8],
+]
+_scalings = ('column', 'row', 'global', 'fixed')
+
+
+class ColoredDataFrameTableModel(DataFrameTableModel):
+    """Extension of DataFrameTableModel providing color-mapped numerical data."""
+
+    colormapChanged = Signal(str)  # type: Signal
+    """Emitted when the colormap has been changed."""
+
+    alphaChanged = Signal(int)  # type: Signal
+    """Emitted when the alpha value has been changed."""
+
+    colorsReady = Signal()  # type: Signal
+    """Emitted when the colors have been computed from the data."""
+
+    normalizationChanged = Signal(str)  # type: Signal
+    """Emitted when the normalization has been changed."""
+
+    scalingChanged = Signal(str)  # type: Signal
+    """Emitted when the scaling has been changed."""
+
+    statisticsChanged = Signal()  # type: Signal
+    """Emitted when the bounds for mapping values to the colormap have changed."""
+
+    _roles = (
+        Qt.ItemDataRole.DisplayRole,
+        Qt.ItemDataRole.EditRole,
+        Qt.ItemDataRole.BackgroundRole,
+        Qt.ItemDataRole.ForegroundRole,
+    )
+    _normValues: npt.NDArray[np.float32] = np.zeros((0, 0), dtype=np.float32)
+    _normIsBool: npt.NDArray[np.bool_] = np.zeros(0, dtype=bool)
+    _normDtypes: list[np.dtype]
+    _statistics: dict[str, _Bounds]
+    _colorIndex: npt.NDArray[np.uint8] = np.zeros((0, 0), dtype=np.uint8)
+    _normBuffer: np.ndarray | None = None
+    _colorBuffer: np.ndarray | None = None
+    _rowBuffers: tuple[np.ndarray | None, np.ndarray | None] = (None, None)
+    _palette: npt.NDArray[np.uint32] = np.zeros(0, dtype=np.uint32)
+    _foregroundPalette: npt.NDArray[np.uint32] = np.zeros(0, dtype=np.uint32)
+    _backgroundColors: list[QColor]
+    _foregroundColors: list[QColor]
+    _nColors = 255  # number of colormap entries; index _nColors denotes missing values
+    _cmap: ColorMap = colormap.get('plasma')
+    _cmapName: str = 'plasma'
+    _alpha: int = 255
+    _asynchronous: bool = False
+    _colorsPending: bool = False
+    _normGeneration: int = 0
+    _normalization: str = 'linear'
+    _percentile: float = 1.0
+    _scaling: str = 'column'
+    _fixedRange: tuple[float, float] = (0.0, 1.0)
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        dataFrame: DataFrame | None = None,
+        colormap: str = 'plasma',
+        alpha: int = 255,
+        copy: bool = True,
+        asynchronous: bool = False,
+        normalization: str = 'linear',
+        scaling: str = 'column',
+    ):
+        """
+        Initialize the ColoredDataFrameTableModel.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            The parent object.
+        dataFrame : DataFrame, optional
             The Pandas DataFrame to be represented by the model.
         colormap : str
             The colormap to be used. Can be the name of a valid colormap from matplotlib or colorcet.
         alpha : int
             The alpha value of the colormap. Must be between 0 and 255.
+        copy : bool, optional
+            Whether to copy the DataFrame. See :meth:`DataFrameTableModel.setDataFrame`.
+            Default: True.
+        asynchronous : bool, optional
+            Whether to compute colors in a background thread. Default: False.
+        normalization : str, optional
+            The normalization of the data, see :meth:`setNormalization`.
+            Default: 'linear'.
+        scaling : str, optional
+            The scaling of the data, see :meth:`setScaling`. Default: 'column'.
         *args : tuple
             Positional arguments passed to the parent class.
         **kwargs : dict
             Keyword arguments passed to the parent class.
 
         """
-        super().__init__(parent=parent)
-        self.modelReset.connect(self._normalizeData)
-        self.dataChanged.connect(self._normalizeData)
-        self.colormapChanged.connect(self._defineColors)
-        self.setProperty('colormap', colormap)
-        self.setProperty('alpha', alpha)
-        if dataFrame is not None:
-            self.setDataFrame(dataFrame)
+        super().__init__(parent=parent)
+        self._asynchronous = asynchronous
+        self._statistics = {'column': (np.zeros(0), np.ones(0))}
+        self._normDtypes = []
+        self._backgroundColors = []
+        self._foregroundColors = []
+        self._colorsTimer = QTimer(self)
+        self._colorsTimer.setSingleShot(True)
+        self._colorsTimer.setInterval(16)
+        self._colorsTimer.timeout.connect(self._emitColorsChanged)
+        self.modelReset.connect(self._normalizeData)
+        self.dataChanged.connect(self._onDataChanged)
+        self.rowsRemoved.connect(self._normalizeData)
+        self.colormapChanged.connect(self._definePalette)
+        self.setProperty('colormap', colormap)
+        self.setProperty('alpha', alpha)
+        self.setNormalization(normalization)
+        self.setScaling(scaling)
+        if dataFrame is not None:
+            self.setDataFrame(dataFrame, copy=copy)
+
+    def getColormap(self) -> str:
+        """
+        Return the name of the current colormap.
+
+        Returns
+        -------
+        str
+            The name of the current colormap
+        """
+        return self._cmap.name
+
+    @Slot(str)
+    def setColormap(self, name: str):
+        """
+        Set the colormap.
+
+        Parameters
+        ----------
+        name : str
+            Name of the colormap to be used. Can be the name of a valid colormap from matplotlib or colorcet.
+        """
+        cmap = _getColormap(name)
+        if cmap is None:
+            log.warning(f'No such colormap: "{name}"')
+            return
+        self._cmap, self._cmapName = cmap, name
+        self.colormapChanged.emit(name)
+
+    colormap = Property(str, fget=getColormap, fset=setColormap, notify=colormapChanged)  # type: Property
+    """The name of the colormap."""
+
+    def getAlpha(self) -> int:
+        """
+        Return the alpha value of the colormap.
+
+        Returns
+        -------
+        int
+            The alpha value of the colormap.
+        """
+        return self._alpha
+
+    @Slot(int)
+    def setAlpha(self, alpha: int = 255):
+        """
+        Set the alpha value of the colormap.
+
+        Parameters
+        ----------
+        alpha : int
+            The alpha value of the colormap. Must be between 0 and 255.
+        """
+        _, self._alpha, _ = sorted([0, alpha, 255])
+        self.alphaChanged.emit(self._alpha)
+        self._definePalette()
+
+    alpha = Property(int, fget=getAlpha, fset=setAlpha, notify=alphaChanged)  # type: Property
+    """The alpha value of the colormap."""
+
+    def isAsynchronous(self) -> bool:
+        """
+        Return whether colors are computed in a background thread.
+
+        Returns
+        -------
+        bool
+            Whether colors are computed in a background thread.
+        """
+        return self._asynchronous
+
+    def setAsynchronous(self, asynchronous: bool) -> None:
+        """
+        Set whether colors are computed in a background thread.
+
+        Parameters
+        ----------
+        asynchronous : bool
+            Whether to compute colors in a background thread. Takes effect with the
+            next normalization of the data.
+        """
+        self._asynchronous = asynchronous
+
+    asynchronous = Property(bool, fget=isAsynchronous, fset=setAsynchronous)  # type: Property
+    """Whether colors are computed in a background thread."""
+
+    def getNormalization(self) -> str:
+        """
+        Return the normalization of the data.
+
+        Returns
+        -------
+        str
+            The normalization of the data.
+        """
+        return self._normalization
+
+    @Slot(str)
+    def setNormalization(
+        self, normalization: str, percentile: float | None = None
+    ) -> None:
+        """
+        Set the normalization of the data for mapping to the colormap.
+
+        Parameters
+        ----------
+        normalization : str
+            One of the following:
+
+            - ``'linear'``: values are scaled linearly to their range.
+            - ``'log'``: logarithms of values are scaled linearly to their range.
+              Values less than or equal to zero are treated as missing values.
+            - ``'robust'``: values are scaled linearly to the range between a lower and
+              an upper percentile. Values outside that range are clipped, so that
+              outliers do not compress the colors of all other values.
+
+            Whether ranges are those of columns, rows or the whole table is determined
+            by the scaling, see :meth:`setScaling`.
+        percentile : float, optional
+            The lower percentile for robust normalization. The upper percentile is
+            ``100 - percentile``. Default: unchanged (initially 1.0).
+        """
+        if normalization not in ('linear', 'log', 'robust'):
+            log.warning(f'No such normalization: "{normalization}"')
+            return
+        if percentile is not None:
+            self._percentile = min(max(percentile, 0.0), 50.0)
+        elif normalization == self._normalization:
+            return
+        self._normalization = normalization
+        self.normalizationChanged.emit(normalization)
+        if self.columnCount() > 0:
+            self._normalizeData()
+
+    normalization: Property = Property(
+        str, fget=getNormalization, fset=setNormalization, notify=normalizationChanged
+    )
+    """The normalization of the data."""
+
+    def getScaling(self) -> str:
+        """
+        Return the scaling of the data.
+
+        Returns
+        -------
+        str
+            The scaling of the data.
+        """
+        return self._scaling
+
+    @Slot(str)
+    def setScaling(self, scaling: str) -> None:
+        """
+        Set the scaling of the data for mapping to the colormap.
+
+        Statistics of columns and rows are cached, so that switching the scaling only
+        re-maps the colors without rescanning the data. With robust normalization,
+        the percentiles of rows and of the whole table are computed on first use.
+
+        Parameters
+        ----------
+        scaling : str
+            One of the following:
+
+            - ``'column'``: each column is scaled to its own range.
+            - ``'row'``: each row is scaled to its own range, e.g., for heatmaps of
+              metrics across channels.
+            - ``'global'``: all values are scaled to the range of the whole table.
+            - ``'fixed'``: all values are scaled to a fixed range, see
+              :meth:`setFixedRange`.
+
+            Boolean columns are always mapped to the ends of the colormap and are
+            excluded from the statistics of rows and of the whole table.
+        """
+        if scaling not in _scalings:
+            log.warning(f'No such scaling: "{scaling}"')
+            return
+        if scaling == self._scaling:
+            return
+        self._scaling = scaling
+        self.scalingChanged.emit(scaling)
+        self._rescale()
+
+    scaling = Property(str, fget=getScaling, fset=setScaling, notify=scalingChanged)  # type: Property
+    """The scaling of the data."""
+
+    def getFixedRange(self) -> tuple[float, float]:
+        """
+        Return the range for fixed scaling.
+
+        Returns
+        -------
+        tuple of float
+            The lower and upper bound, in units of the data.
+        """
+        return self._fixedRange
+
+    def setFixedRange(self, lower: float, upper: float) -> None:
+        """
+        Set the range for fixed scaling.
+
+        Values outside the range are clipped. The range only takes effect if the
+        scaling is ``'fixed'``, see :meth:`setScaling`.
+
+        Parameters
+        ----------
+        lower : float
+            The value mapped to the lower end of the colormap. Must be positive for
+            logarithmic normalization.
+        upper : float
+            The value mapped to the upper end of the colormap.
+        """
+        if not lower < upper:
+            log.warning(f'Invalid range: {lower} - {upper}')
+            return
+        self._fixedRange = (float(lower), float(upper))
+        if self._scaling == 'fixed':
+            self._rescale()
+
+    def getStatistics(self, scaling: str | None = None) -> DataFrame:
+        """
+        Return the bounds for mapping values to the colormap, e.g., for legends.
+
+        Parameters
+        ----------
+        scaling : str, optional
+            The scaling for which to return the bounds, see :meth:`setScaling`.
+            Default: the current scaling.
+
+        Returns
+        -------
+        DataFrame
+            The lower and upper bounds, in units of the data, indexed by column labels,
+            row labels, or a single label ``'global'`` or ``'fixed'``. Empty while
+            colors are being computed.
+
+        Raises
+        ------
+        ValueError
+            If the scaling is invalid.
+        """
+        scaling = self._scaling if scaling is None else scaling
+        if scaling not in _scalings:
+            raise ValueError(f'No such scaling: "{scaling}"')
+        if self._colorsPending:
+            return DataFrame(columns=['lower', 'upper'], dtype=float)
+        lower, upper = self._scalingBounds(scaling)
+        if self._normalization == 'log':
+            lower, upper = 10**lower, 10**upper
+        if scaling == 'column':
+            lower = np.where(self._normIsBool, 0.0, lower)
+            upper = np.where(self._normIsBool, 1.0, upper)
+            index = self._columnIndex
+        elif scaling == 'row':
+            index = self._index
+        else:
+            lower, upper = np.atleast_1d(lower), np.atleast_1d(upper)
+            index = pd.Index([scaling])
+        return DataFrame({'lower': lower, 'upper': upper}, index=index)
+
+    statistics = Property(object, fget=getStatistics, notify=statisticsChanged)  # type: Property
+    """The bounds for mapping values to the colormap, see :meth:`getStatistics`."""
+
+    def getColorIndices(
+        self, start: int = 0, stop: int | None = None
+    ) -> npt.NDArray[np.uint8] | None:
+        """
+        Return the palette indices of the cells in a range of rows.
+
+        Together with :meth:`getPalette`, this provides the colors of many cells at
+        once, e.g., for rendering overviews of the table.
+
+        Parameters
+        ----------
+        start : int, optional
+            The first row. Default: 0.
+        stop : int, optional
+            The row after the last row. Default: the number of rows.
+
+        Returns
+        -------
+        np.ndarray or None
+            A read-only array of shape (rows, columns), in the order of the model's
+            rows. None while colors are being computed.
+        """
+        if self._colorsPending:
+            return None
+        rows = slice(start, stop)
+        if self._rows is None:
+            colorIndex = self._colorIndex[rows]
+        else:
+            positions = self._rows[rows]
+            colorIndex = np.empty(
+                (len(positions), self._colorIndex.shape[1]), dtype=np.uint8, order='F'
+            )
+            for column, values in enumerate(self._colorIndex.T):
+                colorIndex[:, column] = values[positions]  # faster than 2-D indexing
+        colorIndex.flags.writeable = False
+        return colorIndex
+
+    def getPalette(self, foreground: bool = False) -> npt.NDArray[np.uint32]:
+        """
+        Return the colors of the palette as packed 32-bit ARGB values.
+
+        Parameters
+        ----------
+        foreground : bool, optional
+            Whether to return the foreground (text) colors instead of the background
+            colors. Default: False.
+
+        Returns
+        -------
+        np.ndarray
+            The colors indexed by :meth:`getColorIndices`. The last entry is the color
+            of missing values.
+        """
+        palette = (self._foregroundPalette if foreground else self._palette).view()
+        palette.flags.writeable = False
+        return palette
+
+    def _scalingBounds(self, scaling: str) -> _Bounds:
+        """
+        Return the bounds for a scaling, in units of the normalization.
+
+        Statistics that have not been cached yet are computed from the normalized
+        values.
+
+        Parameters
+        ----------
+        scaling : str
+            The scaling, see :meth:`setScaling`.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            The lower and upper bounds: one per column or row, or a single one.
+        """
+        if scaling == 'fixed':
+            return _fixedBounds(self._fixedRange, self._normalization)
+        if scaling not in self._statistics:
+            self._statistics[scaling] = _valueStatistics(
+                self._normValues,
+                self._normIsBool,
+                scaling,
+                self._normalization,
+                self._percentile,
+                self._statistics['column'],
+            )
+        return self._statistics[scaling]
+
+    def _rescale(self) -> None:
+        """Re-map the normalized values to the colormap after a change of scaling."""
+        if self._colorsPending or len(self._normDtypes) == 0:
+            return
+        self._defineColors()
+        self.statisticsChanged.emit()
+
+    def _normalizeData(self) -> None:
+        """
+        Normalize the Data for mapping to a colormap.
+
+        In asynchronous mode, the normalization is computed by a :class:`Worker` on
+        the global :class:`~PyQt5.QtCore.QThreadPool`. Cells are left uncolored until
+        the result is swapped in and `colorsReady` is emitted. Computations that are
+        superseded by newer data are abandoned.
+        """
+        self._normGeneration += 1
+        inputs = [self._normalizationInput(c) for c in range(len(self._columns))]
+        if not self._asynchronous:
+            self._setNormalization(self._normalize(inputs, self._normGeneration))
+            return
+        self._colorsPending = True
+        self._discardPrefetch()
+        worker = Worker(self._normalize, inputs, self._normGeneration)
+        worker.signals.result.connect(self._setNormalization)
+        QThreadPool.globalInstance().start(worker)
+
+    def _normalizationInput(
+        self, column: int, start: int = 0
+    ) -> np.ndarray | pd.Series:
+        """
+        Return the values of a column to be normalized.
+
+        Parameters
+        ----------
+        column : int
+            The column index.
+        start : int, optional
+            The position in the column array of the first value. Default: 0.
+
+        Returns
+        -------
+        np.ndarray or pd.Series
+            The column array for boolean and numeric columns, a Series otherwise.
+        """
+        values = self._columns[column][start:]
+        if values.dtype.kind in 'biuf':
+            return values
+        return pd.Series(_arrayToColumn(values, self._dtypes[column]), copy=False)
+
+    def _normalize(
+        self, inputs: list[np.ndarray | pd.Series], generation: int
+    ) -> _Normalization | None:
+        """
+        Normalize columns, compute their statistics and map them to palette indices.
+
+        This method does not modify the model and may be called from a worker thread.
+        See :meth:`_normalizeInputs`. The statistics of columns are always computed.
+        Those of rows and of the whole table are computed as well, unless they require
+        percentiles that are not needed for the current scaling.
+
+        Parameters
+        ----------
+        inputs : list of np.ndarray or pd.Series
+            The columns to be normalized, see :meth:`_normalizationInput`.
+        generation : int
+            The generation of the normalization. The computation is abandoned as soon
+            as a newer normalization has been requested.
+
+        Returns
+        -------
+        tuple or None
+            The generation, the normalized values, the mask of boolean columns, the
+            statistics, the scaling and fixed range used for mapping, and the palette
+            indices. None if the computation was abandoned.
+        """
+        scaling, fixedRange = self._scaling, self._fixedRange
+        normalization, percentile = self._normalization, self._percentile
+        result = self._normalizeInputs(inputs, generation)
+        if result is None:
+            return None
+        values, isBool = result
+        statistics = {
+            'column': _valueStatistics(
+                values, isBool, 'column', normalization, percentile
+            )
+        }
+        for key in ('row', 'global'):
+            if normalization != 'robust' or key == scaling:
+                statistics[key] = _valueStatistics(
+                    values, isBool, key, normalization, percentile, statistics['column']
+                )
+        if scaling == 'fixed':
+            bounds = _fixedBounds(fixedRange, normalization)
+        else:
+            bounds = statistics[scaling]
+        colorIndex = self._mapValues(
+            values, *_regionBounds(scaling, bounds, slice(None), slice(None)), isBool
+        )
+        return generation, values, isBool, statistics, (scaling, fixedRange), colorIndex
+
+    def _normalizeInputs(
+        self, inputs: list[np.ndarray | pd.Series], generation: int | None = None
+    ) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.bool_]] | None:
+        """
+        Convert columns into normalized values for mapping to a colormap.
+
+        The columns are converted into a single two-dimensional float32 array in
+        column-major order, which is transformed in place by :func:`_normalizeArray`.
+        Boolean columns are mapped to 0 and 1, regardless of the normalization.
+        Non-numeric values are coerced to numeric values or treated as missing values.
+
+        Parameters
+        ----------
+        inputs : list of np.ndarray or pd.Series
+            The columns to be normalized, see :meth:`_normalizationInput`.
+        generation : int, optional
+            The generation of the normalization. If given, the computation is abandoned
+            as soon as a newer normalization has been requested.
+
+        Returns
+        -------
+        tuple or None
+            The normalized values as well as a mask of boolean columns. None if the
+            computation was abandoned.
+        """
+        nRows = len(inputs[0]) if len(inputs) > 0 else len(self._index)
+        data = np.empty((nRows, len(inputs)), dtype=np.float32, order='F')
+        isBool = np.zeros(len(inputs), dtype=bool)
+        for column, values in enumerate(inputs):
+            if generation is not None and generation != self._normGeneration:
+                return None
+            if values.dtype.kind in 'biuf':
+                data[:, column] = values
+                isBool[column] = values.dtype.kind == 'b'
+            else:
+                data[:, column] = pd.to_numeric(
+                    pd.Series(values, copy=False), errors='coerce'
+                ).to_numpy(dtype=np.float32, na_value=np.nan)
+        if not isBool.any():
+            _normalizeArray(data, self._normalization)
+        elif not isBool.all():
+            numeric = np.asfortranarray(data[:, ~isBool])
+            data[:, ~isBool] = _normalizeArray(numeric, self._normalization)
+        return data, isBool
+
+    def _setNormalization(self, result: _Normalization | None) -> None:
+        """
+        Swap in the result of a normalization.
+
+        Results of superseded normalizations are discarded. Colors are re-mapped if
+        the scaling has been changed while the normalization was computed.
+
+        Parameters
+        ----------
+        result : tuple or None
+            The result of :meth:`_normalize`.
+        """
+        if result is None or result[0] != self._normGeneration:
+            return
+        _, self._normValues, self._normIsBool, self._statistics, scaling, colorIndex = (
+            result
+        )
+        self._normDtypes = [values.dtype for values in self._columns]
+        self._colorsPending = False
+        current = scaling == (self._scaling, self._fixedRange)
+        self._defineColors(colorIndex if current else None)
+        self.colorsReady.emit()
+        self.statisticsChanged.emit()
+
+    def _normalizeColumn(self, column: int) -> None:
+        """
+        Normalize a single column and update its statistics.
+
+        Parameters
+        ----------
+        column : int
+            The column index.
+        """
+        self._normDtypes[column] = self._columns[column].dtype
+        result = self._normalizeInputs([self._normalizationInput(column)])
+        assert result is not None
+        values, isBool = result
+        lower, upper = _valueStatistics(
+            values, isBool, 'column', self._normalization, self._percentile
+        )
+        self._normValues[:, column] = values[:, 0]
+        self._normIsBool[column] = isBool[0]
+        self._statistics['column'][0][column] = lower[0]
+        self._statistics['column'][1][column] = upper[0]
+
+    def _insert(
+        self,
+        row: int,
+        newColumns: list[np.ndarray],
+        newDtypes: list[Any],
+        newIndex: pd.Index | None,
+        newMask: np.ndarray | None = None,
+    ) -> None:
+        """
+        Insert column arrays into the model's column arrays and normalize them.
+
+        Rows appended to the column arrays are normalized and colored without
+        rescanning the existing rows, see :meth:`_normalizeAppendedRows`. Otherwise,
+        all data is normalized again.
+
+        Parameters
+        ----------
+        row : int
+            The row before which the new rows are inserted.
+        newColumns : list of np.ndarray
+            One array per column, holding the values of the new rows.
+        newDtypes : list
+            The pandas dtypes of the new columns.
+        newIndex : pd.Index, optional
+            The labels of the new rows. If None, missing labels are used.
+        newMask : np.ndarray, optional
+            Whether the new rows pass the model's filter. If None, all new rows are
+            presented.
+        """
+        size = len(self._index)
+        append = self._rows is not None or row == size
+        super()._insert(row, newColumns, newDtypes, newIndex, newMask)
+        if (
+            append
+            and not self._colorsPending
+            and len(self._normDtypes) == len(self._columns) > 0
+            and len(self._normValues) == size
+            and not (self._asynchronous and self._normalization == 'robust')
+            and self._normalizeAppendedRows(size)
+        ):
+            return
+        self._normalizeData()
+
+    def _normalizeAppendedRows(self, start: int) -> bool:
+        """
+        Normalize and color rows appended to the column arrays.
+
+        The normalized values, palette indices and row statistics of the new rows are
+        written to the spare capacity of buffers, as for the column arrays. Existing cells are only
+        recolored if the new rows widen the bounds of the current scaling. Column
+        statistics of robust normalization are recomputed, as percentiles cannot be
+        updated incrementally.
+
+        Parameters
+        ----------
+        start : int
+            The position of the first new row in the column arrays.
+
+        Returns
+        -------
+        bool
+            True if the rows were normalized, False if all data needs to be normalized
+            again, e.g., because the dtype of a column has changed.
+        """
+        if any(
+            values.dtype != dtype
+            for values, dtype in zip(self._columns, self._normDtypes, strict=True)
+        ):
+            return False
+        inputs = [self._normalizationInput(c, start) for c in range(len(self._columns))]
+        result = self._normalizeInputs(inputs)
+        assert result is not None
+        values, isBool = result
+        if not np.array_equal(isBool, self._normIsBool):
+            return False
+        self._normValues, self._normBuffer = _appendToBuffer(
+            self._normValues, self._normBuffer, values
+        )
+        normalization, percentile = self._normalization, self._percentile
+
+        lower, upper = self._statistics['column']
+        if normalization == 'robust':
+            newLower, newUpper = _valueStatistics(
+                self._normValues, isBool, 'column', normalization, percentile
+            )
+        else:
+            newLower, newUpper = _valueStatistics(
+                values, isBool, 'column', normalization, percentile
+            )
+            newLower, newUpper = np.fmin(lower, newLower), np.fmax(upper, newUpper)
+        with np.errstate(invalid='ignore'):
+            unchanged = np.isclose(
+                newLower, lower, rtol=0, atol=0, equal_nan=True
+            ) & np.isclose(newUpper, upper, rtol=0, atol=0, equal_nan=True)
+        changedColumns = np.flatnonzero(~unchanged)
+        self._statistics['column'] = newLower, newUpper
+        changed = {'column': changedColumns.size > 0, 'fixed': False}
+        if 'row' in self._statistics:
+            rowLower, rowUpper = self._statistics['row']
+            lower, upper = _valueStatistics(
+                values, isBool, 'row', normalization, percentile
+            )
+            lowerBuffer, upperBuffer = self._rowBuffers
+            rowLower, lowerBuffer = _appendToBuffer(rowLower, lowerBuffer, lower)
+            rowUpper, upperBuffer = _appendToBuffer(rowUpper, upperBuffer, upper)
+            self._statistics['row'] = rowLower, rowUpper
+            self._rowBuffers = lowerBuffer, upperBuffer
+            changed['row'] = True  # the new rows have statistics of their own
+        if 'global' in self._statistics:
+            lower, upper = self._statistics.pop('global')
+            changed['global'] = False
+            if normalization != 'robust' or self._scaling == 'global':
+                bounds = self._scalingBounds('global')
+                changed['global'] = lower != bounds[0] or upper != bounds[1]
+
+        newRows = slice(start, len(self._normValues))
+        if self._scaling == 'global' and changed.get('global', True):
+            self._defineColors()
+        else:
+            self._colorIndex, self._colorBuffer = _appendToBuffer(
+                self._colorIndex,
+                self._colorBuffer,
+                self._regionColors(newRows, slice(None)),
+            )
+            self._discardPrefetch()
+            if self._scaling == 'column' and changed['column']:
+                for column in changedColumns.tolist():
+                    self._defineRegionColors(slice(None), slice(column, column + 1))
+                self._notifyColorsChanged()
+        if changed.get(self._scaling, True):
+            self.statisticsChanged.emit()
+        return True
+
+    def _normalizeCells(self, rows: np.ndarray, column: int) -> bool:
+        """
+        Normalize modified cells of a column without rescanning the column.
+
+        This is only possible if the column's dtype is unchanged and the statistics
+        of the column are not affected by the modification: the new values must lie
+        within the column's range, and the old values must not have defined the range.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The positions of the modified cells in the column arrays.
+        column : int
+            The column index.
+
+        Returns
+        -------
+        bool
+            True if the cells were normalized, False if the whole column needs to be
+            normalized.
+        """
+        values = self._columns[column][rows]
+        if values.dtype != self._normDtypes[column] or values.dtype.kind not in 'biuf':
+            return False
+        data = values.astype(np.float32)
+        if values.dtype.kind == 'b':
+            self._normValues[rows, column] = data
+            return True
+        _normalizeArray(data, self._normalization)
+        old = self._normValues[rows, column]
+        self._normValues[rows, column] = data
+        lower = self._statistics['column'][0][column]
+        upper = self._statistics['column'][1][column]
+        if self._normalization == 'robust' or not lower < upper:
+            return False  # percentiles cannot be updated incrementally
+        with np.errstate(invalid='ignore'):
+            return bool(
+                np.all(np.isnan(data) | ((data >= lower) & (data <= upper)))
+                and np.all(np.isnan(old) | ((old > lower) & (old < upper)))
+            )
+
+    def _onDataChanged(
+        self,
+        topLeft: QModelIndex,
+        bottomRight: QModelIndex,
+        roles: list[int] | None = None,
+    ) -> None:
+        """
+        Update normalized values, statistics and colors for modified cells.
+
+        Only the modified cells are recolored if the bounds of the current scaling are
+        unaffected. Otherwise, the columns or rows with modified bounds, or all cells
+        for global scaling, are recolored as well.
+
+        Parameters
+        ----------
+        topLeft : QModelIndex
+            The top-left index of the modified range.
+        bottomRight : QModelIndex
+            The bottom-right index of the modified range.
+        roles : list of int, optional
+            The modified roles. Changes that do not include EditRole are ignored, e.g.,
+            display texts changed by :meth:`setColumnFormatter`.
+        """
+        if roles and Qt.ItemDataRole.EditRole not in roles:
+            return
+        if self._colorsPending:
+            self._normalizeData()
+            return
+        rows = np.arange(topLeft.row(), bottomRight.row() + 1)
+        if self._rows is not None:
+            rows = self._rows[rows]
+        columns = slice(topLeft.column(), bottomRight.column() + 1)
+        isBool = self._normIsBool.copy()
+        lower, upper = (bounds[columns].copy() for bounds in self._statistics['column'])
+        for column in range(columns.start, columns.stop):
+            if not self._normalizeCells(rows, column):
+                self._normalizeColumn(column)
+        if not np.array_equal(isBool, self._normIsBool):
+            self._normalizeData()  # boolean columns are excluded from statistics
+            return
+        columnLower, columnUpper = self._statistics['column']
+        changedColumns = np.flatnonzero(
+            (columnLower[columns] != lower) | (columnUpper[columns] != upper)
+        )
+        changed = {'column': changedColumns.size > 0, 'fixed': False}
+        if 'row' in self._statistics:
+            rowLower, rowUpper = self._statistics['row']
+            lower, upper = _valueStatistics(
+                self._normValues[rows],
+                isBool,
+                'row',
+                self._normalization,
+                self._percentile,
+            )
+            changedRows = rows[(rowLower[rows] != lower) | (rowUpper[rows] != upper)]
+            rowLower[rows], rowUpper[rows] = lower, upper
+            changed['row'] = changedRows.size > 0
+        if 'global' in self._statistics:
+            lower, upper = self._statistics.pop('global')
+            changed['global'] = False
+            if self._normalization != 'robust' or self._scaling == 'global':
+                bounds = self._scalingBounds('global')
+                changed['global'] = lower != bounds[0] or upper != bounds[1]
+        if self._scaling == 'global' and changed['global']:
+            self._defineColors()
+        else:
+            self._defineRegionColors(rows, columns)
+            if self._scaling == 'column':
+                for column in (changedColumns + columns.start).tolist():
+                    self._defineRegionColors(slice(None), slice(column, column + 1))
+                    self.dataChanged.emit(
+                        self.index(0, column),
+                        self.index(self.rowCount() - 1, column),
+                        [
+                            Qt.ItemDataRole.BackgroundRole,
+                            Qt.ItemDataRole.ForegroundRole,
+                        ],
+                    )
+            elif self._scaling == 'row' and changed['row']:
+                self._defineRegionColors(changedRows, slice(None))
+                self._notifyColorsChanged()
+        if changed.get(self._scaling, True):
+            self.statisticsChanged.emit()
+
+    def _defineColors(self, colorIndex: npt.NDArray[np.uint8] | None = None) -> None:
+        """
+        Define the colors of the table's cells according to the table's data.
+
+        Each cell is assigned an index into the palette of background and foreground
+        colors, see :meth:`_definePalette`. Attached views are notified through
+        :meth:`_notifyColorsChanged`.
+
+        Parameters
+        ----------
+        colorIndex : np.ndarray, optional
+            Precomputed palette indices. Computed from the normalized values and the
+            current scaling if omitted.
+        """
+        self._colorIndex = (
+            self._regionColors(slice(None), slice(None))
+            if colorIndex is None
+            else colorIndex
+        )
+        self._discardPrefetch()
+        self._notifyColorsChanged()
+
+    def _defineRegionColors(self, rows: np.ndarray | slice, columns: slice) -> None:
+        """
+        Define the colors for a region of cells.
+
+        Parameters
+        ----------
+        rows : np.ndarray or slice
+            The positions of the cells in the column arrays.
+        columns : slice
+            The column indices.
+        """
+        self._colorIndex[rows, columns] = self._regionColors(rows, columns)
+        self._discardPrefetch()
+
+    def _regionColors(
+        self, rows: np.ndarray | slice, columns: slice
+    ) -> npt.NDArray[np.uint8]:
+        """
+        Map the normalized values of a region of cells to palette indices.
+
+        Parameters
+        ----------
+        rows : np.ndarray or slice
+            The positions of the cells in the column arrays.
+        columns : slice
+            The column indices.
+
+        Returns
+        -------
+        np.ndarray
+            The palette indices of the region.
+        """
+        bounds = self._scalingBounds(self._scaling)
+        return self._mapValues(
+            self._normValues[rows, columns],
+            *_regionBounds(self._scaling, bounds, rows, columns),
+            self._normIsBool[columns],
+        )
+
+    def _mapValues(
+        self,
+        values: npt.NDArray[np.float32],
+        lower: np.ndarray | float,
+        upper: np.ndarray | float,
+        isBool: npt.NDArray[np.bool_] | None = None,
+    ) -> npt.NDArray[np.uint8]:
+        """
+        Map normalized values to indices into the palette.
+
+        Values are scaled linearly to the range between the lower and upper bounds.
+        Values outside the bounds are clipped, values of boolean columns are mapped
+        without scaling.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The normalized values, two-dimensional.
+        lower : np.ndarray or float
+            The lower bounds, broadcastable to the shape of `values`.
+        upper : np.ndarray or float
+            The upper bounds, broadcastable to the shape of `values`.
+        isBool : np.ndarray, optional
+            The mask of boolean columns.
+
+        Returns
+        -------
+        np.ndarray
+            The palette indices. Missing values are mapped to the last entry.
+        """
+        lower = np.asarray(lower, dtype=np.float32)
+        span = np.asarray(upper, dtype=np.float32) - lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # single unique values are mapped to 0
+            scale = np.where(span == 0, 0, (self._nColors - 1) / span)
+            index = values - lower
+            index *= scale.astype(np.float32)
+        np.clip(index, 0, self._nColors - 1, out=index)
+        if isBool is not None and isBool.any():
+            index[:, isBool] = values[:, isBool] * (self._nColors - 1)
+        np.rint(index, out=index)
+        index[np.isnan(index)] = self._nColors
+        return index.astype(np.uint8)
+
+    def _definePalette(self) -> None:
+        """
+        Define the palette of background and foreground colors.
+
+        The background colors are sampled from the colormap, with white for missing
+        values, and stored as packed 32-bit ARGB values. The foreground colors are
+        black or white, depending on the inverse of the background's approximated
+        luminosity and the alpha value.
+
+        Attached views are notified through :meth:`_notifyColorsChanged`.
+        """
+        background = np.full((self._nColors + 1, 3), 255, dtype=np.uint32)
+        background[:-1] = _getColormapTable(self._cmapName, self._nColors)
+        self._palette = (
+            np.uint32(self._alpha) << 24
+            | background[:, 0] << 16
+            | background[:, 1] << 8
+            | background[:, 2]
+        ).astype(np.uint32)
+        foreground = 255 - (background * np.array([0.21, 0.72, 0.07])).sum(
+            axis=1
+        ).astype(int)
+        self._backgroundColors = [
+            QColor.fromRgba(argb) for argb in self._palette.tolist()
+        ]
+        self._foregroundPalette = np.where(
+            foreground * self._alpha < 32512,
+            QColor('black').rgba(),
+            QColor('white').rgba(),
+        ).astype(np.uint32)
+        black, white = QColor('black'), QColor('white')
+        self._foregroundColors = [
+            black if lum * self._alpha < 32512 else white for lum in foreground.tolist()
+        ]
+        self._discardPrefetch()
+        self._notifyColorsChanged()
+
+    def _notifyColorsChanged(self) -> None:
+        """
+        Notify attached views that the colors of all cells have changed.
+
+        Instead of `layoutChanged`, a `dataChanged` signal limited to the background
+        and foreground roles is emitted, so views only repaint their visible cells.
+        Notifications are coalesced: rapid successive changes, such as those caused by
+        moving a slider, result in at most one signal per interval of the timer.
+        """
+        if not self._colorsTimer.isActive():
+            self._colorsTimer.start()
+
+    def _prefetchData(self, rows: np.ndarray) -> dict[int, list[list[Any]]]:
+        """
+        Compute the data of all roles for a block of rows.
+
+        In addition to the roles of :class:`DataFrameTableModel`, the background and
+        foreground colors are prefetched, unless they are still being computed.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            The positions of the rows in the column arrays.
+
+        Returns
+        -------
+        dict
+            Per role, one list of values per column.
+        """
+        data = super()._prefetchData(rows)
+        if not self._colorsPending:
+            colorIndex = self._colorIndex[rows].T.tolist()
+            background, foreground = self._backgroundColors, self._foregroundColors
+            data[Qt.ItemDataRole.BackgroundRole] = [
+                [background[i] for i in column] for column in colorIndex
+            ]
+            data[Qt.ItemDataRole.ForegroundRole] = [
+                [foreground[i] for i in column] for column in colorIndex
+            ]
+        return data
+
+    def _emitColorsChanged(self) -> None:
+        """Emit `dataChanged` for the background and foreground roles of all cells."""
+        if self.rowCount() > 0 and self.columnCount() > 0:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole],
+            )
+
+    def _cellData(self, row: int, column: int, role: int) -> Any | None:
+        """
+        Get the data of a cell for the specified role.
+
+        In addition to the roles of :class:`DataFrameTableModel`, the background and
+        foreground colors are provided.
+
+        Parameters
+        ----------
+        row : int
+            The position of the cell in the column arrays.
+        column : int
+            The column of the cell.
+        role : int
+            The role of the data.
+
+        Returns
+        -------
+        Any or None
+            The data of the cell.
+        """
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if self._colorsPending:
+                return None
+            return self._backgroundColors[self._colorIndex[row, column]]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if self._colorsPending:
+                return None
+            return self._foregroundColors[self._colorIndex[row, column]]
+        return super()._cellData(row, column, role)
+
+
+def _normalizeArray(
+    data: npt.NDArray[np.float32], normalization: str = 'linear'
+) -> npt.NDArray[np.float32]:
+    """
+    Convert values into units of a normalization, in place.
+
+    Infinite values, and non-positive values for logarithmic normalization, are
+    replaced by NaN and thus treated as missing values.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The values to be normalized.
+    normalization : str, optional
+        ``'linear'``, ``'log'`` or ``'robust'``, see
+        :meth:`ColoredDataFrameTableModel.setNormalization`. Default: 'linear'.
+
+    Returns
+    -------
+    np.ndarray
+        The normalized values, i.e., `data`.
+    """
+    if normalization == 'log':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.log10(data, out=data)
+    data[np.isinf(data)] = np.nan
+    return data
+
+
+def _arrayBounds(
+    data: npt.NDArray[np.float32],
+    normalization: str = 'linear',
+    percentile: float = 1.0,
+    axis: int | None = 0,
+) -> _Bounds:
+    """
+    Return the lower and upper bounds of normalized values along an axis.
+
+    The bounds are the minima and maxima, or percentiles for robust normalization.
+    Missing values are ignored. Bounds of empty or all-missing slices are infinite, or
+    NaN for robust normalization.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The normalized values, two-dimensional. Reductions along axis 0 are fastest
+        for arrays in column-major (Fortran) order.
+    normalization : str, optional
+        ``'linear'``, ``'log'`` or ``'robust'``. Default: 'linear'.
+    percentile : float, optional
+        The lower percentile for robust normalization. Default: 1.0.
+    axis : int or None, optional
+        The axis along which to reduce, or None for the whole array. Default: 0.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The lower and upper bounds, as float64.
+    """
+    percentiles = [percentile, 100 - percentile]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN slices
+        if normalization != 'robust' or data.size == 0:
+            lower = np.nanmin(data, axis=axis, initial=np.inf)
+            upper = np.nanmax(data, axis=axis, initial=-np.inf)
+        elif axis == 1:
+            # np.nanpercentile() loops over the rows in Python
+            ordered = np.sort(data, axis=1)  # missing values are sorted last
+            count = data.shape[1] - np.isnan(data).sum(axis=1)
+            lower, upper = (
+                _sortedPercentile(ordered, count, value) for value in percentiles
+            )
+        else:
+            lower, upper = np.nanpercentile(data, percentiles, axis=axis)
+    return np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64)
+
+
+def _sortedPercentile(
+    ordered: npt.NDArray[np.float32], count: np.ndarray, percentile: float
+) -> npt.NDArray[np.float64]:
+    """
+    Return a percentile of each row of a sorted array, with linear interpolation.
+
+    Parameters
+    ----------
+    ordered : np.ndarray
+        The rows, sorted in ascending order with missing values last.
+    count : np.ndarray
+        The number of non-missing values per row.
+    percentile : float
+        The percentile.
+
+    Returns
+    -------
+    np.ndarray
+        The percentile of each row, NaN for rows without values.
+    """
+    position = np.maximum(count - 1, 0) * (percentile / 100)
+    below = np.floor(position).astype(np.intp)[:, None]
+    above = np.ceil(position).astype(np.intp)[:, None]
+    lower = np.take_along_axis(ordered, below, axis=1)[:, 0].astype(np.float64)
+    upper = np.take_along_axis(ordered, above, axis=1)[:, 0].astype(np.float64)
+    result = lower + (upper - lower) * (position - below[:, 0])
+    result[count == 0] = np.nan
+    return result
+
+
+def _valueStatistics(
+    values: npt.NDArray[np.float32],
+    isBool: npt.NDArray[np.bool_],
+    scaling: str,
+    normalization: str = 'linear',
+    percentile: float = 1.0,
+    columnBounds: _Bounds | None = None,
+) -> _Bounds:
+    """
+    Return the bounds of normalized values for a scaling.
+
+    Boolean columns have the bounds 0 and 1 and are excluded from the bounds of rows
+    and of the whole table.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The normalized values, with one column per column of the table.
+    isBool : np.ndarray
+        The mask of boolean columns.
+    scaling : str
+        ``'column'``, ``'row'`` or ``'global'``, see
+        :meth:`ColoredDataFrameTableModel.setScaling`.
+    normalization : str, optional
+        ``'linear'``, ``'log'`` or ``'robust'``. Default: 'linear'.
+    percentile : float, optional
+        The lower percentile for robust normalization. Default: 1.0.
+    columnBounds : tuple of np.ndarray, optional
+        The bounds of the columns. If given, global minima and maxima are derived from
+        them instead of rescanning the values.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The lower and upper bounds: one per column or row, or a single one.
+    """
+    numeric = ~isBool
+    if scaling == 'column':
+        lower, upper = np.zeros(len(isBool)), np.ones(len(isBool))
+        if numeric.any():
+            data = values if numeric.all() else np.asfortranarray(values[:, numeric])
+            lower[numeric], upper[numeric] = _arrayBounds(
+                data, normalization, percentile
+            )
+        return lower, upper
+    if scaling == 'global' and normalization != 'robust' and columnBounds is not None:
+        return (
+            np.asarray(np.min(columnBounds[0][numeric], initial=np.inf)),
+            np.asarray(np.max(columnBounds[1][numeric], initial=-np.inf)),
+        )
+    data = values if numeric.all() else values[:, numeric]
+    axis = 1 if scaling == 'row' else None
+    return _arrayBounds(data, normalization, percentile, axis)
+
+
+def _fixedBounds(fixedRange: tuple[float, float], normalization: str) -> _Bounds:
+    """
+    Return the bounds for fixed scaling in units of a normalization.
+
+    Parameters
+    ----------
+    fixedRange : tuple of float
+        The lower and upper bound, in units of the data.
+    normalization : str
+        ``'linear'``, ``'log'`` or ``'robust'``.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The lower and upper bound.
+    """
+    lower, upper = _normalizeArray(np.array(fixedRange), normalization)
+    return np.asarray(lower), np.asarray(upper)
+
+
+def _regionBounds(
+    scaling: str, bounds: _Bounds, rows: np.ndarray | slice, columns: slice
+) -> _Bounds:
+    """
+    Select the bounds for a region of cells.
+
+    Parameters
+    ----------
+    scaling : str
+        The scaling, see :meth:`ColoredDataFrameTableModel.setScaling`.
+    bounds : tuple of np.ndarray
+        The lower and upper bounds of the scaling.
+    rows : np.ndarray or slice
+        The positions of the cells in the column arrays.
+    columns : slice
+        The column indices.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        The lower and upper bounds, broadcastable to the shape of the region.
+    """
+    lower, upper = bounds
+    if scaling == 'column':
+        return lower[columns], upper[columns]
+    if scaling == 'row':
+        return lower[rows, None], upper[rows, None]
+    return lower, upper
+
+
+class ChunkProvider(ABC):
+    """
+    Abstract provider of row blocks for a :class:`ChunkedDataFrameTableModel`.
+
+    Subclasses provide random access to the rows of a table that is not held in
+    memory, such as a file on disk.
+    """
+
+    @abstractmethod
+    def columns(self) -> list[str]:
+        """
+        Return the names of the table's columns.
+
+        Returns
+        -------
+        list of str
+            The names of the columns.
+        """
+
+    def rowCount(self) -> int | None:
+        """
+        Return the total number of rows, if it can be determined cheaply.
+
+        Returns
+        -------
+        int or None
+            The number of rows, or None if unknown.
+        """
+        return None
+
+    @abstractmethod
+    def readRows(self, start: int, stop: int) -> DataFrame:
+        """
+        Read a range of rows.
 
-    def getColormap(self) -> str:
+        Parameters
+        ----------
+        start : int
+            The first row to read.
+        stop : int
+            The row after the last row to read.
+
+        Returns
+        -------
+        DataFrame
+            The rows. Fewer rows than requested are returned at the end of the table.
         """
-        Return the name of the current colormap.
+
+
+class _ArrowChunkProvider(ChunkProvider):
+    """Base class for providers reading pieces of Arrow data with known sizes."""
+
+    _columns: list[str]
+    _offsets: npt.NDArray[np.int64]
+
+    def _setPieceSizes(self, sizes: list[int]) -> None:
+        """
+        Set the number of rows of each piece of the file.
+
+        Parameters
+        ----------
+        sizes : list of int
+            The number of rows per piece, in the order of the pieces in the file.
+        """
+        self._offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+
+    @abstractmethod
+    def _readPieces(self, pieces: list[int]) -> Any:
+        """
+        Read and concatenate pieces of the file.
+
+        Parameters
+        ----------
+        pieces : list of int
+            The indices of consecutive pieces, such as row groups or record batches.
 
         Returns
         -------
-        str
-            The name of the current colormap
+        pyarrow.Table
+            The rows of the pieces, restricted to the table's columns.
         """
-        return self._cmap.name
 
-    @Slot(str)
-    def setColormap(self, name: str):
+    def columns(self) -> list[str]:
         """
-        Set the colormap.
+        Return the names of the table's columns.
+
+        Returns
+        -------
+        list of str
+            The names of the columns.
+        """
+        return self._columns
+
+    def rowCount(self) -> int:
+        """
+        Return the total number of rows, as stored in the file's metadata.
+
+        Returns
+        -------
+        int
+            The number of rows.
+        """
+        return int(self._offsets[-1])
+
+    def readRows(self, start: int, stop: int) -> DataFrame:
+        """
+        Read a range of rows, decoding only the pieces of the file that contain them.
 
         Parameters
         ----------
-        name : str
-            Name of the colormap to be used. Can be the name of a valid colormap from matplotlib or colorcet.
+        start : int
+            The first row to read.
+        stop : int
+            The row after the last row to read.
+
+        Returns
+        -------
+        DataFrame
+            The rows. Fewer rows than requested are returned at the end of the table.
         """
-        for source in [None, 'matplotlib', 'colorcet']:
-            if name in colormap.listMaps(source):
-                self._cmap = colormap.get(name, source)
-                self.colormapChanged.emit(name)
-                return
-        log.warning(f'No such colormap: "{name}"')
+        stop = min(stop, self.rowCount())
+        if start >= stop:
+            return DataFrame(columns=self._columns)
+        first = int(np.searchsorted(self._offsets, start, side='right')) - 1
+        last = int(np.searchsorted(self._offsets, stop, side='left'))
+        table = self._readPieces(list(range(first, last)))
+        table = table.slice(start - int(self._offsets[first]), stop - start)
+        return table.to_pandas(ignore_metadata=True)
 
-    colormap = Property(str, fget=getColormap, fset=setColormap, notify=colormapChanged)  # type: Property
-    """The name of the colormap."""
 
-    def getAlpha(self) -> int:
+class ParquetChunkProvider(_ArrowChunkProvider):
+    """
+    Provide rows of a Parquet file, decoding only the row groups that are requested.
+
+    Requires `pyarrow`.
+    """
+
+    def __init__(self, path: Path | str):
         """
-        Return the alpha value of the colormap.
+        Initialize the ParquetChunkProvider.
+
+        Parameters
+        ----------
+        path : Path or str
+            The path of the Parquet file.
+        """
+        import pyarrow.parquet as pq
+
+        self._file = pq.ParquetFile(path, memory_map=True)
+        metadata = self._file.metadata
+        pandasMetadata = self._file.schema_arrow.pandas_metadata or {}
+        indexColumns = [
+            c for c in pandasMetadata.get('index_columns', []) if isinstance(c, str)
+        ]
+        self._columns = [
+            c for c in self._file.schema_arrow.names if c not in indexColumns
+        ]
+        self._setPieceSizes(
+            [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        )
+
+    def _readPieces(self, pieces: list[int]) -> Any:
+        return self._file.read_row_groups(pieces, columns=self._columns)
+
+
+class FeatherChunkProvider(_ArrowChunkProvider):
+    """
+    Provide rows of a Feather (Arrow IPC) file, memory-mapping its record batches.
+
+    Requires `pyarrow`.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize the FeatherChunkProvider.
+
+        Parameters
+        ----------
+        path : Path or str
+            The path of the Feather file.
+        """
+        import pyarrow as pa
+
+        self._reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        self._columns = list(self._reader.schema.names)
+        self._setPieceSizes(
+            [
+                self._reader.get_batch(i).num_rows
+                for i in range(self._reader.num_record_batches)
+            ]
+        )
+
+    def _readPieces(self, pieces: list[int]) -> Any:
+        import pyarrow as pa
+
+        return pa.Table.from_batches(
+            [self._reader.get_batch(i) for i in pieces], schema=self._reader.schema
+        )
+
+
+class ChunkedDataFrameTableModel(QAbstractTableModel):
+    """
+    A read-only Qt TableModel for tables that do not fit into memory.
+
+    Rows are read from a :class:`ChunkProvider` in blocks of a fixed size when they are
+    first accessed. Decoded blocks are kept in a least-recently-used cache, so memory
+    usage is bounded by the block budget.
+
+    If the provider reports the total number of rows, the model exposes all rows at
+    once and views show correct scroll bars. Otherwise, rows are added block by block
+    through :meth:`canFetchMore` and :meth:`fetchMore`.
+    """
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        provider: ChunkProvider | None = None,
+        blockSize: int = 10_000,
+        maxBlocks: int = 16,
+    ):
+        """
+        Initialize the ChunkedDataFrameTableModel.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            The parent object.
+        provider : ChunkProvider, optional
+            The provider of the table's rows.
+        blockSize : int, optional
+            The number of rows per block. Default: 10,000.
+        maxBlocks : int, optional
+            The maximum number of decoded blocks held in memory. Default: 16.
+        """
+        super().__init__(parent)
+        self._blockSize = max(blockSize, 1)
+        self._maxBlocks = max(maxBlocks, 1)
+        self._blocks: OrderedDict[int, list[np.ndarray]] = OrderedDict()
+        self._provider: ChunkProvider | None = None
+        self._columnNames: list[str] = []
+        self._totalRows: int | None = 0
+        self._fetchedRows = 0
+        self._exhausted = True
+        if provider is not None:
+            self.setProvider(provider)
+
+    def getProvider(self) -> ChunkProvider | None:
+        """
+        Return the provider of the table's rows.
+
+        Returns
+        -------
+        ChunkProvider or None
+            The provider.
+        """
+        return self._provider
+
+    def setProvider(self, provider: ChunkProvider | None) -> None:
+        """
+        Set the provider of the table's rows.
+
+        Parameters
+        ----------
+        provider : ChunkProvider or None
+            The provider.
+        """
+        self.beginResetModel()
+        self._provider = provider
+        self._blocks.clear()
+        self._columnNames = [] if provider is None else list(provider.columns())
+        self._totalRows = 0 if provider is None else provider.rowCount()
+        self._fetchedRows = 0
+        self._exhausted = self._totalRows is not None
+        self.endResetModel()
+
+    def getMaxBlocks(self) -> int:
+        """
+        Return the maximum number of decoded blocks held in memory.
 
         Returns
         -------
         int
-            The alpha value of the colormap.
+            The maximum number of blocks.
         """
-        return self._alpha
+        return self._maxBlocks
 
-    @Slot(int)
-    def setAlpha(self, alpha: int = 255):
+    def setMaxBlocks(self, maxBlocks: int) -> None:
         """
-        Set the alpha value of the colormap.
+        Set the maximum number of decoded blocks held in memory.
 
         Parameters
         ----------
-        alpha : int
-            The alpha value of the colormap. Must be between 0 and 255.
+        maxBlocks : int
+            The maximum number of blocks. Must be at least 1.
         """
-        _, self._alpha, _ = sorted([0, alpha, 255])
-        self.alphaChanged.emit(self._alpha)
-        self.layoutChanged.emit()
+        self._maxBlocks = max(maxBlocks, 1)
+        while len(self._blocks) > self._maxBlocks:
+            self._blocks.popitem(last=False)
 
-    alpha = Property(int, fget=getAlpha, fset=setAlpha, notify=alphaChanged)  # type: Property
-    """The alpha value of the colormap."""
+    def blockSize(self) -> int:
+        """
+        Return the number of rows per block.
 
-    def _normalizeData(self) -> None:
-        """Normalize the Data for mapping to a colormap."""
-        df = self._dataFrame.copy()
-
-        # coerce non-bool / non-numeric values to numeric
-        cols = df.select_dtypes(exclude=['bool', 'number']).columns
-        df[cols] = df[cols].apply(pd.to_numeric, errors='coerce')
-
-        # normalize numeric values, avoiding inf values and division by zero
-        cols = df.select_dtypes(include=['number']).columns
-        df[cols].replace([np.inf, -np.inf], np.nan)
-        m = df[cols].nunique() <= 1  # boolean mask for columns with only 1 unique value
-        df[cols[m]] = df[cols[m]].where(df[cols[m]].isna(), other=0.0)
-        cols = cols[~m]
-        df[cols] = (df[cols] - df[cols].min()) / (df[cols].max() - df[cols].min())
-
-        # convert boolean values
-        cols = df.select_dtypes(include=['bool']).columns
-        df[cols] = df[cols].astype(float)
-
-        # store as property & call _defineColors()
-        self._normData = df
-        self._defineColors()
+        Returns
+        -------
+        int
+            The number of rows per block.
+        """
+        return self._blockSize
+
+    def _block(self, block: int) -> list[np.ndarray]:
+        """
+        Return the column arrays of a block, reading it from the provider if needed.
+
+        Parameters
+        ----------
+        block : int
+            The block index.
 
-    def _defineColors(self) -> None:
+        Returns
+        -------
+        list of np.ndarray
+            The column arrays of the block.
         """
-        Define the background and foreground colors according to the table's data.
+        if block in self._blocks:
+            self._blocks.move_to_end(block)
+            return self._blocks[block]
+        assert self._provider is not None
+        start = block * self._blockSize
+        dataFrame = self._provider.readRows(start, start + self._blockSize)
+        return self._storeBlock(block, dataFrame)
+
+    def _storeBlock(self, block: int, dataFrame: DataFrame) -> list[np.ndarray]:
+        """
+        Store a decoded block, evicting the least recently used blocks if needed.
 
-        The background color is set to the colormap-mapped values of the normalized
-        data, and the foreground color is set to the inverse of the background's
-        approximated luminosity.
+        Parameters
+        ----------
+        block : int
+            The block index.
+        dataFrame : DataFrame
+            The rows of the block.
 
-        The `layoutChanged` signal is emitted after the colors are defined.
+        Returns
+        -------
+        list of np.ndarray
+            The column arrays of the block.
         """
-        if self._normData.empty:
-            self._background = np.zeros((0, 0, 3), dtype=int)
-            self._foreground = np.zeros((0, 0), dtype=int)
-        else:
-            m = np.isfinite(self._normData)  # binary mask for finite values
-            self._background = np.ones((*self._normData.shape, 3), dtype=int) * 255
-            self._background[m] = self._cmap.mapToByte(self._normData.values[m])[:, :3]
-            self._foreground = 255 - (
-                self._background * np.array([[[0.21, 0.72, 0.07]]])
-            ).sum(axis=2).astype(int)
-        self.layoutChanged.emit()
+        columns = [
+            _columnToArray(dataFrame.iloc[:, i]) for i in range(dataFrame.shape[1])
+        ]
+        self._blocks[block] = columns
+        while len(self._blocks) > self._maxBlocks:
+            self._blocks.popitem(last=False)
+        return columns
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation = Qt.Orientation.Horizontal,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any | None:
+        """
+        Get the header data for the specified section.
+
+        Parameters
+        ----------
+        section : int
+            The section index.
+        orientation : Qt.Orientation, optional
+            The orientation of the header. Defaults to Horizontal.
+        role : int, optional
+            The role of the header data. Only DisplayRole is supported at this time.
+
+        Returns
+        -------
+        Any or None
+            The column name or the row number.
+        """
+        if role == Qt.ItemDataRole.DisplayRole:
+            if (
+                orientation == Qt.Orientation.Horizontal
+                and 0 <= section < self.columnCount()
+            ):
+                return self._columnNames[section]
+            elif (
+                orientation == Qt.Orientation.Vertical
+                and 0 <= section < self.rowCount()
+            ):
+                return section
+        return None
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        """
+        Get the number of rows in the model.
+
+        Parameters
+        ----------
+        parent : QModelIndex, optional
+            The parent index.
+
+        Returns
+        -------
+        int
+            The total number of rows if known, otherwise the number of fetched rows.
+        """
+        if isinstance(parent, QModelIndex) and parent.isValid():
+            return 0
+        return self._fetchedRows if self._totalRows is None else self._totalRows
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        """
+        Get the number of columns in the model.
+
+        Parameters
+        ----------
+        parent : QModelIndex, optional
+            The parent index.
+
+        Returns
+        -------
+        int
+            The number of columns.
+        """
+        if isinstance(parent, QModelIndex) and parent.isValid():
+            return 0
+        return len(self._columnNames)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """
+        Return whether more rows can be read from a provider of unknown length.
 
-    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        Parameters
+        ----------
+        parent : QModelIndex
+            The parent index.
+
+        Returns
+        -------
+        bool
+            Whether more rows are available.
+        """
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """
+        Read the next block of rows from a provider of unknown length.
+
+        Parameters
+        ----------
+        parent : QModelIndex
+            The parent index.
+        """
+        if not self.canFetchMore(parent):
+            return
+        assert self._provider is not None
+        block = self._fetchedRows // self._blockSize
+        dataFrame = self._provider.readRows(
+            self._fetchedRows, self._fetchedRows + self._blockSize
+        )
+        count = len(dataFrame)
+        self._exhausted = count < self._blockSize
+        if count == 0:
+            return
+        self.beginInsertRows(
+            QModelIndex(), self._fetchedRows, self._fetchedRows + count - 1
+        )
+        self._storeBlock(block, dataFrame)
+        self._fetchedRows += count
+        self.endInsertRows()
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any | None:
         """
         Get the data for the specified index.
 
@@ -410,22 +4175,19 @@ class ColoredDataFrameTableModel(DataFrameTableModel):
 
         Returns
         -------
-        Any
+        Any or None
             The data for the specified index.
         """
-        if (
-            role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole)
-            and index.isValid()
-        ):
-            row = self._dataFrame.index[index.row()]
-            col = index.column()
-            if role == Qt.ItemDataRole.BackgroundRole:
-                r, g, b = self._background[row][col]
-                return QColor.fromRgb(r, g, b, self._alpha)
-            if role == Qt.ItemDataRole.ForegroundRole:
-                lum = self._foreground[row][col]
-                return QColor('black' if (lum * self._alpha) < 32512 else 'white')
-        return super().data(index, role)
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            block, row = divmod(index.row(), self._blockSize)
+            columns = self._block(block)
+            if row >= len(columns[index.column()]):
+                return None
+            data = columns[index.column()][row]
+            if isinstance(data, np.generic):
+                return data.item()
+            return data
+        return None
 
 
 class PathWatcher(QObject):
@@ -1,16 +1,22 @@
 """Graphical user interface components."""
 
+import logging
+import weakref
 import webbrowser
 from enum import IntEnum
 from pathlib import Path
 from shutil import _ntuple_diskusage, disk_usage
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
 from qtpy.QtCore import (
     Property,
     QAbstractItemModel,
     QEvent,
     QModelIndex,
+    QObject,
+    QPoint,
     QPointF,
     QPropertyAnimation,
     QRect,
@@ -19,6 +25,7 @@ from qtpy.QtCore import (
     QSizeF,
     Qt,
     QThreadPool,
+    QTimer,
     QUrl,
     Signal,
     Slot,
@@ -26,14 +33,18 @@ from qtpy.QtCore import (
 from qtpy.QtGui import (
     QColor,
     QIcon,
+    QImage,
     QMouseEvent,
     QPainter,
     QPaintEvent,
     QPalette,
+    QResizeEvent,
 )
 from qtpy.QtWebEngineWidgets import QWebEngineView
 from qtpy.QtWidgets import (
     QAbstractButton,
+    QAbstractItemDelegate,
+    QAbstractItemView,
     QApplication,
     QCheckBox,
     QDialog,
@@ -53,14 +64,22 @@ from qtpy.QtWidgets import (
     QStyledItemDelegate,
     QStyleOptionButton,
     QStyleOptionViewItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from iblqt import resources  # noqa: F401
-from iblqt.core import QAlyx, RestrictedWebEnginePage, Worker
+from iblqt.core import (
+    ColoredDataFrameTableModel,
+    QAlyx,
+    RestrictedWebEnginePage,
+    Worker,
+)
 from iblutil.util import format_bytes
 
+log = logging.getLogger(__name__)
+
 
 class CheckBoxDelegate(QStyledItemDelegate):
     """
@@ -69,6 +88,21 @@ class CheckBoxDelegate(QStyledItemDelegate):
     This delegate allows for the display and interaction with boolean data as checkboxes.
     """
 
+    def __init__(self, parent: QObject | None = None):
+        """
+        Initialize the CheckBoxDelegate.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            The parent object.
+        """
+        super().__init__(parent)
+        self._control = QStyleOptionButton()
+        self._indicatorKey: tuple[QStyle, float] | None = None
+        self._indicatorSize = QSize()
+        self._styles: set[QStyle] = set()
+
     def paint(
         self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
     ) -> None:
@@ -85,13 +119,11 @@ class CheckBoxDelegate(QStyledItemDelegate):
             The index of the item in the model.
         """
         super().paint(painter, option, index)
-        control = QStyleOptionButton()
-        control.rect = QRect(option.rect.topLeft(), QCheckBox().sizeHint())
-        control.rect.moveCenter(option.rect.center())
+        control = self._control
+        control.rect = self._indicatorRect(option)
         control.state = QStyle.State_On if index.data() is True else QStyle.State_Off
-        QApplication.style().drawControl(
-            QStyle.ControlElement.CE_CheckBox, control, painter
-        )
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_CheckBox, control, painter)
 
     def displayText(self, value: Any, locale: Any) -> str:
         """
@@ -137,15 +169,288 @@ class CheckBoxDelegate(QStyledItemDelegate):
         bool
             True if the event was handled, False otherwise.
         """
-        if isinstance(event, QMouseEvent) and event.type() == QEvent.MouseButtonRelease:
-            checkbox_rect = QRect(option.rect.topLeft(), QCheckBox().sizeHint())
-            checkbox_rect.moveCenter(option.rect.center())
-            if checkbox_rect.contains(event.pos()):
-                model.setData(index, not model.data(index))
-                event.accept()
-                return True
+        if (
+            isinstance(event, QMouseEvent)
+            and event.type() == QEvent.MouseButtonRelease
+            and self._indicatorRect(option).contains(event.pos())
+        ):
+            model.setData(index, not model.data(index))
+            event.accept()
+            return True
         return super().editorEvent(event, model, option, index)
 
+    def _indicatorRect(self, option: QStyleOptionViewItem) -> QRect:
+        """
+        Return the rectangle of the checkbox, centered in the cell.
+
+        The size of the checkbox is cached per style and device pixel ratio.
+
+        Parameters
+        ----------
+        option : QStyleOptionViewItem
+            The style option of the cell.
+
+        Returns
+        -------
+        QRect
+            The rectangle of the checkbox.
+        """
+        widget = option.widget
+        if widget is None:
+            key = (
+                QApplication.style(),
+                float(QApplication.instance().devicePixelRatio()),
+            )
+        else:
+            key = (widget.style(), widget.devicePixelRatioF())
+        if key != self._indicatorKey:
+            style = key[0]
+            self._indicatorSize = style.sizeFromContents(
+                QStyle.ContentsType.CT_CheckBox, self._control, QSize(0, 0), widget
+            )
+            if style not in self._styles:
+                # the destroyed signal does not reliably carry the style's wrapper
+                delegate = weakref.ref(self)
+
+                def onDestroyed() -> None:
+                    if (instance := delegate()) is not None:
+                        instance._onStyleDestroyed(style)
+
+                style.destroyed.connect(onDestroyed)
+                self._styles.add(style)
+            self._indicatorKey = key
+        rect = QRect(option.rect.topLeft(), self._indicatorSize)
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    def _onStyleDestroyed(self, style: QStyle) -> None:
+        """
+        Discard the cached size of the checkbox once its style is deleted.
+
+        Parameters
+        ----------
+        style : QObject
+            The deleted style.
+        """
+        self._styles.discard(style)
+        if self._indicatorKey is not None and self._indicatorKey[0] is style:
+            self._indicatorKey = None
+
+
+class ColoredCellDelegate(QStyledItemDelegate):
+    """
+    A delegate painting the cells of a ColoredDataFrameTableModel in batches.
+
+    Instead of querying the data, background and foreground roles cell by cell, the
+    first paint call of each frame reads the palette indices and display texts of all
+    visible cells at once, paints the backgrounds of each row with one ``fillRect()``
+    per run of equally colored cells, and draws all texts. Subsequent paint calls of
+    the frame return immediately.
+
+    Selected and focused cells, views with alternating row colors, and models other than
+    :class:`~iblqt.core.ColoredDataFrameTableModel` are painted by
+    :class:`QStyledItemDelegate`.
+    """
+
+    def __init__(self, parent: QObject | None = None):
+        """
+        Initialize the ColoredCellDelegate.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            The parent object.
+        """
+        super().__init__(parent)
+        self._viewports: set[QWidget] = set()
+        self._frameViewport: QWidget | None = None
+        self._frameCells: dict[int, set[int]] = {}
+        self._colors: dict[bool, tuple[bytes, list[QColor]]] = {}
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> None:
+        """
+        Paint a cell, painting all visible cells with the first call of a frame.
+
+        Parameters
+        ----------
+        painter : QPainter
+            The painter used to draw the cell.
+        option : QStyleOptionViewItem
+            The style option containing the information needed for painting.
+        index : QModelIndex
+            The index of the item in the model.
+        """
+        view = option.widget
+        if isinstance(view, QTableView):
+            viewport = view.viewport()
+            if viewport not in self._viewports:
+                viewport.installEventFilter(self)
+                viewport.destroyed.connect(lambda: self._viewports.discard(viewport))
+                self._viewports.add(viewport)
+            if self._frameViewport is not viewport:
+                self._frameViewport = viewport
+                self._frameCells = self._paintFrame(painter, view)
+            if index.column() in self._frameCells.get(
+                index.row(), ()
+            ) and not option.state & (QStyle.State_Selected | QStyle.State_HasFocus):
+                return
+        super().paint(painter, option, index)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """
+        Start a new frame when a viewport is about to be painted.
+
+        Parameters
+        ----------
+        watched : QObject
+            The watched object.
+        event : QEvent
+            The event.
+
+        Returns
+        -------
+        bool
+            False, so that the event is processed.
+        """
+        if event.type() == QEvent.Paint:
+            self._frameViewport = None
+        return False
+
+    def _paintFrame(self, painter: QPainter, view: QTableView) -> dict[int, set[int]]:
+        """
+        Paint all visible cells of a view.
+
+        Parameters
+        ----------
+        painter : QPainter
+            The painter of the view's viewport.
+        view : QTableView
+            The view.
+
+        Cells of rows and columns with a different delegate are left out.
+
+        Returns
+        -------
+        dict
+            The columns that have been painted, per row. Empty if the cells need to be
+            painted one by one.
+        """
+        model = view.model()
+        viewport = view.viewport()
+        region = viewport.rect()
+        if painter.hasClipping():
+            region = region.intersected(painter.clipBoundingRect().toAlignedRect())
+        first = view.rowAt(region.top())
+        left = view.columnAt(region.left())
+        if (
+            not isinstance(model, ColoredDataFrameTableModel)
+            or view.alternatingRowColors()
+            or first < 0
+            or left < 0
+        ):
+            return {}
+        last = view.rowAt(region.bottom())
+        last = model.rowCount() - 1 if last < 0 else last
+        right = view.columnAt(region.right())
+        right = model.columnCount() - 1 if right < 0 else right
+        colorIndex = model.getColorIndices(first, last + 1)
+        if colorIndex is None:
+            return {}
+        texts = model.blockData(first, last + 1)
+        background = self._paletteColors(model.getPalette())
+        foreground = self._paletteColors(model.getPalette(foreground=True), True)
+
+        grid = 1 if view.showGrid() else 0
+        visible = [c for c in range(left, right + 1) if not view.isColumnHidden(c)]
+        own = [
+            c
+            for c in visible
+            if (view.itemDelegateForColumn(c) or view.itemDelegate()) is self
+        ]
+        # the columns of rows without a row delegate, or with self as row delegate
+        layouts: dict[
+            QAbstractItemDelegate | None,
+            tuple[list[int], list[int], list[int], np.ndarray],
+        ] = {}
+        for key, columns in ((None, own), (self, visible)):
+            x = [view.columnViewportPosition(c) for c in columns]
+            width = [view.columnWidth(c) - grid for c in columns]
+            # runs of equal colors must not extend over cells of other delegates
+            gaps = [a + w + grid != b for a, w, b in zip(x, width, x[1:], strict=False)]
+            layouts[key] = columns, x, width, np.array([True, *gaps])
+        margin = view.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, view) + 1
+        metrics = view.fontMetrics()
+        locale = view.locale()
+
+        painted: dict[int, set[int]] = {}
+        painter.save()
+        painter.setFont(view.font())
+        for row in range(first, last + 1):
+            rowDelegate = view.itemDelegateForRow(row)
+            if view.isRowHidden(row) or rowDelegate not in layouts:
+                continue
+            columns, x, width, breaks = layouts[rowDelegate]
+            if not columns:
+                continue
+            painted[row] = set(columns)
+            y = view.rowViewportPosition(row)
+            height = view.rowHeight(row) - grid
+            indices = colorIndex[row - first, columns]
+            breaks = breaks | np.r_[True, indices[1:] != indices[:-1]]
+            runs = np.flatnonzero(breaks).tolist()
+            indices = indices.tolist()
+            for start, stop in zip(runs, runs[1:] + [len(columns)], strict=True):
+                painter.fillRect(
+                    QRect(
+                        x[start], y, x[stop - 1] + width[stop - 1] - x[start], height
+                    ),
+                    background[indices[start]],
+                )
+            for i, column in enumerate(columns):
+                value = texts[column][row - first]
+                if value is None:
+                    continue
+                text = metrics.elidedText(
+                    self.displayText(value, locale),
+                    Qt.ElideRight,
+                    width[i] - 2 * margin,
+                )
+                painter.setPen(foreground[indices[i]])
+                painter.drawText(
+                    QRect(x[i] + margin, y, width[i] - 2 * margin, height),
+                    Qt.AlignVCenter,  # and left-aligned, as by default
+                    text,
+                )
+        painter.restore()
+        return painted
+
+    def _paletteColors(
+        self, palette: np.ndarray, foreground: bool = False
+    ) -> list[QColor]:
+        """
+        Return the colors of a packed palette, reusing them while it is unchanged.
+
+        Parameters
+        ----------
+        palette : np.ndarray
+            The packed 32-bit ARGB values.
+        foreground : bool, optional
+            Whether the palette holds the foreground colors. Default: False.
+
+        Returns
+        -------
+        list of QColor
+            The colors.
+        """
+        key = palette.tobytes()
+        cached = self._colors.get(foreground)
+        if cached is None or cached[0] != key:
+            cached = key, [QColor.fromRgba(argb) for argb in palette.tolist()]
+            self._colors[foreground] = cached
+        return cached[1]
+
 
 class ColoredButton(QPushButton):
     """A QPushButton that can change color."""
@@ -1008,3 +1313,386 @@ class SlideToggle(QAbstractButton):
         painter.setFont(self.font())
         symbol = '✔' if self.isChecked() else '✘'
         painter.drawText(thumb_rect, Qt.AlignCenter, symbol)
+
+
+class TableMinimap(QWidget):
+    """
+    A downsampled overview of the colors of a ColoredDataFrameTableModel.
+
+    Each column of the model is shown as a column of pixels. Blocks of consecutive
+    rows are pooled into a single pixel, showing the maximum or the mean position of
+    their colors on the colormap, so that "hot" rows remain visible in large tables.
+    The overview is updated incrementally when cells are modified. Clicking or
+    dragging scrolls an attached view to the corresponding row.
+    """
+
+    rowClicked = Signal(int)  # type: Signal
+    """Emitted with the row at a clicked position."""
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        model: ColoredDataFrameTableModel | None = None,
+        view: QAbstractItemView | None = None,
+        pooling: str = 'max',
+    ):
+        """
+        Initialize the TableMinimap.
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            The parent widget.
+        model : ColoredDataFrameTableModel, optional
+            The model to be shown.
+        view : QAbstractItemView, optional
+            The view to be scrolled by clicks, see :meth:`setView`.
+        pooling : str, optional
+            The pooling of rows, see :meth:`setPooling`. Default: 'max'.
+        """
+        super().__init__(parent=parent)
+        self._model: ColoredDataFrameTableModel | None = None
+        self._view: QAbstractItemView | None = None
+        self._pooling = 'max'
+        self._starts: npt.NDArray[np.intp] = np.zeros(0, dtype=np.intp)
+        self._pooled: npt.NDArray[np.uint8] = np.zeros((0, 0), dtype=np.uint8)
+        self._pixels = b''
+        self._image = QImage()
+        self._dirtyRows: tuple[int, int] | None = None
+        self._dirtyAll = True
+        self._updateTimer = QTimer(self)
+        self._updateTimer.setSingleShot(True)
+        self._updateTimer.setInterval(0)
+        self._updateTimer.timeout.connect(self._updateImage)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setPooling(pooling)
+        self.setModel(model)
+        self.setView(view)
+
+    def model(self) -> ColoredDataFrameTableModel | None:
+        """
+        Return the model shown by the minimap.
+
+        Returns
+        -------
+        ColoredDataFrameTableModel or None
+            The model.
+        """
+        return self._model
+
+    def setModel(self, model: ColoredDataFrameTableModel | None) -> None:
+        """
+        Set the model shown by the minimap.
+
+        Parameters
+        ----------
+        model : ColoredDataFrameTableModel or None
+            The model.
+        """
+        if self._model is not None:
+            for signal, slot in self._connections(self._model):
+                signal.disconnect(slot)
+        self._model = model
+        if model is not None:
+            for signal, slot in self._connections(model):
+                signal.connect(slot)
+        self._invalidate()
+
+    def view(self) -> QAbstractItemView | None:
+        """
+        Return the view scrolled by clicks on the minimap.
+
+        Returns
+        -------
+        QAbstractItemView or None
+            The view.
+        """
+        return self._view
+
+    def setView(self, view: QAbstractItemView | None) -> None:
+        """
+        Set the view scrolled by clicks on the minimap.
+
+        The rows visible in the view are outlined on the minimap.
+
+        Parameters
+        ----------
+        view : QAbstractItemView or None
+            The view, showing the same model as the minimap.
+        """
+        if self._view is not None:
+            self._view.verticalScrollBar().valueChanged.disconnect(self.update)
+        self._view = view
+        if view is not None:
+            view.verticalScrollBar().valueChanged.connect(self.update)
+        self.update()
+
+    def pooling(self) -> str:
+        """
+        Return the pooling of rows.
+
+        Returns
+        -------
+        str
+            The pooling of rows.
+        """
+        return self._pooling
+
+    def setPooling(self, pooling: str) -> None:
+        """
+        Set the pooling of rows.
+
+        Parameters
+        ----------
+        pooling : str
+            ``'max'`` to show the highest position on the colormap within each block of
+            rows, or ``'mean'`` to show the mean position. Missing values are ignored.
+        """
+        if pooling not in ('max', 'mean'):
+            log.warning(f'No such pooling: "{pooling}"')
+            return
+        self._pooling = pooling
+        self._invalidate()
+
+    def image(self) -> QImage:
+        """
+        Return the downsampled image of the model's colors.
+
+        Returns
+        -------
+        QImage
+            The image, with one pixel per column and block of rows.
+        """
+        self._updateTimer.stop()
+        self._updateImage()  # apply pending updates
+        return self._image
+
+    def rowAt(self, y: float) -> int:
+        """
+        Return the row of the model at a vertical position.
+
+        Parameters
+        ----------
+        y : float
+            The vertical position in widget coordinates.
+
+        Returns
+        -------
+        int
+            The row, or -1 if the model is empty.
+        """
+        if self._model is None or self._model.rowCount() == 0:
+            return -1
+        nRows = self._model.rowCount()
+        return min(max(int(y / max(self.height(), 1) * nRows), 0), nRows - 1)
+
+    def sizeHint(self) -> QSize:
+        """
+        Return the recommended size for the widget.
+
+        Returns
+        -------
+        QSize
+            The recommended size of the widget.
+        """
+        return QSize(60, 200)
+
+    def _connections(self, model: ColoredDataFrameTableModel) -> list[tuple[Any, Any]]:
+        return [
+            (model.modelReset, self._invalidate),
+            (model.layoutChanged, self._invalidate),
+            (model.rowsInserted, self._invalidate),
+            (model.rowsRemoved, self._invalidate),
+            (model.columnsInserted, self._invalidate),
+            (model.columnsRemoved, self._invalidate),
+            (model.colorsReady, self._invalidate),
+            (model.dataChanged, self._onDataChanged),
+        ]
+
+    def _invalidate(self, *args) -> None:
+        self._dirtyAll = True
+        self._updateTimer.start()
+
+    def _onDataChanged(
+        self,
+        topLeft: QModelIndex,
+        bottomRight: QModelIndex,
+        roles: list[int] | None = None,
+    ) -> None:
+        if roles and not any(
+            role
+            in (
+                Qt.ItemDataRole.BackgroundRole,
+                Qt.ItemDataRole.DisplayRole,
+                Qt.ItemDataRole.EditRole,
+            )
+            for role in roles
+        ):
+            return
+        start, stop = topLeft.row(), bottomRight.row() + 1
+        if self._dirtyRows is not None:
+            start = min(start, self._dirtyRows[0])
+            stop = max(stop, self._dirtyRows[1])
+        self._dirtyRows = (start, stop)
+        self._updateTimer.start()
+
+    def _updateImage(self) -> None:
+        """Pool the colors of modified rows and rebuild the image."""
+        model = self._model
+        nRows = 0 if model is None else model.rowCount()
+        nColumns = 0 if model is None else model.columnCount()
+        nBlocks = min(nRows, max(self.height(), 1))
+        if model is None or nBlocks == 0 or nColumns == 0:
+            self._starts = np.zeros(0, dtype=np.intp)
+            self._image = QImage()
+            self._dirtyRows, self._dirtyAll = None, False
+            self.update()
+            return
+        starts = np.arange(nBlocks) * nRows // nBlocks
+        if (
+            self._dirtyAll
+            or self._pooled.shape[1] != nColumns
+            or not np.array_equal(starts, self._starts)
+        ):
+            first, last = 0, nBlocks
+        elif self._dirtyRows is not None:
+            first = int(np.searchsorted(starts, self._dirtyRows[0], 'right')) - 1
+            last = int(np.searchsorted(starts, self._dirtyRows[1] - 1, 'right'))
+        else:
+            return
+        stop = int(starts[last]) if last < nBlocks else nRows
+        colorIndex = model.getColorIndices(int(starts[first]), stop)
+        if colorIndex is None:
+            return  # colors are being computed, see colorsReady
+        pooled = _poolRows(
+            colorIndex, starts[first:last] - starts[first], self._pooling
+        )
+        if last - first == nBlocks:
+            self._starts, self._pooled = starts, pooled
+        else:
+            self._pooled[first:last] = pooled
+        pixels = model.getPalette()[self._pooled] | np.uint32(0xFF000000)
+        self._pixels = pixels.tobytes()  # referenced, not copied, by the QImage
+        self._image = QImage(
+            self._pixels, nColumns, nBlocks, 4 * nColumns, QImage.Format_ARGB32
+        )
+        self._dirtyRows, self._dirtyAll = None, False
+        self.update()
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        """
+        Handle resizing of the widget.
+
+        Parameters
+        ----------
+        event : QResizeEvent
+            The resize event.
+        """
+        super().resizeEvent(event)
+        if event.size().height() != event.oldSize().height():
+            self._invalidate()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """
+        Paint the downsampled image and outline the rows visible in the view.
+
+        Parameters
+        ----------
+        event : QPaintEvent
+            The paint event.
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(QPalette.Base))
+        if not self._image.isNull():
+            painter.drawImage(QRectF(self.rect()), self._image)
+        if self._view is None or self._model is None or self._model.rowCount() == 0:
+            return
+        first = self._view.indexAt(QPoint(0, 0)).row()
+        if first < 0:
+            return
+        last = self._view.indexAt(QPoint(0, self._view.viewport().height() - 1)).row()
+        nRows = self._model.rowCount()
+        last = nRows - 1 if last < 0 else last
+        scale = self.height() / nRows
+        painter.setPen(self.palette().color(QPalette.Highlight))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(
+            QRectF(
+                0, first * scale, self.width() - 1, max((last - first + 1) * scale, 1)
+            )
+        )
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """
+        Scroll to the clicked row.
+
+        Parameters
+        ----------
+        event : QMouseEvent
+            The mouse event.
+        """
+        if event.button() == Qt.LeftButton:
+            self._scrollTo(event.pos().y())
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """
+        Scroll to the row under the mouse while dragging.
+
+        Parameters
+        ----------
+        event : QMouseEvent
+            The mouse event.
+        """
+        if event.buttons() & Qt.LeftButton:
+            self._scrollTo(event.pos().y())
+        super().mouseMoveEvent(event)
+
+    def _scrollTo(self, y: float) -> None:
+        row = self.rowAt(y)
+        if row < 0:
+            return
+        self.rowClicked.emit(row)
+        if self._view is not None and self._model is not None:
+            self._view.scrollTo(
+                self._model.index(row, 0), QAbstractItemView.PositionAtCenter
+            )
+
+
+def _poolRows(
+    colorIndex: npt.NDArray[np.uint8], starts: np.ndarray, pooling: str = 'max'
+) -> npt.NDArray[np.uint8]:
+    """
+    Pool palette indices over blocks of rows.
+
+    Parameters
+    ----------
+    colorIndex : np.ndarray
+        The palette indices, of shape (rows, columns). Index 255 denotes missing values.
+    starts : np.ndarray
+        The first row of each block, in ascending order.
+    pooling : str, optional
+        ``'max'`` or ``'mean'``. Missing values are ignored. Default: 'max'.
+
+    Returns
+    -------
+    np.ndarray
+        The pooled palette indices, of shape (blocks, columns). Blocks without values
+        are mapped to index 255.
+    """
+    if pooling == 'max':
+        # shift missing values from 255 to 0, so that they never win
+        shifted = colorIndex + np.uint8(1)
+        return np.maximum.reduceat(shifted, starts, axis=0) - np.uint8(1)
+    lengths = np.diff(starts, append=len(colorIndex))
+    pooled = np.empty((len(starts), colorIndex.shape[1]), dtype=np.uint8)
+    for column, values in enumerate(colorIndex.T):  # faster than reducing along axis 0
+        total = np.add.reduceat(values, starts, dtype=np.uint64)
+        missing = np.add.reduceat(values == 255, starts, dtype=np.uint64)
+        count = lengths - missing
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.rint((total - 255 * missing) / count)
+        mean[count == 0] = 255
+        pooled[:, column] = mean
+    return pooled
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+import tracemalloc
 from pathlib import Path
 from unittest.mock import PropertyMock, patch
 
@@ -8,7 +9,17 @@ import numpy as np
 import pandas as pd
 import pytest
 from qtpy import API_NAME as QT_VERSION
-from qtpy.QtCore import QModelIndex, Qt, QThreadPool, QUrl
+from qtpy.QtCore import (
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    Qt,
+    QThreadPool,
+    QUrl,
+)
+from qtpy.QtGui import QColor
+from qtpy.QtWidgets import QTableView
 from requests import HTTPError
 
 from iblqt import core
@@ -37,10 +48,24 @@ class TestDataFrameTableModel:
         assert model.headerData(1, Qt.Orientation.Horizontal) == 'Y'
         assert model.headerData(2, Qt.Orientation.Horizontal) is None
         assert model.headerData(-1, Qt.Orientation.Vertical) is None
-        assert model.headerData(2, Qt.Orientation.Vertical) == 2
+        assert model.headerData(2, Qt.Orientation.Vertical) == '2'
         assert model.headerData(3, Qt.Orientation.Vertical) is None
         assert model.headerData(0, 3) is None
 
+    def test_header_labels(self, qtbot):
+        columns = pd.MultiIndex.from_tuples([('a', 1), ('a', 2), ('b', 1)])
+        index = pd.MultiIndex.from_product([['x', 'y'], pd.to_datetime(['2020-01-01'])])
+        df = pd.DataFrame(np.arange(6).reshape(2, 3), index=index, columns=columns)
+        model = core.DataFrameTableModel(dataFrame=df)
+        assert model.headerData(1, Qt.Orientation.Horizontal) == 'a\n2'
+        assert model.headerData(1, Qt.Orientation.Vertical) == 'y, 2020-01-01 00:00:00'
+        with patch.object(core, '_labelsToText', wraps=core._labelsToText) as convert:
+            model.headerData(0, Qt.Orientation.Vertical)
+            model.headerData(2, Qt.Orientation.Horizontal)
+            assert convert.call_count == 0
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        assert model.headerData(0, Qt.Orientation.Vertical) == 'y, 2020-01-01 00:00:00'
+
     def test_index(self, qtbot, model):
         assert model.index(1, 0).row() == 1
         assert model.index(1, 0).column() == 0
@@ -61,23 +86,526 @@ class TestDataFrameTableModel:
         assert np.isnan(model.data(model.index(2, 0)))
         assert not isinstance(model.data(model.index(0, 2)), np.generic)
 
+    def test_set_block(self, qtbot):
+        df = pd.DataFrame(
+            {'a': [0, 1, 2, 3], 'b': [0.0, 1.0, 2.0, 3.0], 'c': list('wxyz')}
+        )
+        model = core.DataFrameTableModel(dataFrame=df)
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        with qtbot.waitSignal(model.dataChanged, timeout=100) as blocker:
+            assert model.setBlock(model.index(1, 0), np.array([[7, 7.5], [8, 8.5]]))
+        assert [i.row() for i in blocker.args[:2]] == [1, 2]
+        assert [i.column() for i in blocker.args[:2]] == [0, 1]
+        assert model.getDataFrame().to_dict('list') == {
+            'a': [3.0, 7.0, 8.0, 0.0],
+            'b': [3.0, 7.5, 8.5, 0.0],
+            'c': list('zyxw'),
+        }
+        block = pd.DataFrame({'b': [5.0], 'c': ['v']})
+        assert model.setBlock(model.index(3, 1), block)
+        assert model.getDataFrame().iloc[3, 1:].tolist() == [5.0, 'v']
+        assert model.getDataFrame()['b'].dtype == np.float64
+        assert not model.setBlock(QModelIndex(), block)
+        with pytest.raises(ValueError, match='bounds'):
+            model.setBlock(model.index(3, 0), np.zeros((2, 1)))
+        with pytest.raises(ValueError, match='two-dimensional'):
+            model.setBlock(model.index(0, 0), np.zeros(3))
+
+    def test_edit_transaction(self, qtbot):
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'a': [0, 1, 2, 3]}))
+        model.beginEdit()
+        with qtbot.assertNotEmitted(model.dataChanged):
+            model.setData(model.index(2, 0), 20)
+            model.beginEdit()
+            model.setData(model.index(1, 0), 10)
+            model.commitEdit()
+        with qtbot.waitSignal(model.dataChanged, timeout=100) as blocker:
+            model.commitEdit()
+        assert [i.row() for i in blocker.args[:2]] == [1, 2]
+        assert model.getDataFrame()['a'].tolist() == [0, 10, 20, 3]
+
+        model.beginEdit()
+        model.setBlock(model.index(0, 0), [[5], [6]])
+        with qtbot.waitSignal(model.dataChanged, timeout=100):
+            model.rollbackEdit()
+        assert model.getDataFrame()['a'].tolist() == [0, 10, 20, 3]
+        with qtbot.assertNotEmitted(model.dataChanged):
+            model.commitEdit()
+
+    def test_undo(self, qtbot):
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'a': [0, 1, 2, 3]}))
+        stack = core.QUndoStack()
+        model.setUndoStack(stack)
+        assert model.undoStack() is stack
+        model.setData(model.index(0, 0), 5)
+        model.beginEdit('Paste')
+        model.setBlock(model.index(1, 0), [[6], [7]])
+        model.setData(model.index(3, 0), 8.5)
+        model.commitEdit()
+        assert stack.count() == 2
+        assert stack.undoText() == 'Paste'
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+
+        with qtbot.waitSignal(model.dataChanged, timeout=100):
+            stack.undo()
+        assert model.getDataFrame()['a'].tolist() == [3, 2, 1, 5]
+        stack.undo()
+        assert model.getDataFrame()['a'].tolist() == [3, 2, 1, 0]
+        stack.redo()
+        stack.redo()
+        assert model.getDataFrame()['a'].tolist() == [8.5, 7, 6, 5]
+
+        # commands become obsolete once storage positions change
+        model.removeRows(0, 1)
+        stack.undo()
+        assert model.getDataFrame()['a'].tolist() == [7, 6, 5]
+        assert stack.count() == 1
+
+    def test_dtypes(self, qtbot):
+        df = pd.DataFrame(
+            {
+                'i': [1, 2],
+                'b': [True, False],
+                's': ['a', 'b'],
+                't': pd.to_datetime(['2020-01-01', '2021-01-01']),
+                'c': pd.Categorical(['x', 'y']),
+            },
+            index=['r0', 'r1'],
+        )
+        model = core.DataFrameTableModel(dataFrame=df)
+        assert model.data(model.index(1, 0)) == 2
+        assert model.data(model.index(0, 1)) is True
+        assert model.data(model.index(1, 2)) == 'b'
+        assert model.data(model.index(0, 3)) == pd.Timestamp('2020-01-01')
+        assert model.data(model.index(1, 4)) == 'y'
+        assert model.headerData(1, Qt.Orientation.Vertical) == 'r1'
+        pd.testing.assert_frame_equal(model.getDataFrame(), df)
+        assert model.setData(model.index(0, 2), 'z')
+        assert model.getDataFrame().iloc[0, 2] == 'z'
+        assert df.iloc[0, 2] == 'a'
+        assert model.getDataFrame().dtypes.equals(df.dtypes)
+
+    def test_edit_role(self, qtbot, caplog):
+        df = pd.DataFrame(
+            {
+                'i': np.array([1, 2], dtype=np.int32),
+                'f': np.array([0.5, 1.5], dtype=np.float32),
+                'b': [True, False],
+                't': pd.to_datetime(['2020-01-01', '2021-01-01']),
+                'c': pd.Categorical(['x', 'y']),
+                'n': pd.array([1, None], dtype='Int64'),
+            }
+        )
+        model = core.DataFrameTableModel(dataFrame=df)
+        edit = Qt.ItemDataRole.EditRole
+        assert model.data(model.index(0, 0), edit) == 1
+
+        assert model.setData(model.index(0, 0), ' 7', edit)
+        assert model.setData(model.index(1, 0), 3.0, edit)
+        assert model.setData(model.index(0, 1), '2.25', edit)
+        assert model.setData(model.index(1, 1), 4, edit)
+        assert model.setData(model.index(0, 2), 'no', edit)
+        assert model.setData(model.index(1, 2), 1, edit)
+        assert model.setData(model.index(0, 3), '2022-06-01', edit)
+        assert model.setData(model.index(0, 4), 'y', edit)
+        assert model.setData(model.index(1, 5), '5', edit)
+        result = model.getDataFrame()
+        assert result.dtypes.equals(df.dtypes)
+        assert result.iloc[:, 0].tolist() == [7, 3]
+        assert result.iloc[:, 1].tolist() == [2.25, 4.0]
+        assert result.iloc[:, 2].tolist() == [False, True]
+        assert result.iloc[0, 3] == pd.Timestamp('2022-06-01')
+        assert result.iloc[0, 4] == 'y'
+        assert result.iloc[1, 5] == 5
+
+        # invalid values are rejected without changing the dtype
+        for column, value in enumerate(['a', 'b', 'maybe', 'never', 'z', '1.x']):
+            assert not model.setData(model.index(0, column), value, edit)
+        assert 'Cannot set value' in caplog.text
+        assert model.getDataFrame().equals(result)
+        with pytest.raises(ValueError):
+            model.setBlock(model.index(0, 0), [['1', '1'], ['2', 'x']])
+        assert model.getDataFrame().equals(result)
+
+        # values that do not fit the dtype losslessly promote numerical columns
+        assert model.setData(model.index(0, 0), 2.5, edit)
+        assert model.setData(model.index(1, 0), '', edit)
+        assert model.getDataFrame().iloc[:, 0].dtype == np.float64
+        assert model.setBlock(model.index(0, 1), [['1e40'], ['nan']])
+        assert model.getDataFrame().iloc[:, 1].dtype == np.float64
+        assert model.data(model.index(0, 1)) == 1e40
+
+    def test_no_copy(self, qtbot):
+        df = pd.DataFrame({'a': np.arange(3.0), 'b': np.arange(3)})
+        model = core.DataFrameTableModel(dataFrame=df, copy=False)
+        assert model.dataFrame is df
+        assert model.setData(model.index(0, 0), -1.0)
+        assert model.data(model.index(0, 0)) == -1.0
+        assert df.iloc[0, 0] == 0.0
+        assert np.shares_memory(model.dataFrame['b'].to_numpy(), df['b'].to_numpy())
+        model.setDataFrame(df)
+        assert not np.shares_memory(model.dataFrame['b'].to_numpy(), df['b'].to_numpy())
+
+    def test_no_copy_peak_memory(self, qtbot):
+        df = pd.DataFrame(np.random.default_rng(0).random((250_000, 4)))
+        tracemalloc.start()
+        try:
+            model = core.DataFrameTableModel(dataFrame=df, copy=False)
+            model.getDataFrame()
+            model.setDataFrame(df, copy=False)
+            assert model.setData(model.index(0, 0), 1.0)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # only the written column may be duplicated
+        assert peak < 0.3 * df.memory_usage(index=False).sum()
+
+    def test_from_arrays(self, qtbot, tmp_path):
+        np.save(tmp_path / 'a.npy', np.arange(5.0))
+        np.save(tmp_path / 'b.npy', np.arange(5))
+        a = np.load(tmp_path / 'a.npy', mmap_mode='r')
+        b = np.load(tmp_path / 'b.npy', mmap_mode='r')
+        c = np.array(['v', 'w', 'x', 'y', 'z'])
+        model = core.ColoredDataFrameTableModel.fromArrays({'a': a, 'b': b, 'c': c})
+        assert isinstance(model, core.ColoredDataFrameTableModel)
+        assert model._dataFrame is None
+        assert np.shares_memory(model._columns[0], a)
+        assert model.rowCount() == 5
+        assert model.headerData(2, Qt.Orientation.Horizontal) == 'c'
+        assert model.data(model.index(3, 0)) == 3.0
+        assert model.data(model.index(4, 2)) == 'z'
+        assert model.data(model.index(4, 0), Qt.ItemDataRole.BackgroundRole).isValid()
+        assert model.setData(model.index(0, 0), -1.0)
+        assert model.data(model.index(0, 0)) == -1.0
+        assert np.load(tmp_path / 'a.npy')[0] == 0.0
+        model.sort(1, Qt.SortOrder.DescendingOrder)
+        assert model.data(model.index(0, 2)) == 'z'
+        assert model.getDataFrame()['b'].tolist() == [4, 3, 2, 1, 0]
+
+        writeable = np.arange(3)
+        model.setArrays({'x': writeable})
+        assert model.setData(model.index(0, 0), 9)
+        assert writeable[0] == 0
+        with pytest.raises(ValueError):
+            model.setArrays({'x': np.arange(3), 'y': np.arange(4)})
+        with pytest.raises(ValueError):
+            model.setArrays({'x': np.zeros((2, 2))})
+
+    def test_from_arrow(self, qtbot, tmp_path):
+        pa = pytest.importorskip('pyarrow')
+        table = pa.table({'i': [1, 2, 3], 'f': [0.5, None, 1.5], 's': ['a', 'b', 'c']})
+        path = tmp_path / 'table.arrow'
+        with pa.ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        batch = reader.get_batch(0)
+        model = core.DataFrameTableModel.fromArrow(batch)
+        assert not model._columns[0].flags.owndata
+        assert not model._columns[0].flags.writeable
+        assert model.data(model.index(2, 0)) == 3
+        assert np.isnan(model.data(model.index(1, 1)))
+        assert model.data(model.index(0, 2)) == 'a'
+        model = core.DataFrameTableModel.fromArrow(table)
+        assert model.getDataFrame()['i'].tolist() == [1, 2, 3]
+
+    def test_append_rows(self, qtbot, model, data_frame):
+        with qtbot.waitSignal(model.rowsInserted, timeout=100):
+            model.appendRows(data_frame)
+        assert model.rowCount() == 6
+        assert model.data(model.index(4, 1)) == 'B'
+        assert model.headerData(5, Qt.Orientation.Vertical) == '5'
+        assert model.data(model.index(5, 0), Qt.ItemDataRole.BackgroundRole).isValid()
+        for value in range(100):
+            model.appendRows(pd.DataFrame({'X': [value], 'Y': ['Z']}, index=['i']))
+        assert model.rowCount() == 106
+        assert model.data(model.index(105, 0)) == 99
+        assert model.headerData(105, Qt.Orientation.Vertical) == 'i'
+        assert model.dataFrame['X'].dtype == data_frame['X'].dtype
+        assert model.dataFrame['Y'].dtype == data_frame['Y'].dtype
+        with pytest.raises(ValueError):
+            model.appendRows(pd.DataFrame({'Z': [0]}))
+        with qtbot.assertNotEmitted(model.rowsInserted):
+            model.appendRows(data_frame.iloc[:0])
+        model = core.DataFrameTableModel()
+        with qtbot.waitSignal(model.modelReset, timeout=100):
+            model.appendRows(data_frame)
+        assert model.dataFrame.equals(data_frame)
+
+    def test_insert_remove_rows(self, qtbot, model):
+        with qtbot.waitSignal(model.rowsInserted, timeout=100):
+            assert model.insertRows(1, 2)
+        assert model.rowCount() == 5
+        assert np.isnan(model.data(model.index(1, 0)))
+        assert model.data(model.index(3, 0)) == 1
+        assert model.data(model.index(4, 1)) == 'C'
+        assert not model.insertRows(6, 1)
+        assert not model.insertRows(0, 0)
+        with qtbot.waitSignal(model.rowsRemoved, timeout=100):
+            assert model.removeRows(0, 3)
+        assert model.rowCount() == 2
+        assert model.data(model.index(0, 1)) == 'B'
+        assert model.headerData(0, Qt.Orientation.Vertical) == '3'
+        assert not model.removeRows(1, 2)
+        assert not model.removeRows(0, 1, model.index(0, 0))
+
+    def test_formatter(self, qtbot):
+        df = pd.DataFrame({'f': np.arange(300) / 3, 's': [f's{i}' for i in range(300)]})
+        model = core.DataFrameTableModel(dataFrame=df)
+        with qtbot.waitSignal(model.dataChanged, timeout=100):
+            model.setColumnFormatter(0, '%.2f')
+        model.setColumnFormatter(1, str.upper)
+        assert model.columnFormatter(0) == '%.2f'
+        assert model.data(model.index(1, 0)) == '0.33'
+        assert model.data(model.index(299, 0)) == '99.67'
+        assert model.data(model.index(2, 1)) == 'S2'
+        assert model.itemData(model.index(2, 1))[Qt.ItemDataRole.DisplayRole] == 'S2'
+
+        # cached per block
+        with patch.object(core, '_formatValues', wraps=core._formatValues) as fmt:
+            for row in range(10):
+                model.data(model.index(row, 0))
+            assert fmt.call_count == 0
+
+        # invalidated on edit and sort
+        assert model.setData(model.index(1, 0), 0.5)
+        assert model.data(model.index(1, 0)) == '0.50'
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        assert model.data(model.index(0, 0)) == '99.67'
+        assert model.data(model.index(0, 1)) == 'S299'
+
+        # non-numeric values
+        model.setColumnFormatter(1, '%5s')
+        assert model.data(model.index(0, 1)) == ' s299'
+        model.setColumnFormatter(0, '%d items')
+        assert model.data(model.index(0, 0)) == '99 items'
+        model.setColumnFormatter(1, '%d items')
+        assert model.data(model.index(0, 1)) == 's299'
+
+        model.setColumnFormatter(0, None)
+        assert model.columnFormatter(0) is None
+        assert model.data(model.index(0, 0)) == 99 + 2 / 3
+        assert model.data(model.index(1, 0)) == 99 + 1 / 3
+        assert model.dataFrame.dtypes.iloc[0] == np.float64
+
+    def test_formatter_colors(self, qtbot):
+        df = pd.DataFrame({'f': np.arange(300) / 3, 'i': np.arange(300)})
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        colors = model._colorIndex.copy()
+        with (
+            patch.object(model, '_normalizeData') as data,
+            patch.object(model, '_normalizeColumn') as column,
+            patch.object(model, '_normalizeCells') as cells,
+        ):
+            with qtbot.waitSignal(model.dataChanged, timeout=100) as blocker:
+                model.setColumnFormatter(0, '%.2f')
+            assert blocker.args[2] == [Qt.ItemDataRole.DisplayRole]
+            data.assert_not_called()
+            column.assert_not_called()
+            cells.assert_not_called()
+        np.testing.assert_array_equal(model._colorIndex, colors)
+
+        # edits carry EditRole and are normalized
+        with patch.object(model, '_normalizeCells', return_value=True) as cells:
+            with qtbot.waitSignal(model.dataChanged, timeout=100) as blocker:
+                assert model.setData(model.index(1, 0), 0.5)
+            assert Qt.ItemDataRole.EditRole in blocker.args[2]
+            cells.assert_called_once()
+
     def test_sort(self, qtbot, model):
         with qtbot.waitSignal(model.layoutChanged, timeout=100):
             model.sort(1, Qt.SortOrder.DescendingOrder)
         assert model.data(model.index(0, 1)) == 'C'
         assert model.setData(model.index(0, 1), 'D')
         assert model.data(model.index(0, 1)) == 'D'
-        assert model.headerData(0, Qt.Orientation.Vertical) == 2
+        assert model.headerData(0, Qt.Orientation.Vertical) == '2'
         with qtbot.waitSignal(model.layoutChanged, timeout=100):
             model.sort(1, Qt.SortOrder.AscendingOrder)
         assert model.data(model.index(0, 1)) == 'A'
         assert model.data(model.index(2, 1)) == 'D'
-        assert model.headerData(0, Qt.Orientation.Vertical) == 0
+        assert model.headerData(0, Qt.Orientation.Vertical) == '0'
         model.setDataFrame(pd.DataFrame())
         with qtbot.assertNotEmitted(model.layoutChanged):
             model.sort(1, Qt.SortOrder.AscendingOrder)
             model.sort(1, Qt.SortOrder.DescendingOrder)
 
+    def test_sort_permutation(self, qtbot):
+        df = pd.DataFrame({'a': [2, 1, 2, 1], 'b': [0.0, np.nan, 1.0, 3.0]})
+        model = core.DataFrameTableModel(dataFrame=df)
+        persistent = QPersistentModelIndex(model.index(3, 1))
+        model.sort(1, Qt.SortOrder.DescendingOrder)
+        assert [model.data(model.index(r, 1)) for r in range(3)] == [3.0, 1.0, 0.0]
+        assert np.isnan(model.data(model.index(3, 1)))
+        assert persistent.row() == 0
+        assert model.dataFrame.index.tolist() == [3, 2, 0, 1]
+        assert df.index.tolist() == [0, 1, 2, 3]
+        cached = model._permutations[((1, False),)]
+        model.sort(0, Qt.SortOrder.AscendingOrder)
+        model.sort(1, Qt.SortOrder.DescendingOrder)
+        assert model._rows is cached
+        model.sortByColumns(
+            [0, 1], [Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder]
+        )
+        assert model.dataFrame.index.tolist() == [3, 1, 2, 0]
+        model.sort(-1)
+        assert model.dataFrame.equals(df)
+        assert persistent.row() == 3
+
+    def test_sort_edit(self, qtbot):
+        df = pd.DataFrame({'a': [3, 1, 2]})
+        model = core.DataFrameTableModel(dataFrame=df)
+        model.sort(0)
+        assert model.setData(model.index(0, 0), 4)
+        assert model.dataFrame['a'].tolist() == [4, 2, 3]
+        model.sort(0)
+        assert model.dataFrame['a'].tolist() == [2, 3, 4]
+        model.appendRows(pd.DataFrame({'a': [0]}))
+        assert model.insertRows(0, 1)
+        assert model.dataFrame.index.tolist() == [4, 2, 0, 1, 3]
+        assert model.removeRows(1, 2)
+        assert model.dataFrame.index.tolist() == [4, 1, 3]
+        assert np.isnan(model.data(model.index(0, 0)))
+        assert model.data(model.index(1, 0)) == 4
+        model.sort(0)
+        assert model.dataFrame['a'].tolist()[:2] == [0, 4]
+
+    def test_filter(self, qtbot):
+        df = pd.DataFrame({'a': [3, 1, 2, 4], 'b': ['x', 'y', 'x', 'y']})
+        model = core.DataFrameTableModel(dataFrame=df)
+        persistent = QPersistentModelIndex(model.index(1, 0))
+        with qtbot.waitSignal(model.filterApplied, timeout=100) as blocker:
+            model.setFilter('b == "x"')
+        assert blocker.args[0] >= 0
+        assert model.rowCount() == 2
+        assert model.dataFrame.index.tolist() == [0, 2]
+        assert not persistent.isValid()
+        model.sort(0)
+        assert [model.data(model.index(r, 0)) for r in range(2)] == [2, 3]
+        model.setFilter({'a': lambda a: a > 1, 'b': lambda b: b == 'y'})
+        assert model.dataFrame.index.tolist() == [3]
+        model.setFilter(np.array([True, True, False, False]))
+        assert model.dataFrame.index.tolist() == [1, 0]
+        model.sort(-1)
+        assert model.dataFrame.index.tolist() == [0, 1]
+        with pytest.raises(ValueError):
+            model.setFilter(np.array([True]))
+        model.setFilter(None)
+        assert model.dataFrame.equals(df)
+
+    def test_filter_rows(self, qtbot):
+        df = pd.DataFrame({'a': [3, 1, 2]})
+        model = core.DataFrameTableModel(dataFrame=df)
+        model.setFilter('a > 1')
+        model.sort(0)
+        with qtbot.assertNotEmitted(model.rowsInserted):
+            model.appendRows(pd.DataFrame({'a': [0]}))
+        with qtbot.waitSignal(model.rowsInserted, timeout=100):
+            model.appendRows(pd.DataFrame({'a': [5, 1]}))
+        assert model.rowCount() == 3
+        assert model.data(model.index(2, 0)) == 5
+        assert model.removeRows(0, 1)
+        assert model.dataFrame['a'].tolist() == [3, 5]
+        assert model.insertRows(1, 1)
+        assert model.rowCount() == 3
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        assert model.dataFrame['a'].tolist()[:2] == [5, 3]
+        model.setFilter(None)
+        assert model.rowCount() == 6
+        model.setFilter('a > 1')
+        model.setDataFrame(df)
+        assert model.rowCount() == 2
+        model.setDataFrame(pd.DataFrame({'b': [1]}))
+        assert model.rowCount() == 1
+
+    def test_filter_expression(self, qtbot):
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'a': [3, 1, 2]}))
+        with qtbot.waitSignal(model.filterApplied, timeout=500):
+            model.setFilterExpression('a <', delay=10)
+            model.setFilterExpression('a < 3', delay=10)
+            assert model.rowCount() == 3
+        assert model.rowCount() == 2
+        for expression in ('a <', '(a', 'c > 1', 'a.foo'):
+            with qtbot.waitSignal(model.filterFailed, timeout=500):
+                model.setFilterExpression(expression, delay=10)
+            assert model.rowCount() == 2
+        with qtbot.waitSignal(model.filterApplied, timeout=500):
+            model.setFilterExpression(' ', delay=10)
+        assert model.rowCount() == 3
+
+    def test_snapshot(self, qtbot):
+        df = pd.DataFrame({'a': [3.0, 1.0, 2.0], 'b': ['x', 'y', 'z']})
+        model = core.DataFrameTableModel(dataFrame=df)
+        model.sort(0)
+        snapshot = model.snapshot()
+        assert model.snapshot() is snapshot
+        assert model.isCurrent(snapshot)
+        assert snapshot.rowCount() == 3
+        expected = df.sort_values('a')
+        pd.testing.assert_frame_equal(snapshot.getDataFrame(), expected)
+
+        # the snapshot shares the model's memory until the model is written to
+        unsorted = snapshot.getDataFrame(unsorted=True)
+        assert np.shares_memory(unsorted['a'].to_numpy(), model._columns[0])
+        generation = model.generation()
+        model.setData(model.index(0, 0), 5.0)
+        assert model.generation() > generation
+        assert not model.isCurrent(snapshot)
+        assert not np.shares_memory(unsorted['a'].to_numpy(), model._columns[0])
+        pd.testing.assert_frame_equal(snapshot.getDataFrame(), expected)
+
+        # DataFrames handed out by the model are not modified by later edits
+        dataFrame = model.getDataFrame()
+        model.setData(model.index(0, 0), 6.0)
+        model.appendRows(pd.DataFrame({'a': [0.0], 'b': ['w']}))
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        assert dataFrame['a'].tolist() == [5.0, 2.0, 3.0]
+        pd.testing.assert_frame_equal(snapshot.getDataFrame(), expected)
+        assert model.snapshot().getDataFrame()['a'].tolist() == [6.0, 3.0, 2.0, 0.0]
+
+    def test_get_data_frame_buffers(self, qtbot):
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'a': [3.0, 1.0]}))
+        model.appendRows(pd.DataFrame({'a': [2.0]}))
+        buffer = model._buffers[0]
+        assert model._columns[0].base is buffer
+
+        # sorted DataFrames are copies, so the column arrays are not frozen
+        model.sort(0)
+        dataFrame = model.getDataFrame()
+        assert model._columns[0].flags.writeable
+        assert model.setData(model.index(0, 0), 0.0)
+        assert model._columns[0].base is buffer
+        assert dataFrame['a'].tolist() == [1.0, 2.0, 3.0]
+
+        # unsorted DataFrames share the columns, which are copied on the next edit
+        model.sort(-1)
+        dataFrame = model.getDataFrame()
+        assert not model._columns[0].flags.writeable
+        model.appendRows(pd.DataFrame({'a': [4.0]}))
+        assert model._buffers[0] is buffer
+        assert model._columns[0].base is buffer
+        assert not model._columns[0].flags.writeable
+        assert model.setData(model.index(0, 0), 5.0)
+        assert model._columns[0].flags.writeable
+        assert not np.shares_memory(model._columns[0], buffer)
+        assert dataFrame['a'].tolist() == [3.0, 0.0, 2.0]
+        assert model.getDataFrame()['a'].tolist() == [5.0, 0.0, 2.0, 4.0]
+
+        # filter masks do not share the memory of boolean columns
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'b': [True, False]}))
+        model.setFilter('b')
+        assert model.setData(model.index(0, 0), False)
+        model.setFilter(model._mask)
+        assert model.rowCount() == 1
+
+    def test_snapshot_worker(self, qtbot):
+        model = core.DataFrameTableModel(dataFrame=pd.DataFrame({'a': np.arange(1e5)}))
+        snapshot = model.snapshot()
+        worker = core.Worker(lambda: snapshot.getDataFrame()['a'].sum())
+        with qtbot.waitSignal(worker.signals.result, timeout=1000) as blocker:
+            QThreadPool.globalInstance().start(worker)
+            model.setData(model.index(0, 0), 1e6)
+        assert blocker.args == [np.arange(1e5).sum()]
+        assert not model.isCurrent(snapshot)
+
     def test_colormap(self, qtbot, caplog, model):
         with qtbot.waitSignal(model.colormapChanged, timeout=100):
             model.colormap = 'CET-L1'
@@ -99,6 +627,392 @@ class TestDataFrameTableModel:
         model.setColormap('non-existant')
         assert caplog.records[0].levelname == 'WARNING'
 
+    def test_incremental_colors(self, qtbot):
+        df = pd.DataFrame({'X': [0.0, 1.0, 2.0, 4.0], 'Y': ['1', '2', '3', '4']})
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+
+        def colors():
+            return [
+                model.data(
+                    model.index(row, column), Qt.ItemDataRole.BackgroundRole
+                ).getRgb()
+                for row in range(model.rowCount())
+                for column in range(model.columnCount())
+            ]
+
+        def reference():
+            data_frame = model.getDataFrame().reset_index(drop=True)
+            reference = core.ColoredDataFrameTableModel(dataFrame=data_frame)
+            return [
+                reference.data(
+                    reference.index(row, column), Qt.ItemDataRole.BackgroundRole
+                ).getRgb()
+                for row in range(reference.rowCount())
+                for column in range(reference.columnCount())
+            ]
+
+        # value within range: only the modified cell is recolored
+        with qtbot.assertNotEmitted(model.layoutChanged):
+            model.setData(model.index(1, 0), 3.0)
+        assert colors() == reference()
+
+        # value outside range: the column is renormalized
+        with qtbot.waitSignal(
+            model.dataChanged,
+            check_params_cb=lambda tl, br, roles: (
+                tl.column() == 0 and br.row() == 3 and roles
+            ),
+            timeout=100,
+        ):
+            model.setData(model.index(1, 0), 8.0)
+        assert colors() == reference()
+
+        # modified cell defined the range
+        model.setData(model.index(1, 0), 3.0)
+        assert colors() == reference()
+
+        # non-numeric column
+        model.setData(model.index(0, 1), '10')
+        assert colors() == reference()
+
+        # inf values are ignored
+        model.setData(model.index(2, 0), np.inf)
+        assert colors() == reference()
+        assert model.data(model.index(2, 0), Qt.ItemDataRole.BackgroundRole) == QColor(
+            'white'
+        )
+
+        # blocks and transactions are normalized once per column
+        with patch.object(
+            model, '_normalizeColumn', wraps=model._normalizeColumn
+        ) as normalize:
+            model.setBlock(model.index(0, 0), [[9.0, '0'], [-1.0, '5']])
+            assert colors() == reference()
+            assert normalize.call_count == 2
+            normalize.reset_mock()
+            model.beginEdit()
+            for row in range(4):
+                model.setData(model.index(row, 0), row + 10.0)
+            model.commitEdit()
+            assert colors() == reference()
+            assert normalize.call_count == 1
+
+    def test_normalization(self, qtbot, caplog):
+        df = pd.DataFrame(
+            {
+                'x': [1.0, 10.0, 100.0, 1000.0, -1.0, np.inf],
+                'c': [3] * 6,
+                'b': [True] * 6,
+                's': ['1', '10', 'a', None, '100', '1000'],
+            }
+        )
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        assert model.normalization == 'linear'
+        assert model._normValues.dtype == np.float32
+        np.testing.assert_array_equal(model._colorIndex[:, 0], [1, 3, 26, 254, 0, 255])
+        np.testing.assert_array_equal(model._colorIndex[:, 1:3], [[0, 254]] * 6)
+        assert model.statistics['lower'].tolist() == [-1, 3, 0, 1]
+        assert model.statistics['upper'].tolist() == [1000, 3, 1, 1000]
+
+        with qtbot.waitSignal(model.normalizationChanged, timeout=100):
+            model.normalization = 'log'
+        np.testing.assert_array_equal(
+            model._colorIndex[:, 0], [0, 85, 169, 254, 255, 255]
+        )
+        np.testing.assert_array_equal(
+            model._colorIndex[:, 3], [0, 85, 255, 255, 169, 254]
+        )
+        statistics = model.statistics.iloc[[0, 3]]
+        np.testing.assert_allclose(statistics['lower'], [1, 1], rtol=1e-6)
+        np.testing.assert_allclose(statistics['upper'], [1000, 1000], rtol=1e-6)
+
+        # incremental updates apply the same normalization
+        model.setData(model.index(1, 0), 100.0)
+        assert model._colorIndex[1, 0] == 169
+
+        values = np.append(np.arange(999.0), 1e6)
+        model = core.ColoredDataFrameTableModel(
+            dataFrame=pd.DataFrame({'x': values}), normalization='robust'
+        )
+        assert model._colorIndex[:, 0].max() == 254
+        assert model._colorIndex[500, 0] == pytest.approx(127, abs=3)
+        model.setNormalization('robust', percentile=0)
+        assert model._colorIndex[998, 0] == 0
+
+        model.normalization = 'invalid'
+        assert model.normalization == 'robust'
+        assert 'No such normalization' in caplog.text
+
+    def test_scaling(self, qtbot, caplog):
+        df = pd.DataFrame(
+            {'a': [0.0, 1.0, 2.0], 'b': [10.0, 20.0, 40.0], 'c': [True, False, True]}
+        )
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        assert model.scaling == 'column'
+
+        def expected(lower, upper):
+            lower, upper = np.asarray(lower), np.asarray(upper)
+            normalized = (df[['a', 'b']].to_numpy() - lower) / (upper - lower)
+            index = np.rint(np.clip(normalized, 0, 1) * 254).astype(int)
+            return np.column_stack([index, [254, 0, 254]]).tolist()
+
+        assert model._colorIndex.tolist() == expected([0, 10], [2, 40])
+
+        # switching the scaling re-maps the colors without rescanning the data
+        with patch.object(model, '_normalizeInputs') as normalize:
+            with qtbot.waitSignals(
+                [model.scalingChanged, model.statisticsChanged], timeout=100
+            ):
+                model.scaling = 'row'
+            rows = df[['a', 'b']].to_numpy()
+            assert model._colorIndex.tolist() == expected(
+                rows.min(axis=1, keepdims=True), rows.max(axis=1, keepdims=True)
+            )
+            model.scaling = 'global'
+            assert model._colorIndex.tolist() == expected(0, 40)
+            model.setFixedRange(0, 20)
+            assert model._colorIndex.tolist() == expected(0, 40)
+            model.scaling = 'fixed'
+            assert model._colorIndex.tolist() == expected(0, 20)
+            model.scaling = 'column'
+            assert model._colorIndex.tolist() == expected([0, 10], [2, 40])
+            normalize.assert_not_called()
+
+        # statistics in units of the data
+        statistics = model.getStatistics('column')
+        assert statistics.index.tolist() == ['a', 'b', 'c']
+        assert statistics['lower'].tolist() == [0, 10, 0]
+        assert statistics['upper'].tolist() == [2, 40, 1]
+        statistics = model.getStatistics('row')
+        assert statistics['lower'].tolist() == [0, 1, 2]
+        assert statistics['upper'].tolist() == [10, 20, 40]
+        assert model.getStatistics('global').loc['global'].tolist() == [0, 40]
+        assert model.getStatistics('fixed').loc['fixed'].tolist() == [0, 20]
+        with pytest.raises(ValueError):
+            model.getStatistics('invalid')
+
+        # edits update the statistics incrementally
+        model.scaling = 'global'
+        with qtbot.waitSignal(model.statisticsChanged, timeout=100):
+            model.setData(model.index(0, 1), 80.0)
+        df.loc[0, 'b'] = 80.0
+        assert model._colorIndex.tolist() == expected(0, 80)
+        with qtbot.assertNotEmitted(model.statisticsChanged):
+            model.setData(model.index(1, 1), 30.0)
+        df.loc[1, 'b'] = 30.0
+        assert model._colorIndex.tolist() == expected(0, 80)
+        model.scaling = 'row'
+        model.setData(model.index(1, 0), 50.0)
+        df.loc[1, 'a'] = 50.0
+        rows = df[['a', 'b']].to_numpy()
+        assert model._colorIndex.tolist() == expected(
+            rows.min(axis=1, keepdims=True), rows.max(axis=1, keepdims=True)
+        )
+        assert model.getStatistics('row')['upper'].tolist() == [80, 50, 40]
+
+        # percentiles of rows and of the whole table are computed on demand
+        data = np.random.default_rng(0).normal(size=(50, 20))
+        data[data > 2] = np.nan
+        model = core.ColoredDataFrameTableModel(
+            dataFrame=pd.DataFrame(data), normalization='robust', scaling='row'
+        )
+        statistics = model.getStatistics()
+        np.testing.assert_allclose(
+            statistics.to_numpy().T,
+            np.nanpercentile(data.astype(np.float32), [1, 99], axis=1),
+            rtol=1e-5,
+        )
+        statistics = model.getStatistics('global').to_numpy()[0]
+        np.testing.assert_allclose(
+            statistics, np.nanpercentile(data.astype(np.float32), [1, 99]), rtol=1e-5
+        )
+
+        model.scaling = 'invalid'
+        assert model.scaling == 'row'
+        assert 'No such scaling' in caplog.text
+        model.setFixedRange(1, 0)
+        assert model.getFixedRange() == (0, 1)
+        assert 'Invalid range' in caplog.text
+
+    @pytest.mark.parametrize('normalization', ['linear', 'log', 'robust'])
+    @pytest.mark.parametrize('scaling', ['column', 'row', 'global', 'fixed'])
+    def test_append_colors(self, qtbot, normalization, scaling):
+        df = pd.DataFrame(
+            {
+                'a': [1.0, 5.0, 3.0, np.nan],
+                'b': [10, 20, 30, 40],
+                'c': [True, False, True, False],
+                's': ['1', '2', 'x', '4'],
+            }
+        )
+        model = core.ColoredDataFrameTableModel(
+            dataFrame=df, normalization=normalization, scaling=scaling
+        )
+        model.setFixedRange(1, 10)
+
+        def check():
+            reference = core.ColoredDataFrameTableModel(
+                dataFrame=df, normalization=normalization, scaling=scaling
+            )
+            reference.setFixedRange(1, 10)
+            assert model._colorIndex.tolist() == reference._colorIndex.tolist()
+            pd.testing.assert_frame_equal(
+                model.getStatistics(), reference.getStatistics(), check_index_type=False
+            )
+
+        within = pd.DataFrame({'a': [2.0], 'b': [15], 'c': [True], 's': ['3']})
+        widening = pd.DataFrame(
+            {'a': [9.0, np.nan], 'b': [25, 50], 'c': [False, True], 's': ['8', 'y']}
+        )
+        for batch in (within, widening, within):
+            with (
+                patch.object(model, '_normalizeData') as normalize,
+                patch.object(
+                    model, '_notifyColorsChanged', wraps=model._notifyColorsChanged
+                ) as notify,
+            ):
+                model.appendRows(batch)
+                normalize.assert_not_called()
+                if batch is within and normalization != 'robust':
+                    notify.assert_not_called()  # existing cells keep their colors
+            df = pd.concat([df, batch], ignore_index=True)
+            check()
+        assert model._normValues.base is model._normBuffer
+        assert model._colorIndex.base is model._colorBuffer
+        if scaling == 'row':
+            assert model._statistics['row'][0].base is model._rowBuffers[0]
+
+        # rows hidden by a filter are normalized as well
+        model.setFilter('a < 0')
+        with patch.object(model, '_normalizeData') as normalize:
+            model.appendRows(widening.assign(a=[20.0, 0.5]))
+            normalize.assert_not_called()
+        df = pd.concat([df, widening.assign(a=[20.0, 0.5])], ignore_index=True)
+        model.setFilter(None)
+        check()
+
+        # changing the dtype of a column requires normalizing all data
+        with patch.object(model, '_normalizeData') as normalize:
+            model.appendRows(within.assign(b=[1.5]))
+            normalize.assert_called_once()
+
+    def test_color_indices(self, qtbot):
+        df = pd.DataFrame({'X': [0.0, 2.0, 1.0, np.nan], 'Y': [1.0, 0.0, 1.0, 2.0]})
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        colorIndex = model.getColorIndices()
+        assert colorIndex.tolist() == [[0, 127], [254, 0], [127, 127], [255, 254]]
+        assert not colorIndex.flags.writeable
+        assert model.getColorIndices(1, 3).tolist() == colorIndex[1:3].tolist()
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        assert model.getColorIndices(0, 2).tolist() == [[254, 0], [127, 127]]
+        palette = model.getPalette()
+        assert palette.shape == (256,)
+        assert palette[-1] == QColor('white').rgba()
+        background = model.data(model.index(0, 0), Qt.ItemDataRole.BackgroundRole)
+        assert palette[254] == background.rgba()
+
+    def test_palette(self, qtbot):
+        df = pd.DataFrame({'X': [0.0, 1.0, 0.0, np.nan], 'Y': [1.0, 0.0, 1.0, 2.0]})
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        background = Qt.ItemDataRole.BackgroundRole
+        foreground = Qt.ItemDataRole.ForegroundRole
+        assert model.data(model.index(0, 0), background) is model.data(
+            model.index(2, 0), background
+        )
+        assert model.data(model.index(3, 0), background) == QColor('white')
+        assert model.data(model.index(3, 0), foreground) == QColor('black')
+        assert model.data(model.index(1, 0), background) == model.data(
+            model.index(3, 1), background
+        )
+        with qtbot.waitSignal(model.dataChanged, timeout=100):
+            model.alpha = 0
+        assert model.data(model.index(1, 0), background).alpha() == 0
+        assert model.data(model.index(1, 0), foreground) == QColor('black')
+
+    @pytest.mark.parametrize(
+        'index', [['c', 'a', 'b', 'd'], [3, 0, 2, 1], [10, 10, 11, 12]]
+    )
+    def test_colors_index(self, qtbot, index):
+        df = pd.DataFrame({'X': [0.0, 1.0, 2.0, 3.0]}, index=index)
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        reference = core.ColoredDataFrameTableModel(dataFrame=df.reset_index(drop=True))
+        background = Qt.ItemDataRole.BackgroundRole
+        for _ in range(2):
+            for row in range(4):
+                assert (
+                    model.data(model.index(row, 0), background).rgba()
+                    == reference.data(reference.index(row, 0), background).rgba()
+                )
+            model.sort(0, Qt.SortOrder.DescendingOrder)
+            reference.sort(0, Qt.SortOrder.DescendingOrder)
+        assert model._colorIndex.nbytes == 4
+        assert model._palette.dtype == np.uint32
+
+    def test_asynchronous(self, qtbot):
+        background = Qt.ItemDataRole.BackgroundRole
+        df1 = pd.DataFrame({'X': [0.0, 1.0, 2.0], 'Y': ['1', '2', 'a']})
+        df2 = pd.DataFrame({'X': [2.0, 1.0, 0.0], 'Y': ['a', '0', '3']})
+        reference = core.ColoredDataFrameTableModel(dataFrame=df2)
+        model = core.ColoredDataFrameTableModel(asynchronous=True)
+        assert model.asynchronous
+
+        def colors(model):
+            return [
+                model.data(model.index(row, column), background).rgba()
+                for row in range(3)
+                for column in range(2)
+            ]
+
+        with qtbot.waitSignal(model.colorsReady, timeout=1000) as blocker:
+            model.setDataFrame(df1)
+            assert model.data(model.index(0, 0), background) is None
+            model.setDataFrame(df2)
+        assert blocker.signal_triggered
+        assert colors(model) == colors(reference)
+        with qtbot.assertNotEmitted(model.colorsReady, wait=100):
+            pass  # the superseded computation is discarded
+
+        # edits are applied incrementally, unless a computation is pending
+        model.setData(model.index(1, 0), 1.5)
+        reference.setData(reference.index(1, 0), 1.5)
+        assert colors(model) == colors(reference)
+        with qtbot.waitSignal(model.colorsReady, timeout=1000):
+            model.setDataFrame(df2)
+            model.setData(model.index(0, 0), 5.0)
+        reference.setDataFrame(df2)
+        reference.setData(reference.index(0, 0), 5.0)
+        assert colors(model) == colors(reference)
+
+        # the scaling may be changed while colors are being computed
+        reference.scaling = 'global'
+        with qtbot.waitSignal(model.colorsReady, timeout=1000):
+            model.setDataFrame(df2)
+            model.scaling = 'global'
+        reference.setDataFrame(df2)
+        assert colors(model) == colors(reference)
+
+        model.asynchronous = False
+        with qtbot.waitSignal(model.colorsReady, timeout=100):
+            model.setDataFrame(df1)
+        assert model.data(model.index(0, 0), background) is not None
+
+    def test_colormap_cache(self, qtbot, model):
+        core._getColormap.cache_clear()
+        with patch.object(
+            core.colormap, 'listMaps', wraps=core.colormap.listMaps
+        ) as list_maps:
+            model.colormap = 'viridis'
+            model.colormap = 'plasma'
+            model.colormap = 'viridis'
+            other = core.ColoredDataFrameTableModel(colormap='viridis')
+        assert list_maps.call_count == 2
+        assert other.colormap == 'viridis'
+        assert core._getColormapTable('viridis', 255) is core._getColormapTable(
+            'viridis', 255
+        )
+        assert not core._getColormapTable('viridis', 255).flags.writeable
+
     def test_alpha(self, qtbot, model):
         with qtbot.waitSignal(model.alphaChanged, timeout=100):
             model.alpha = 128
@@ -110,6 +1024,190 @@ class TestDataFrameTableModel:
             model.data(model.index(2, 0), Qt.ItemDataRole.BackgroundRole).alpha() == 128
         )
 
+    def test_alpha_repaint(self, qtbot, model):
+        class PaintCounter(QObject):
+            count = 0
+
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    self.count += 1
+                return False
+
+        view = QTableView()
+        qtbot.addWidget(view)
+        view.setModel(model)
+        view.show()
+        qtbot.waitExposed(view)
+        counter = PaintCounter()
+        view.viewport().installEventFilter(counter)
+        qtbot.wait(50)
+        counter.count = 0
+        roles = []
+        model.dataChanged.connect(lambda *args: roles.append(list(args[2])))
+        with (
+            qtbot.assertNotEmitted(model.layoutChanged),
+            qtbot.waitSignal(model.dataChanged, timeout=100),
+        ):
+            for alpha in range(0, 256, 5):
+                model.alpha = alpha
+            model.colormap = 'viridis'
+        qtbot.wait(50)
+        assert roles == [
+            [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole]
+        ]
+        assert 1 <= counter.count <= 2
+
+    def test_item_data(self, qtbot, model):
+        item_data = model.itemData(model.index(1, 0))
+        assert item_data[Qt.ItemDataRole.DisplayRole] == 1
+        assert item_data[Qt.ItemDataRole.BackgroundRole] == model.data(
+            model.index(1, 0), Qt.ItemDataRole.BackgroundRole
+        )
+        assert Qt.ItemDataRole.ForegroundRole in item_data
+        assert model.itemData(QModelIndex()) == {}
+
+    def test_multi_data(self, qtbot, model):
+        class RoleData:
+            def __init__(self, role):
+                self._role = role
+                self.value = None
+
+            def role(self):
+                return self._role
+
+            def setData(self, value):
+                self.value = value
+
+        roles = [
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.BackgroundRole,
+            Qt.ItemDataRole.ForegroundRole,
+            Qt.ItemDataRole.ToolTipRole,
+        ]
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        for hint in (None, (0, 1)):  # computed per cell and prefetched
+            if hint is not None:
+                model.setViewportHint(*hint)
+            for column in range(model.columnCount()):
+                index = model.index(0, column)
+                span = [RoleData(role) for role in roles]
+                model.multiData(index, span)
+                assert [d.value for d in span] == [model.data(index, r) for r in roles]
+            assert span[0].value is not None
+
+    @pytest.mark.skipif(
+        QT_VERSION in ('PyQt5', 'PySide6'),
+        reason='QModelRoleDataSpan cannot be constructed from a list',
+    )
+    def test_multi_data_span(self, qtbot, model):
+        from qtpy.QtCore import QModelRoleData, QModelRoleDataSpan
+
+        roles = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        span = QModelRoleDataSpan([QModelRoleData(role) for role in roles])
+        model.multiData(model.index(0, 0), span)
+        data = [role_data.data() for role_data in span]
+        assert data == [model.data(model.index(0, 0), role) for role in roles]
+        assert data[0] == 2
+
+    @pytest.mark.skipif(QT_VERSION == 'PyQt5', reason='multiData requires Qt 6')
+    def test_multi_data_view(self, qtbot, model):
+        class CountingModel(core.ColoredDataFrameTableModel):
+            calls = 0
+
+            def data(self, *args):
+                self.calls += 1
+                return super().data(*args)
+
+        counting_model = CountingModel(dataFrame=model.dataFrame)
+        view = QTableView()
+        qtbot.addWidget(view)
+        view.setModel(counting_model)
+        view.show()
+        qtbot.waitExposed(view)
+        view.viewport().grab()
+        assert counting_model.calls == 0
+
+    def test_viewport_hint(self, qtbot):
+        df = pd.DataFrame(
+            {'a': np.arange(1000) / 7, 'b': [f's{i}' for i in range(1000)]}
+        )
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        reference = core.ColoredDataFrameTableModel(dataFrame=df)
+        for m in (model, reference):
+            m.setColumnFormatter(0, '%.1f')
+            m.sort(0, Qt.SortOrder.DescendingOrder)
+        roles = [
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.EditRole,
+            Qt.ItemDataRole.BackgroundRole,
+            Qt.ItemDataRole.ForegroundRole,
+        ]
+
+        def check(rows):
+            for row in rows:
+                for column in range(2):
+                    for role in roles:
+                        assert model.data(model.index(row, column), role) == (
+                            reference.data(reference.index(row, column), role)
+                        )
+
+        assert model.viewportHint() is None
+        model.setViewportHint(100, 120)
+        assert model.viewportHint() == (100, 120)
+        with patch.object(model, '_cellData', wraps=model._cellData) as cell_data:
+            check(range(100 - model._prefetchMargin, 121 + model._prefetchMargin))
+            assert cell_data.call_count == 0
+            check([0, 999])
+            assert cell_data.call_count > 0
+
+        # the block is only recomputed once the visible rows leave it
+        with patch.object(model, '_prefetchData', wraps=model._prefetchData) as fetch:
+            model.setViewportHint(110, 130)
+            check([110])
+            assert fetch.call_count == 0
+            model.setViewportHint(500, 520)
+            check([500])
+            assert fetch.call_count == 1
+
+        # the block is recomputed when data or colors change
+        for m in (model, reference):
+            m.setData(m.index(505, 0), 1e6)
+            m.setColumnFormatter(1, str.upper)
+        check([505, 510])
+        model.colormap = reference.colormap = 'viridis'
+        check([505, 510])
+
+    def test_block_data(self, qtbot):
+        df = pd.DataFrame({'a': np.arange(100) / 4, 'b': [f's{i}' for i in range(100)]})
+        model = core.ColoredDataFrameTableModel(dataFrame=df)
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+
+        def expected(start, stop, role):
+            return [
+                [
+                    model.data(model.index(row, column), role)
+                    for row in range(start, stop)
+                ]
+                for column in range(2)
+            ]
+
+        roles = (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole)
+        for role in roles:
+            assert model.blockData(10, 20, role) == expected(10, 20, role)
+        model.setViewportHint(0, 30)
+        with patch.object(model, '_prefetchData', wraps=model._prefetchData) as fetch:
+            for role in roles:
+                assert model.blockData(10, 20, role) == expected(10, 20, role)
+            assert fetch.call_count == 1  # the prefetch for the hint
+        assert model.blockData(99, 200) == expected(99, 100, roles[0])
+
+        foreground = model.getPalette(foreground=True)
+        colorIndex = model.getColorIndices(0, 20)
+        for row, column in ((0, 0), (19, 0), (5, 1)):
+            color = model.data(model.index(row, column), Qt.ItemDataRole.ForegroundRole)
+            assert foreground[colorIndex[row, column]] == color.rgba()
+
     def test_counts(self, qtbot, model):
         assert model.rowCount() == 3
         assert model.columnCount() == 2
@@ -118,6 +1216,95 @@ class TestDataFrameTableModel:
         assert model.columnCount(parent_index) == 0
 
 
+class TestChunkedDataFrameTableModel:
+    @pytest.fixture
+    def data_frame(self):
+        yield pd.DataFrame(
+            {
+                'a': np.arange(95),
+                'b': np.arange(95) * 0.5,
+                'c': [f's{i}' for i in range(95)],
+            }
+        )
+
+    @pytest.fixture(params=['parquet', 'feather'])
+    def provider(self, request, tmp_path, data_frame):
+        pytest.importorskip('pyarrow')
+        path = tmp_path / f'table.{request.param}'
+        if request.param == 'parquet':
+            data_frame.to_parquet(path, row_group_size=20)
+            yield core.ParquetChunkProvider(path)
+        else:
+            data_frame.to_feather(path, chunksize=20)
+            yield core.FeatherChunkProvider(path)
+
+    def test_provider(self, qtbot, provider, data_frame):
+        assert provider.columns() == ['a', 'b', 'c']
+        assert provider.rowCount() == 95
+        pd.testing.assert_frame_equal(
+            provider.readRows(15, 45), data_frame.iloc[15:45].reset_index(drop=True)
+        )
+        assert len(provider.readRows(90, 100)) == 5
+        assert len(provider.readRows(100, 110)) == 0
+
+    def test_model(self, qtbot, provider, data_frame):
+        model = core.ChunkedDataFrameTableModel(provider=provider, blockSize=10)
+        assert model.rowCount() == 95
+        assert model.columnCount() == 3
+        assert not model.canFetchMore(QModelIndex())
+        assert model.headerData(2, Qt.Orientation.Horizontal) == 'c'
+        assert model.headerData(94, Qt.Orientation.Vertical) == 94
+        assert model.headerData(95, Qt.Orientation.Vertical) is None
+        for row in (0, 9, 10, 57, 94):
+            assert model.data(model.index(row, 0)) == row
+            assert model.data(model.index(row, 1)) == row * 0.5
+            assert model.data(model.index(row, 2)) == f's{row}'
+        assert not isinstance(model.data(model.index(0, 0)), np.generic)
+        assert model.data(model.index(0, 0), Qt.ItemDataRole.EditRole) is None
+        assert model.data(model.index(95, 0)) is None
+
+    def test_block_budget(self, qtbot, provider):
+        model = core.ChunkedDataFrameTableModel(
+            provider=provider, blockSize=10, maxBlocks=3
+        )
+        with patch.object(provider, 'readRows', wraps=provider.readRows) as read_rows:
+            for row in range(95):
+                model.data(model.index(row, 0))
+            assert read_rows.call_count == 10
+            assert len(model._blocks) == 3
+            model.data(model.index(94, 0))
+            assert read_rows.call_count == 10
+            model.data(model.index(0, 0))
+            assert read_rows.call_count == 11
+        model.setMaxBlocks(1)
+        assert model.getMaxBlocks() == 1
+        assert list(model._blocks) == [0]
+
+    def test_fetch_more(self, qtbot, data_frame):
+        class Provider(core.ChunkProvider):
+            def columns(self):
+                return list(data_frame.columns)
+
+            def readRows(self, start, stop):
+                return data_frame.iloc[start:stop]
+
+        model = core.ChunkedDataFrameTableModel(provider=Provider(), blockSize=40)
+        assert model.rowCount() == 0
+        assert model.canFetchMore(QModelIndex())
+        with qtbot.waitSignal(model.rowsInserted, timeout=100):
+            model.fetchMore(QModelIndex())
+        assert model.rowCount() == 40
+        model.fetchMore(QModelIndex())
+        model.fetchMore(QModelIndex())
+        assert model.rowCount() == 95
+        assert not model.canFetchMore(QModelIndex())
+        assert model.data(model.index(94, 2)) == 's94'
+        with qtbot.waitSignal(model.modelReset, timeout=100):
+            model.setProvider(None)
+        assert model.rowCount() == 0
+        assert model.columnCount() == 0
+
+
 class TestPathWatcher:
     @pytest.fixture
     def path_watcher(self, qtbot):
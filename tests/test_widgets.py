@@ -1,12 +1,15 @@
 import os
 import sys
+import warnings
 from collections import namedtuple
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 from qtpy import API_NAME as QT_VERSION
-from qtpy.QtCore import Qt, QUrl
+from qtpy.QtCore import QCoreApplication, QEvent, QPoint, QSize, Qt, QUrl
 from qtpy.QtGui import QColor, QPainter, QPalette, QStandardItemModel
 from qtpy.QtWebEngineWidgets import QWebEnginePage
 from qtpy.QtWidgets import (
@@ -14,12 +17,15 @@ from qtpy.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QStyle,
+    QStyledItemDelegate,
+    QStyleFactory,
+    QStyleOptionButton,
     QStyleOptionViewItem,
     QTableView,
 )
 
 from iblqt import widgets
-from iblqt.core import QAlyx
+from iblqt.core import ColoredDataFrameTableModel, QAlyx
 
 
 class TestCheckBoxDelegate:
@@ -65,6 +71,45 @@ class TestCheckBoxDelegate:
         option.state = QStyle.State_On if self.model.data(index) else QStyle.State_Off
         self.delegate.paint(painter, option, index)
 
+    def test_indicator_size_cache(self, qtbot, setup_method):
+        self.table_view.show()
+        qtbot.waitExposed(self.table_view)
+        with patch.object(widgets, 'QCheckBox') as checkbox:
+            self.table_view.viewport().grab()
+            checkbox.assert_not_called()
+        style = self.table_view.style()
+        size = style.sizeFromContents(
+            QStyle.ContentsType.CT_CheckBox, QStyleOptionButton(), QSize(0, 0)
+        )
+        assert self.delegate._indicatorKey[0] is style
+        assert self.delegate._indicatorSize == size
+
+        # the size is recomputed for a different style
+        cls = widgets.CheckBoxDelegate
+        with patch.object(
+            cls, '_onStyleDestroyed', autospec=True, side_effect=cls._onStyleDestroyed
+        ) as destroyed:
+            delegate = cls(self.table_view)
+            self.table_view.setItemDelegate(delegate)
+            other = QStyleFactory.create('Windows')
+            for current in (other, None, other, None):
+                self.table_view.setStyle(current)
+                self.table_view.viewport().grab()
+                assert delegate._indicatorKey[0] is (current or style)
+            other.deleteLater()
+            QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+            assert destroyed.call_count == 1
+
+        # the cache is only discarded if its style is deleted
+        assert delegate._indicatorKey[0] is style
+        other = QStyleFactory.create('Windows')
+        self.table_view.setStyle(other)
+        self.table_view.viewport().grab()
+        self.table_view.setStyle(None)
+        other.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        assert delegate._indicatorKey is None
+
 
 class TestColoredButton:
     @pytest.fixture
@@ -557,3 +602,145 @@ class TestSlideToggle:
         with qtbot.waitSignal(slider.toggled, timeout=500) as blocker:
             qtbot.mouseClick(slider, Qt.LeftButton)
         assert blocker.args == [False]
+
+
+class TestTableMinimap:
+    @pytest.fixture
+    def model(self, qtbot):
+        values = np.arange(1000.0)
+        values[200:210] = np.nan
+        data_frame = pd.DataFrame({'a': values, 'b': values[::-1] ** 2})
+        data_frame.loc[300, 'b'] = np.nan
+        return ColoredDataFrameTableModel(dataFrame=data_frame)
+
+    @pytest.fixture
+    def minimap(self, qtbot, model):
+        minimap = widgets.TableMinimap(model=model)
+        qtbot.addWidget(minimap)
+        minimap.resize(20, 100)
+        return minimap
+
+    @staticmethod
+    def expected(model, pooling):
+        blocks = model.getColorIndices().reshape(100, 10, 2).astype(float)
+        blocks[blocks == 255] = np.nan
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            pooled = np.rint(getattr(np, f'nan{pooling}')(blocks, axis=1))
+        return np.nan_to_num(pooled, nan=255).astype(np.uint8)
+
+    def test_image(self, qtbot, model, minimap):
+        image = minimap.image()
+        assert (image.width(), image.height()) == (2, 100)
+        np.testing.assert_array_equal(minimap._pooled, self.expected(model, 'max'))
+        assert minimap._pooled[20, 0] == 255
+        palette = model.getPalette()
+        assert image.pixel(1, 30) == palette[minimap._pooled[30, 1]] | 0xFF000000
+
+        minimap.setPooling('mean')
+        minimap.image()
+        np.testing.assert_array_equal(minimap._pooled, self.expected(model, 'mean'))
+
+        minimap.setPooling('invalid')
+        assert minimap.pooling() == 'mean'
+
+        minimap.resize(20, 2000)  # fewer rows than pixels
+        assert minimap.image().height() == 1000
+
+        minimap.setModel(ColoredDataFrameTableModel())
+        assert minimap.image().isNull()
+
+    def test_incremental(self, qtbot, model, minimap):
+        minimap.image()
+        with patch.object(widgets, '_poolRows', wraps=widgets._poolRows) as pool:
+            model.setData(model.index(15, 0), 995.0)
+            minimap.image()
+            assert pool.call_args.args[0].shape == (10, 2)
+        np.testing.assert_array_equal(minimap._pooled, self.expected(model, 'max'))
+
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        minimap.image()
+        np.testing.assert_array_equal(minimap._pooled, self.expected(model, 'max'))
+
+    def test_click(self, qtbot, model, minimap):
+        view = QTableView()
+        qtbot.addWidget(view)
+        view.setModel(model)
+        view.resize(200, 200)
+        view.show()
+        minimap.setView(view)
+        assert minimap.view() is view
+        minimap.show()
+        qtbot.waitExposed(minimap)
+        with qtbot.waitSignal(minimap.rowClicked, timeout=100) as blocker:
+            qtbot.mouseClick(minimap, Qt.MouseButton.LeftButton, pos=QPoint(5, 50))
+        assert blocker.args == [500]
+        center = view.indexAt(QPoint(0, view.viewport().height() // 2)).row()
+        assert abs(center - 500) < 5
+        minimap.grab()
+
+
+class TestColoredCellDelegate:
+    @pytest.fixture
+    def view(self, qtbot):
+        data_frame = pd.DataFrame(
+            {'a': np.arange(50.0), 'b': np.arange(50) % 3, 'c': np.arange(50) > 20}
+        )
+        data_frame.loc[5, 'a'] = np.nan
+        view = QTableView()
+        qtbot.addWidget(view)
+        view.setModel(ColoredDataFrameTableModel(dataFrame=data_frame))
+        view.setItemDelegate(widgets.ColoredCellDelegate(view))
+        view.resize(400, 300)
+        view.show()
+        qtbot.waitExposed(view)
+        return view
+
+    @staticmethod
+    def background(view, row, column):
+        image = view.viewport().grab().toImage()
+        x = view.columnViewportPosition(column) + view.columnWidth(column) - 3
+        y = view.rowViewportPosition(row) + 2
+        return image.pixelColor(x, y).rgb()
+
+    def test_paint(self, qtbot, view):
+        model = view.model()
+        delegate = view.itemDelegate()
+        view.viewport().grab()
+        last = view.rowAt(view.viewport().height() - 1)
+        assert delegate._frameCells == {row: {0, 1, 2} for row in range(last + 1)}
+        for row in range(1, last):  # the current cell has focus
+            for column in range(3):
+                expected = model.data(model.index(row, column), Qt.BackgroundRole)
+                assert self.background(view, row, column) == expected.rgb()
+
+        view.selectionModel().select(
+            model.index(2, 1), view.selectionModel().SelectionFlag.Select
+        )
+        highlight = view.palette().color(QPalette.ColorRole.Highlight).rgb()
+        assert self.background(view, 2, 1) == highlight
+
+    def test_fallback(self, qtbot, view):
+        view.setAlternatingRowColors(True)
+        model = view.model()
+        view.viewport().grab()
+        assert view.itemDelegate()._frameCells == {}
+        expected = model.data(model.index(3, 0), Qt.BackgroundRole).rgb()
+        assert self.background(view, 3, 0) == expected
+
+    def test_other_delegates(self, qtbot, view):
+        view.model().alpha = 100
+        view.setItemDelegateForColumn(2, widgets.CheckBoxDelegate(view))
+        view.setItemDelegateForRow(4, QStyledItemDelegate(view))
+        delegate = view.itemDelegate()
+        image = view.viewport().grab().toImage()
+        assert 4 not in delegate._frameCells
+        assert delegate._frameCells[3] == {0, 1}
+
+        view.setItemDelegate(QStyledItemDelegate(view))
+        reference = view.viewport().grab().toImage()
+        for rect in (
+            view.visualRect(view.model().index(3, 2)),
+            view.visualRect(view.model().index(4, 1)),
+        ):
+            assert image.copy(rect) == reference.copy(rect)